@@ -0,0 +1,24 @@
+-- Unique lookup path for products.source_url (ingestor upsert_product).
+-- Run after tools/tools/ingestor/migrate_product_source_urls.py has copied the
+-- legacy "Original URL:" description markers into products.source_url.
+-- Note: CONCURRENTLY cannot run inside a transaction block.
+
+-- Should return 0 rows; resolve duplicates (the migration reports them) before indexing.
+select source_url, count(*)
+  from products
+ where source_url is not null
+ group by source_url
+having count(*) > 1;
+
+create unique index concurrently if not exists products_source_url_key
+  on products (source_url)
+  where source_url is not null;
+
+-- The unique index serves the same lookups as the plain one from db-products.sql.
+drop index concurrently if exists idx_products_source_url;
+
+-- Should return 0 once the backfill is complete; then set PRODUCT_SOURCE_URL_MIGRATED=true.
+select count(*)
+  from products
+ where source_url is null
+   and description like '%Original URL:%';
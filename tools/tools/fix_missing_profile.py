@@ -2,6 +2,7 @@
 Script to fix missing profile records for existing auth users.
 This finds users in auth.users that don't have a corresponding profile in profiles table.
 """
+import logging
 import os
 import sys
 from dotenv import load_dotenv
@@ -19,7 +20,8 @@ for env_path in env_paths:
         load_dotenv(env_path)
         break
 
-from supabase import create_client
+sys.path.insert(0, os.path.join(script_dir, 'ingestor'))
+from ingestor.db.supabase_client import SupabaseClient
 
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_KEY')
@@ -28,7 +30,8 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
     print("Missing SUPABASE_URL or SUPABASE_SERVICE_KEY")
     exit(1)
 
-supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+db = SupabaseClient(SUPABASE_URL, SUPABASE_SERVICE_KEY, logging.getLogger("fix_missing_profile"))
+supabase = db.client
 
 def get_auth_users():
     """Get all users from auth.users via admin API"""
@@ -38,8 +41,7 @@ def get_auth_users():
 
 def get_existing_profiles():
     """Get all user_ids that already have profiles"""
-    result = supabase.table('profiles').select('user_id').execute()
-    return set(row['user_id'] for row in result.data)
+    return set(row['user_id'] for row in db.select_iter('profiles', 'user_id', key='user_id'))
 
 def create_profile_for_user(user):
     """Create a profile record for a user"""
@@ -124,7 +124,7 @@ async def main():
     print(f"Connecting to Supabase... Table: {table_name}")
     try:
         # Fetch all profiles
-        profiles = db.select(table_name, f"{pk_col}, username, profile_pic_url", limit=1000)
+        profiles = list(db.select_iter(table_name, f"{pk_col}, username, profile_pic_url", key=pk_col))
     except Exception as e:
          print(f"Failed to fetch from '{table_name}': {e}")
          return
@@ -17,6 +17,12 @@ from ingestor.crawl.review_detail_parser import extract_product_name
 from ingestor.db.supabase_client import SupabaseClient
 from ingestor.db.upsert import upsert_product_translations
 from ingestor.llm.groq_client import GroqClient
+from ingestor.llm.response_cache import (
+    DEFAULT_CACHE_PATH,
+    DEFAULT_MAX_MB,
+    DEFAULT_TTL_HOURS,
+    open_response_cache,
+)
 from ingestor.llm.translate_and_seo import translate_product
 from ingestor.utils.hashing import short_hash
 from ingestor.utils.slugify import (
@@ -392,6 +398,7 @@ async def _translate_for_product(
     category_name: Optional[str],
     langs: List[str],
     logger: logging.Logger,
+    batched: bool = False,
 ) -> Dict[str, dict]:
     translations = await translate_product(
         groq,
@@ -400,6 +407,7 @@ async def _translate_for_product(
         category_name,
         langs,
         logger,
+        batched=batched,
     )
     logger.info(
         "AI translations ready for product %s: %s",
@@ -409,7 +417,13 @@ async def _translate_for_product(
     return translations
 
 
-async def backfill_async(limit: int, include_missing: bool, dry_run: bool, force: bool = False) -> None:
+async def backfill_async(
+    limit: int,
+    include_missing: bool,
+    dry_run: bool,
+    force: bool = False,
+    batched: bool = False,
+) -> None:
     load_dotenv()
     logger = logging.getLogger("backfill_products")
     logger.setLevel(logging.INFO)
@@ -426,7 +440,13 @@ async def backfill_async(limit: int, include_missing: bool, dry_run: bool, force
         )
 
     supabase = SupabaseClient(supabase_url, supabase_key, logger, dry_run=dry_run)
-    groq = GroqClient(api_key=groq_key, model=groq_model, logger=logger)
+    llm_cache = open_response_cache(
+        os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH).strip(),
+        logger,
+        ttl_hours=float(os.getenv("LLM_CACHE_TTL_HOURS") or DEFAULT_TTL_HOURS),
+        max_mb=float(os.getenv("LLM_CACHE_MAX_MB") or DEFAULT_MAX_MB),
+    )
+    groq = GroqClient(api_key=groq_key, model=groq_model, logger=logger, cache=llm_cache)
     target_langs = _load_langs()
     target_lang_set = set(target_langs)
 
@@ -435,98 +455,76 @@ async def backfill_async(limit: int, include_missing: bool, dry_run: bool, force
     suffix_fix_by_product: Dict[str, Set[str]] = {}
     existing_langs_by_product: Dict[str, Set[str]] = {}
     translation_samples_by_product: Dict[str, Dict[str, Dict[str, Optional[str]]]] = {}
-    offset = 0
-    while True:
-        response = (
-            supabase.client.table("product_translations")
-            .select(
-                "product_id, lang, name, description, slug, meta_title, meta_description"
-            )
-            .range(offset, offset + PAGE_SIZE - 1)
-            .execute()
-        )
-        rows = response.data or []
-        if not rows:
-            break
-        for row in rows:
-            product_id = row.get("product_id")
-            lang = (row.get("lang") or "").lower()
-            if not product_id or not lang:
-                continue
-            existing_langs_by_product.setdefault(product_id, set()).add(lang)
-            if _row_has_cyrillic(
-                row,
-                ["name", "description", "slug", "meta_title", "meta_description"],
-            ):
-                bad_langs_by_product.setdefault(product_id, set()).add(lang)
-            name_value = str(row.get("name") or "")
-            slug_value = str(row.get("slug") or "")
-            if PLACEHOLDER_NAME_RE.match(name_value) or PLACEHOLDER_SLUG_RE.match(slug_value):
-                bad_langs_by_product.setdefault(product_id, set()).add(lang)
-            if _needs_review_suffix_fix(
-                row.get("name") or "",
-                row.get("slug") or "",
-                lang,
-            ):
-                suffix_fix_by_product.setdefault(product_id, set()).add(lang)
-            if lang in target_lang_set:
-                translation_samples_by_product.setdefault(product_id, {})[lang] = {
-                    "name": row.get("name"),
-                    "slug": row.get("slug"),
-                    "meta_title": row.get("meta_title"),
-                    "meta_description": row.get("meta_description"),
-                    "description": row.get("description"),
-                }
-        if len(rows) < PAGE_SIZE:
-            break
-        offset += PAGE_SIZE
+    for row in supabase.select_iter(
+        "product_translations",
+        "product_id, lang, name, description, slug, meta_title, meta_description",
+        key=("product_id", "lang"),
+        page_size=PAGE_SIZE,
+        prefetch=True,
+    ):
+        product_id = row.get("product_id")
+        lang = (row.get("lang") or "").lower()
+        if not product_id or not lang:
+            continue
+        existing_langs_by_product.setdefault(product_id, set()).add(lang)
+        if _row_has_cyrillic(
+            row,
+            ["name", "description", "slug", "meta_title", "meta_description"],
+        ):
+            bad_langs_by_product.setdefault(product_id, set()).add(lang)
+        name_value = str(row.get("name") or "")
+        slug_value = str(row.get("slug") or "")
+        if PLACEHOLDER_NAME_RE.match(name_value) or PLACEHOLDER_SLUG_RE.match(slug_value):
+            bad_langs_by_product.setdefault(product_id, set()).add(lang)
+        if _needs_review_suffix_fix(
+            row.get("name") or "",
+            row.get("slug") or "",
+            lang,
+        ):
+            suffix_fix_by_product.setdefault(product_id, set()).add(lang)
+        if lang in target_lang_set:
+            translation_samples_by_product.setdefault(product_id, {})[lang] = {
+                "name": row.get("name"),
+                "slug": row.get("slug"),
+                "meta_title": row.get("meta_title"),
+                "meta_description": row.get("meta_description"),
+                "description": row.get("description"),
+            }
 
     logger.info("Scanning products table for Cyrillic base fields and source URL mismatches...")
     products_with_cyrillic: Set[str] = set()
     products_with_placeholder: Set[str] = set()
     products_with_mismatch: Set[str] = set()
     mismatch_langs_by_product: Dict[str, Set[str]] = {}
-    offset = 0
-    while True:
-        response = (
-            supabase.client.table("products")
-            .select("id, name, description, slug, source_url")
-            .range(offset, offset + PAGE_SIZE - 1)
-            .execute()
-        )
-        rows = response.data or []
-        if not rows:
-            break
-        for row in rows:
-            product_id = row.get("id")
-            if not product_id:
-                continue
-            if _row_has_cyrillic(row, ["name", "description", "slug"]):
-                products_with_cyrillic.add(product_id)
-            if PLACEHOLDER_NAME_RE.match(str(row.get("name") or "")) or PLACEHOLDER_SLUG_RE.match(
-                str(row.get("slug") or "")
+    for row in supabase.select_iter(
+        "products", "id, name, description, slug, source_url", page_size=PAGE_SIZE, prefetch=True
+    ):
+        product_id = row.get("id")
+        if not product_id:
+            continue
+        if _row_has_cyrillic(row, ["name", "description", "slug"]):
+            products_with_cyrillic.add(product_id)
+        if PLACEHOLDER_NAME_RE.match(str(row.get("name") or "")) or PLACEHOLDER_SLUG_RE.match(
+            str(row.get("slug") or "")
+        ):
+            products_with_placeholder.add(product_id)
+        source_slug = _product_slug_from_url(row.get("source_url"))
+        if source_slug:
+            if _translation_mismatch_with_source_slug(
+                source_slug,
+                row.get("name"),
+                row.get("slug"),
             ):
-                products_with_placeholder.add(product_id)
-            source_slug = _product_slug_from_url(row.get("source_url"))
-            if source_slug:
+                products_with_mismatch.add(product_id)
+            samples = translation_samples_by_product.get(product_id, {})
+            for lang, sample in samples.items():
                 if _translation_mismatch_with_source_slug(
                     source_slug,
-                    row.get("name"),
-                    row.get("slug"),
+                    sample.get("name"),
+                    sample.get("slug"),
                 ):
                     products_with_mismatch.add(product_id)
-                samples = translation_samples_by_product.get(product_id, {})
-                for lang, sample in samples.items():
-                    if _translation_mismatch_with_source_slug(
-                        source_slug,
-                        sample.get("name"),
-                        sample.get("slug"),
-                    ):
-                        products_with_mismatch.add(product_id)
-                        mismatch_langs_by_product.setdefault(product_id, set()).add(lang)
-        if len(rows) < PAGE_SIZE:
-            break
-        offset += PAGE_SIZE
+                    mismatch_langs_by_product.setdefault(product_id, set()).add(lang)
 
     target_products = sorted(
         set(bad_langs_by_product)
@@ -730,6 +728,7 @@ async def backfill_async(limit: int, include_missing: bool, dry_run: bool, force
                 None,
                 sorted(langs_to_fix),
                 logger,
+                batched=batched,
             )
             if translations_map:
                 primary_lang = next(
@@ -885,6 +884,8 @@ async def backfill_async(limit: int, include_missing: bool, dry_run: bool, force
     logger.info("  Successfully processed: %d", success_count)
     if not force:
         logger.info("  Previously processed (skipped): check log above")
+    if llm_cache is not None:
+        logger.info("  LLM cache: %s", llm_cache.get_stats())
     logger.info("=" * 60)
 
 
@@ -897,6 +898,11 @@ def main() -> None:
     parser.add_argument("--include-missing", action="store_true", help="Also add missing language translations")
     parser.add_argument("--force", action="store_true", help="Reprocess already processed products")
     parser.add_argument("--reset-tracking", action="store_true", help="Clear the processed products tracking file")
+    parser.add_argument(
+        "--batched",
+        action="store_true",
+        help="Translate all languages of a product in one request (falls back per language on validation failure)",
+    )
     args = parser.parse_args()
     
     if args.reset_tracking:
@@ -907,7 +913,7 @@ def main() -> None:
             print("No tracking file to clear.")
         return
     
-    asyncio.run(backfill_async(args.limit, args.include_missing, args.dry_run, args.force))
+    asyncio.run(backfill_async(args.limit, args.include_missing, args.dry_run, args.force, args.batched))
 
 
 if __name__ == "__main__":
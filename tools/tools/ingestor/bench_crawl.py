@@ -0,0 +1,248 @@
+"""
+Offline benchmark suite for the crawl/ parsers, run over the saved-page fixture corpus.
+
+Reports pages/sec and peak traced memory per parser, and compares them against a
+saved baseline so parser changes can be checked on a machine without network access.
+
+    python bench_crawl.py                         # run, compare with the baseline if present
+    python bench_crawl.py --save-baseline         # store this machine's numbers as the baseline
+    python bench_crawl.py --threshold 0.15        # exit 1 when a parser is >15% slower / heavier
+    python bench_crawl.py --smoke                 # only check that every parser runs (synthetic pages)
+    python bench_crawl.py record --kind review https://irecommend.ru/content/...   # add pages
+
+Fixtures live in fixtures/pages/<kind>/*.html.gz and are listed in fixtures/pages/manifest.json
+(`origin` is "recorded" for real fetched pages, "synthetic" for hand-built markup).
+Only recorded pages are measured: the synthetic pages are padded filler around the
+selectors and say nothing about real parse time or memory, so they are a smoke set
+(--smoke), never compared with or saved as the baseline.
+Baselines are machine-specific: save one on the machine you compare on.
+"""
+import argparse
+import gzip
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlparse
+
+from ingestor.crawl.catalog_spider import parse_master_directory
+from ingestor.crawl.category_discovery import _discover_subcategories_from_html
+from ingestor.crawl.review_detail_parser import parse_review_detail
+from ingestor.crawl.review_list_discovery import discover_review_links
+
+BASE_URL = "https://irecommend.ru"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+MANIFEST = FIXTURES_DIR / "manifest.json"
+BASELINE = FIXTURES_DIR.parent / "bench_baseline.json"
+
+# kind -> (benchmark name, parser)
+PARSERS: Dict[str, Tuple[str, Callable[[str, str, logging.Logger], object]]] = {
+    "review": (
+        "parse_review_detail",
+        lambda url, html, logger: parse_review_detail(html, url, BASE_URL, logger),
+    ),
+    "review_list": (
+        "discover_review_links",
+        lambda url, html, logger: discover_review_links(html, BASE_URL, logger),
+    ),
+    "category": (
+        "_discover_subcategories_from_html",
+        lambda url, html, logger: _discover_subcategories_from_html(html, BASE_URL, url, logger),
+    ),
+    "catalog": (
+        # The parsing half of CatalogSpider.process_category_node
+        "parse_master_directory",
+        lambda url, html, logger: parse_master_directory(html, BASE_URL),
+    ),
+}
+
+
+def _silent_logger() -> logging.Logger:
+    logger = logging.getLogger("bench")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    return logger
+
+
+def load_manifest() -> List[dict]:
+    if not MANIFEST.exists():
+        return []
+    return json.loads(MANIFEST.read_text(encoding="utf-8"))
+
+
+def load_pages(kind: str, origin: str = "recorded") -> List[Tuple[str, str]]:
+    pages = []
+    for entry in load_manifest():
+        if entry["kind"] != kind or entry.get("origin", "recorded") != origin:
+            continue
+        with gzip.open(FIXTURES_DIR / entry["file"], "rt", encoding="utf-8") as f:
+            pages.append((entry["url"], f.read()))
+    return pages
+
+
+def measure(parser, pages: List[Tuple[str, str]], rounds: int, logger: logging.Logger) -> dict:
+    # Warm-up pass: selector compilation and imports should not count against the first round
+    for url, html in pages:
+        parser(url, html, logger)
+
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for url, html in pages:
+            parser(url, html, logger)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Memory is traced in a separate pass; tracemalloc slows everything down
+    peak = 0
+    tracemalloc.start()
+    try:
+        for url, html in pages:
+            tracemalloc.reset_peak()
+            parser(url, html, logger)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "pages": len(pages),
+        "pages_per_sec": round(len(pages) / best, 1) if best else 0.0,
+        "ms_per_page": round(best / len(pages) * 1000, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current["pages_per_sec"] < previous["pages_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {current['pages_per_sec']} pages/s vs baseline {previous['pages_per_sec']}"
+            )
+        if current["peak_kb"] > previous["peak_kb"] * (1 + threshold):
+            regressions.append(f"{name}: peak {current['peak_kb']} KB vs baseline {previous['peak_kb']} KB")
+    return regressions
+
+
+def smoke(args) -> int:
+    logger = _silent_logger()
+    failures = 0
+    for kind, (name, parser) in PARSERS.items():
+        pages = load_pages(kind, origin="synthetic")
+        if not pages:
+            print(f"skip {name}: no synthetic '{kind}' pages")
+            continue
+        failed = 0
+        for url, html in pages:
+            try:
+                parser(url, html, logger)
+            except Exception as exc:
+                failed += 1
+                print(f"FAIL {name} {url}: {exc}")
+        print(f"{name:<38} {len(pages) - failed}/{len(pages)} synthetic pages parsed")
+        failures += failed
+    return 1 if failures else 0
+
+
+def run(args) -> int:
+    logger = _silent_logger()
+    results: Dict[str, dict] = {}
+    for kind, (name, parser) in PARSERS.items():
+        pages = load_pages(kind)
+        if not pages:
+            print(f"skip {name}: no recorded '{kind}' pages (bench_crawl.py record --kind {kind} <url>...)")
+            continue
+        results[name] = measure(parser, pages, args.rounds, logger)
+    if not results:
+        print("No recorded fixtures to measure; record real pages first, or run --smoke")
+        return 2
+
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8")) if BASELINE.exists() else {}
+    print(f"{'parser':<38} {'pages':>6} {'pages/s':>9} {'ms/page':>9} {'peak KB':>9} {'vs base':>8}")
+    for name, row in results.items():
+        previous = baseline.get(name)
+        delta = f"{row['pages_per_sec'] / previous['pages_per_sec']:.2f}x" if previous else "-"
+        print(
+            f"{name:<38} {row['pages']:>6} {row['pages_per_sec']:>9} {row['ms_per_page']:>9} "
+            f"{row['peak_kb']:>9} {delta:>8}"
+        )
+
+    if args.save_baseline:
+        BASELINE.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {BASELINE}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+def _fetch_all(urls: List[str]) -> List[Tuple[str, str]]:
+    # Recording is the only network path; the benchmark itself never imports the HTTP client
+    from ingestor.config import Config
+    from ingestor.http_client import HttpClient
+
+    config = Config.from_env()
+    logger = logging.getLogger("bench.record")
+    http = HttpClient(
+        timeout_seconds=config.http_timeout_seconds,
+        max_retries=config.http_max_retries,
+        user_agent=config.user_agent,
+        logger=logger,
+        proxy=config.http_proxy,
+        proxy_pool=config.http_proxy_pool,
+    )
+    pages = []
+    for url in urls:
+        response = http.get(url)
+        if response.status_code != 200:
+            logger.warning("Skip %s: HTTP %s", url, response.status_code)
+            continue
+        pages.append((url, response.text))
+    return pages
+
+
+def record(args) -> int:
+    manifest = load_manifest()
+    known = {entry["url"] for entry in manifest}
+    pages = _fetch_all([url for url in args.urls if url not in known])
+    for url, html in pages:
+        slug = urlparse(url).path.rstrip("/").split("/")[-1] or "index"
+        rel = f"{args.kind}/{slug}.html.gz"
+        target = FIXTURES_DIR / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        data = html.encode("utf-8")
+        # mtime=0 keeps re-recorded files byte-identical when the page did not change
+        with gzip.GzipFile(target, "wb", mtime=0) as f:
+            f.write(data)
+        manifest.append({"file": rel, "kind": args.kind, "url": url, "origin": "recorded", "bytes": len(data)})
+        print(f"Recorded {url} -> {rel}")
+    MANIFEST.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline crawl/ parser benchmarks")
+    parser.add_argument("--rounds", type=int, default=5, help="timed passes over the corpus, the fastest is kept")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown / memory growth vs baseline")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--smoke", action="store_true", help="run every parser once over the synthetic pages, no timing")
+    sub = parser.add_subparsers(dest="command")
+    rec = sub.add_parser("record", help="fetch pages and add them to the fixture corpus")
+    rec.add_argument("--kind", required=True, choices=sorted(PARSERS))
+    rec.add_argument("urls", nargs="+")
+    args = parser.parse_args()
+    if args.command == "record":
+        sys.exit(record(args))
+    sys.exit(smoke(args) if args.smoke else run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: process_image throughput (images/sec) at 1, 2, 4 and N worker processes.
+
+Runs the real ImageWorkerPool, so the numbers include shipping the raw bytes to
+the workers and the WebP back. Pool start-up is excluded (one warm-up image per
+worker before timing). 1 worker is the in-thread path the pipeline used before.
+
+    python bench_images.py --corpus path/to/images --repeat 3
+    python bench_images.py --synthetic 48          # no corpus: generated 2000x1500 photos
+
+The corpus is a directory of downloaded review images (*.jpg, *.jpeg, *.png, *.webp).
+"""
+import argparse
+import os
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import List
+
+from PIL import Image, ImageDraw
+
+from ingestor.media.image_pool import ImageWorkerPool, default_workers
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+# Pipeline defaults (IMAGE_CROP_RIGHT_PCT, IMAGE_MAX_WIDTH, IMAGE_WEBP_QUALITY)
+SETTINGS = (0.15, 1600, 82, "UserReview.net")
+
+
+def load_corpus(directory: Path) -> List[bytes]:
+    return [
+        path.read_bytes()
+        for path in sorted(directory.iterdir())
+        if path.suffix.lower() in IMAGE_SUFFIXES
+    ]
+
+
+def synthetic_corpus(count: int, size=(2000, 1500)) -> List[bytes]:
+    # Noise-free gradients compress unrealistically well; draw shapes so the encoder has work to do
+    images = []
+    for idx in range(count):
+        img = Image.radial_gradient("L").resize(size).convert("RGB")
+        draw = ImageDraw.Draw(img)
+        for step in range(0, size[0], 40):
+            draw.line((step, 0, size[0] - step, size[1]), fill=((idx * 37 + step) % 256, step % 256, 128), width=3)
+        buf = BytesIO()
+        img.save(buf, "JPEG", quality=90)
+        images.append(buf.getvalue())
+    return images
+
+
+def measure(images: List[bytes], workers: int, repeat: int) -> float:
+    pool = ImageWorkerPool(workers)
+    try:
+        # Warm-up: start every worker process before the clock runs
+        list(pool.map(images[:1] * pool.workers, *SETTINGS))
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results = list(pool.map(images, *SETTINGS))
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        if not any(results):
+            raise SystemExit("Every image was rejected by process_image (all under 250px?)")
+    finally:
+        pool.shutdown()
+    return len(images) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="process_image throughput per worker count")
+    parser.add_argument("--corpus", help="directory of images; default: generated images")
+    parser.add_argument("--synthetic", type=int, default=32, help="generated images when no corpus is given")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per worker count, the fastest is kept")
+    parser.add_argument("--workers", help="comma separated worker counts (default 1,2,4,<cores>)")
+    args = parser.parse_args()
+
+    images = load_corpus(Path(args.corpus)) if args.corpus else synthetic_corpus(args.synthetic)
+    if not images:
+        raise SystemExit(f"No images in {args.corpus}")
+
+    if args.workers:
+        counts = [int(value) for value in args.workers.split(",") if value.strip()]
+    else:
+        counts = sorted({1, 2, 4, default_workers()})
+
+    print(f"{len(images)} images ({sum(map(len, images)) / len(images) / 1024:.0f} KB avg), "
+          f"{os.cpu_count()} cores, best of {args.repeat}")
+    print(f"{'workers':>8} {'images/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in counts:
+        rate = measure(images, workers, args.repeat)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>10.2f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
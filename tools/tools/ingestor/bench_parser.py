@@ -0,0 +1,155 @@
+"""
+Benchmark: parse time per review page, BeautifulSoup re-parsing vs the shared ParsedPage.
+
+"before" repeats what the parse stage used to do for every page: one BeautifulSoup
+tree for the detail parser, another for the excerpt, one more for the AI-extraction
+text and one for deep-dive link discovery. "after" builds one ParsedPage and runs
+the real parser, link discovery and text extraction on it.
+
+    python bench_parser.py --corpus fixtures/pages/review --repeat 5
+
+The corpus is a directory of saved irecommend review pages (*.html or *.html.gz);
+by default the recorded review pages of the fixture corpus (see bench_crawl.py).
+The synthetic fixture pages are a smoke set and are not used for timing.
+"""
+import argparse
+import gzip
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup
+
+from bench_crawl import load_pages
+from ingestor.crawl.document import ParsedPage
+from ingestor.crawl.review_detail_parser import parse_review_detail
+from ingestor.crawl.review_list_discovery import discover_review_links
+from ingestor.crawl.selectors import (
+    BREADCRUMB_SELECTORS,
+    PRODUCT_IMAGE_SELECTORS,
+    REVIEW_CONS_SELECTORS,
+    REVIEW_CONTENT_SELECTORS,
+    REVIEW_IMAGE_SELECTORS,
+    REVIEW_LIKES_DOWN_SELECTORS,
+    REVIEW_LIKES_UP_SELECTORS,
+    REVIEW_LINK_SELECTORS,
+    REVIEW_PROS_SELECTORS,
+    REVIEW_PUBLISHED_SELECTORS,
+    REVIEW_RATING_COUNT_SELECTORS,
+    REVIEW_RATING_SELECTORS,
+    REVIEW_TITLE_SELECTORS,
+)
+from ingestor.utils.text_clean import clean_html
+
+BASE_URL = "https://irecommend.ru"
+
+_SINGLE_SELECTORS = (
+    REVIEW_TITLE_SELECTORS
+    + REVIEW_RATING_SELECTORS
+    + REVIEW_RATING_COUNT_SELECTORS
+    + REVIEW_LIKES_UP_SELECTORS
+    + REVIEW_LIKES_DOWN_SELECTORS
+    + REVIEW_PUBLISHED_SELECTORS
+    + PRODUCT_IMAGE_SELECTORS
+    + REVIEW_PROS_SELECTORS
+    + REVIEW_CONS_SELECTORS
+)
+
+
+def load_corpus(directory: Path) -> List[Tuple[str, str]]:
+    pages = []
+    for path in sorted(directory.iterdir()):
+        if path.name.endswith(".html.gz"):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                html = f.read()
+        elif path.suffix == ".html":
+            html = path.read_text(encoding="utf-8")
+        else:
+            continue
+        pages.append((f"{BASE_URL}/content/{path.name.split('.')[0]}", html))
+    return pages
+
+
+def _before(html: str) -> None:
+    # Detail parser
+    soup = BeautifulSoup(html, "lxml")
+    for selector in _SINGLE_SELECTORS:
+        soup.select_one(selector)
+    for selector in BREADCRUMB_SELECTORS:
+        soup.select(selector)
+    content_html = ""
+    for selector in REVIEW_CONTENT_SELECTORS:
+        node = soup.select_one(selector)
+        if node:
+            content_html = clean_html("".join(str(child) for child in node.contents))
+            break
+    for selector in REVIEW_IMAGE_SELECTORS:
+        soup.select(selector)
+    # Excerpt
+    BeautifulSoup(content_html, "lxml").get_text()
+    # AI-extraction text
+    BeautifulSoup(html, "lxml").get_text(separator="\n", strip=True)
+    # Deep-dive link discovery
+    links_soup = BeautifulSoup(html, "lxml")
+    for selector in REVIEW_LINK_SELECTORS:
+        links_soup.select(selector)
+
+
+def _after(html: str, url: str, logger: logging.Logger) -> None:
+    page = ParsedPage(html, url)
+    parse_review_detail(page, url, BASE_URL, logger)
+    page.text("\n")
+    discover_review_links(page, BASE_URL, logger)
+
+
+def _time_per_page(pages, run, repeat: int) -> List[float]:
+    per_page = []
+    for url, html in pages:
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run(url, html)
+            samples.append(time.perf_counter() - started)
+        per_page.append(min(samples))
+    return per_page
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Review page parse time: BeautifulSoup vs ParsedPage")
+    parser.add_argument("--corpus", help="directory of saved review pages (default: recorded review fixtures)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per page, the fastest is kept")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    if args.corpus:
+        pages = load_corpus(Path(args.corpus))
+        if not pages:
+            raise SystemExit(f"No *.html / *.html.gz pages in {args.corpus}")
+    else:
+        pages = load_pages("review")
+        if not pages:
+            raise SystemExit("No recorded review fixtures: bench_crawl.py record --kind review <url>... or pass --corpus")
+
+    results = {
+        "before": _time_per_page(pages, lambda url, html: _before(html), args.repeat),
+        "after": _time_per_page(pages, lambda url, html: _after(html, url, logger), args.repeat),
+    }
+
+    print(f"{len(pages)} pages, best of {args.repeat}")
+    print(f"{'mode':<8} {'mean ms':>10} {'median ms':>10} {'max ms':>10} {'pages/s':>10}")
+    for mode, samples in results.items():
+        mean = statistics.mean(samples)
+        print(
+            f"{mode:<8} {mean * 1000:>10.2f} {statistics.median(samples) * 1000:>10.2f} "
+            f"{max(samples) * 1000:>10.2f} {1 / mean:>10.1f}"
+        )
+    print(f"speedup: {statistics.mean(results['before']) / statistics.mean(results['after']):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
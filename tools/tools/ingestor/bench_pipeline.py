@@ -0,0 +1,138 @@
+"""
+Benchmark: items/hour of the sequential loop vs the concurrent and staged pipelines.
+
+Runs fully offline. Each simulated item holds the same resource limiters the real
+clients use (source, llm, db, r2) for a configurable latency, so the numbers show
+how much of the per-item wall time the concurrent mode overlaps.
+
+    python bench_pipeline.py --items 20 --concurrency 5 --stages "fetch=1,parse=2,translate=5,persist=2"
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from ingestor.pipeline import (
+    StageSpec,
+    parse_stage_workers,
+    run_items_concurrent,
+    run_items_sequential,
+    run_items_staged,
+    SEQUENTIAL_ITEM_DELAY_SECONDS,
+)
+from ingestor.stability import (
+    configure_limiters,
+    get_db_limiter,
+    get_llm_limiter,
+    get_r2_limiter,
+    get_source_limiter,
+)
+
+
+def _hold(limiter, seconds: float) -> None:
+    with limiter:
+        time.sleep(seconds)
+
+
+def build_simulated_stages(args):
+    scale = args.scale
+
+    async def _fetch(work) -> bool:
+        # Review page fetch (includes the HttpClient "reading time")
+        await asyncio.to_thread(_hold, get_db_limiter(), args.db_seconds * scale)
+        await asyncio.to_thread(_hold, get_source_limiter(), args.fetch_seconds * scale)
+        return True
+
+    async def _parse(work) -> bool:
+        await asyncio.sleep(args.parse_seconds * scale)
+        return True
+
+    async def _translate(work) -> bool:
+        # Translation rounds: each round fans out across languages
+        for _ in range(args.llm_rounds):
+            await asyncio.gather(*[
+                asyncio.to_thread(_hold, get_llm_limiter(), args.llm_seconds * scale)
+                for _ in range(args.llm_fanout)
+            ])
+        return True
+
+    async def _persist(work) -> bool:
+        # Images: CDN fetch through the source limiter, then R2 upload
+        for _ in range(args.images):
+            await asyncio.to_thread(_hold, get_source_limiter(), args.fetch_seconds * scale)
+            await asyncio.to_thread(_hold, get_r2_limiter(), args.r2_seconds * scale)
+        for _ in range(args.db_writes):
+            await asyncio.to_thread(_hold, get_db_limiter(), args.db_seconds * scale)
+        return True
+
+    return [("fetch", _fetch), ("parse", _parse), ("translate", _translate), ("persist", _persist)]
+
+
+def build_simulated_item(args):
+    stages = build_simulated_stages(args)
+
+    async def _process(item) -> bool:
+        for _, handler in stages:
+            await handler(item)
+        return True
+
+    return _process
+
+
+async def _run(args) -> None:
+    logger = logging.getLogger("bench")
+    configure_limiters(source=args.source, llm=args.llm, db=args.db, r2=args.r2)
+    items = [{"source_url": f"https://irecommend.ru/content/item-{i}-n{i}"} for i in range(args.items)]
+    process = build_simulated_item(args)
+
+    results = {}
+    started = time.perf_counter()
+    await run_items_sequential(items, process, logger, item_delay_seconds=SEQUENTIAL_ITEM_DELAY_SECONDS * args.scale)
+    results["sequential"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await run_items_concurrent(items, process, args.concurrency, logger)
+    results["concurrent"] = time.perf_counter() - started
+
+    sizes = parse_stage_workers(
+        args.stages,
+        {"fetch": args.source, "parse": 2, "translate": args.concurrency, "persist": 2},
+    )
+    stages = [StageSpec(name, handler, *sizes[name]) for name, handler in build_simulated_stages(args)]
+    started = time.perf_counter()
+    await run_items_staged(items, stages, dict, logger, monitor_interval_seconds=0)
+    results["staged"] = time.perf_counter() - started
+
+    print(f"{'mode':<12} {'wall (sim s)':>14} {'items/hour':>12}")
+    for mode, elapsed in results.items():
+        simulated = elapsed / args.scale
+        print(f"{mode:<12} {simulated:>14.1f} {args.items / simulated * 3600:>12.1f}")
+    for mode in ("concurrent", "staged"):
+        print(f"speedup ({mode}): {results['sequential'] / results[mode]:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sequential vs concurrent pipeline benchmark")
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5, help="MAX_CONCURRENT_TASKS")
+    parser.add_argument("--source", type=int, default=1, help="SOURCE_FETCH_CONCURRENCY")
+    parser.add_argument("--llm", type=int, default=4, help="LLM_CONCURRENCY")
+    parser.add_argument("--db", type=int, default=8, help="DB_CONCURRENCY")
+    parser.add_argument("--r2", type=int, default=4, help="R2_CONCURRENCY")
+    parser.add_argument("--stages", default=None, help="PIPELINE_STAGES for the staged run")
+    parser.add_argument("--fetch-seconds", type=float, default=5.0)
+    parser.add_argument("--parse-seconds", type=float, default=0.5)
+    parser.add_argument("--llm-seconds", type=float, default=3.0)
+    parser.add_argument("--llm-rounds", type=int, default=6)
+    parser.add_argument("--llm-fanout", type=int, default=3)
+    parser.add_argument("--db-seconds", type=float, default=0.3)
+    parser.add_argument("--db-writes", type=int, default=6)
+    parser.add_argument("--r2-seconds", type=float, default=0.5)
+    parser.add_argument("--images", type=int, default=2)
+    parser.add_argument("--scale", type=float, default=0.01, help="time compression factor")
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import socket
 import re
 from dataclasses import dataclass
 from typing import List, Optional
@@ -19,6 +20,8 @@ class Config:
     image_crop_right_pct: float
     image_max_width: int
     image_webp_quality: int
+    image_max_mb: int  # image downloads are aborted past this size
+    image_workers: int  # processes for process_image; 0 = one per core, 1 = in a thread
     groq_api_key: str
     groq_model: str
     groq_vision_model: str
@@ -47,6 +50,33 @@ class Config:
     cache_purge_secret: Optional[str]
     daily_review_limit: int
     fallback_category_id: Optional[int]  # ID of "Other" category for unmatched reviews
+    pipeline_mode: str  # "sequential" (legacy loop), "concurrent" or "staged"
+    pipeline_stages: Optional[str]  # staged mode sizing, e.g. "fetch=1,parse=2,translate=4,persist=2"
+    source_fetch_concurrency: int
+    llm_concurrency: int
+    db_concurrency: int
+    db_pool_size: int  # pooled PostgREST connections; 0 = DB_CONCURRENCY
+    db_timeout_seconds: float
+    db_http2: bool
+    database_url: Optional[str]  # direct Postgres connection for bulk maintenance scripts (--direct-pg)
+    r2_concurrency: int
+    llm_requests_per_minute: int  # 0 disables the request budget
+    llm_tokens_per_minute: int  # 0 disables the token budget
+    llm_batch_translations: bool  # one multi-language request for category/product translations
+    llm_async_client: bool  # AsyncGroqClient (pooled HTTP, non-blocking retries) instead of the thread-based client
+    llm_cache_path: Optional[str]  # SQLite file for cached LLM responses; empty disables
+    llm_cache_ttl_hours: float
+    llm_cache_max_mb: int
+    http_cache_path: Optional[str]  # SQLite file for cached source pages; empty disables
+    http_cache_ttls: str  # pattern=hours rules, first match wins
+    http_cache_max_mb: int
+    host_min_intervals: str  # host=seconds|min-max pause between request starts per host; unlisted hosts are not paced
+    http_async_client: bool  # review pages and images via one curl_cffi AsyncSession instead of threads around the blocking client
+    state_flush_every: int  # source_map transitions buffered before one bulk upsert
+    state_flush_seconds: float
+    worker_id: str  # owner recorded on leased source_map rows
+    source_lease_seconds: int  # claimed sources are reclaimable by other ingestors after this unless renewed
+    product_source_url_migrated: bool  # products.source_url backfilled + indexed; skip the description ILIKE lookup
 
 
     @staticmethod
@@ -111,6 +141,8 @@ class Config:
             image_crop_right_pct=env_float("IMAGE_CROP_RIGHT_PCT", 0.15),
             image_max_width=env_int("IMAGE_MAX_WIDTH", 1600),
             image_webp_quality=env_int("IMAGE_WEBP_QUALITY", 82),
+            image_max_mb=max(1, env_int("IMAGE_MAX_MB", 15)),
+            image_workers=max(0, env_int("IMAGE_WORKERS", 0)),
             groq_api_key=os.getenv("GROQ_API_KEY", ""),
             groq_model=os.getenv("GROQ_MODEL", "llama-3.1-8b-instant"),
             groq_vision_model=os.getenv("GROQ_VISION_MODEL", "llama-3.2-11b-vision-preview"),
@@ -142,6 +174,33 @@ class Config:
             cache_purge_secret=env_optional("CACHE_PURGE_SECRET"),
             daily_review_limit=env_int("DAILY_REVIEW_LIMIT", 140),
             fallback_category_id=env_int("FALLBACK_CATEGORY_ID", 0) or None,  # 0 means disabled
+            pipeline_mode=os.getenv("PIPELINE_MODE", "concurrent").strip().lower() or "concurrent",
+            pipeline_stages=env_optional("PIPELINE_STAGES"),
+            source_fetch_concurrency=env_int("SOURCE_FETCH_CONCURRENCY", 1),
+            llm_concurrency=env_int("LLM_CONCURRENCY", 4),
+            db_concurrency=env_int("DB_CONCURRENCY", 8),
+            db_pool_size=env_int("DB_POOL_SIZE", 0),
+            db_timeout_seconds=env_float("DB_TIMEOUT_SECONDS", 30.0),
+            db_http2=env_bool("DB_HTTP2", True),
+            database_url=os.getenv("DATABASE_URL", "").strip() or None,
+            r2_concurrency=env_int("R2_CONCURRENCY", 4),
+            llm_requests_per_minute=env_int("LLM_REQUESTS_PER_MINUTE", 60),
+            llm_tokens_per_minute=env_int("LLM_TOKENS_PER_MINUTE", 0),
+            llm_batch_translations=env_bool("LLM_BATCH_TRANSLATIONS", False),
+            llm_async_client=env_bool("LLM_ASYNC_CLIENT", True),
+            llm_cache_path=os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite").strip() or None,
+            llm_cache_ttl_hours=env_float("LLM_CACHE_TTL_HOURS", 24 * 30),
+            llm_cache_max_mb=env_int("LLM_CACHE_MAX_MB", 512),
+            http_cache_path=os.getenv("HTTP_CACHE_PATH", ".cache/http_responses.sqlite").strip() or None,
+            http_cache_ttls=os.getenv("HTTP_CACHE_TTLS", "new=1=0,/category/=6").strip(),
+            http_cache_max_mb=env_int("HTTP_CACHE_MAX_MB", 256),
+            host_min_intervals=os.getenv("HOST_MIN_INTERVALS", "irecommend.ru=4-8").strip(),
+            http_async_client=env_bool("HTTP_ASYNC_CLIENT", True),
+            state_flush_every=env_int("STATE_FLUSH_EVERY", 20),
+            state_flush_seconds=env_float("STATE_FLUSH_SECONDS", 10.0),
+            worker_id=os.getenv("WORKER_ID", "").strip() or f"{socket.gethostname()}-{os.getpid()}",
+            source_lease_seconds=max(60, env_int("SOURCE_LEASE_SECONDS", 900)),
+            product_source_url_migrated=env_bool("PRODUCT_SOURCE_URL_MIGRATED", False),
         )
 
 
@@ -18,11 +18,12 @@ from ..db.upsert import (
     upsert_product_image,
     link_product_to_category,
 )
-from ..llm.groq_client import GroqClient
+from ..llm.groq_client import LLMClient
 from ..llm.translate_and_seo import translate_category, translate_product
 from ..media.image_fetch import fetch_image
 from ..media.image_process import process_image
 from ..media.r2_upload import R2Uploader
+from .category_discovery import _extract_source_key, _normalize_url
 from .selectors import (
     SUBCATEGORY_LINK_SELECTORS,
     CATALOG_PAGINATION_NEXT,
@@ -32,12 +33,85 @@ from .selectors import (
 
 logger = logging.getLogger(__name__)
 
+
+def parse_master_directory(
+    html: str,
+    base_url: str,
+) -> List[Tuple[Dict[str, Optional[str]], List[Dict[str, Optional[str]]]]]:
+    """
+    Top-level categories of the master catalog page, each with its subcategories.
+    Pure parsing (no DB or LLM calls), so it can be benchmarked offline.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    results = []
+
+    for block in soup.select(".categoryBlock"):
+        # 1. Top Level Category
+        # Selector: matches <a ...><h2>...</h2></a>
+        main_link = block.select_one("a:has(h2)")
+        
+        if not main_link:
+            # Fallback: link inside h2?
+            main_link = block.select_one("h2 a")
+        
+        if not main_link:
+            # Fallback: look for generic header link
+            main_link = block.select_one(".catHeader a")
+        
+        if not main_link:
+            continue
+            
+        main_url = _normalize_url(base_url, main_link.get("href"))
+        if not main_url:
+            continue
+
+        # 2. Sub Categories (Level 2)
+        # Try specific class first, then general list, then fall back to all links
+        sub_links = block.select("ul.catList li a")
+        if not sub_links:
+            sub_links = block.select("ul li a")
+        if not sub_links:
+            # Fallback: get all links in block, exclude the main header link/urls
+            main_href = main_link.get("href")
+            all_a = block.select("a")
+            sub_links = []
+            for a in all_a:
+               h = a.get("href")
+               # Important: main_link might be one of those A tags or wrapping H2
+               # We exclude it by ref or href comparison
+               if h and h != main_href and a != main_link:
+                   sub_links.append(a)
+
+        subs = []
+        seen_subs = set()
+        for sub in sub_links:
+            sub_url = _normalize_url(base_url, sub.get("href"))
+            if not sub_url: continue
+            if sub_url == main_url: continue 
+            if sub_url in seen_subs: continue
+            seen_subs.add(sub_url)
+            
+            sub_name = sub.get_text(strip=True)
+            if not sub_name: continue
+            
+            subs.append({"source_url": sub_url, "name": sub_name, "source_key": _extract_source_key(sub_url)})
+
+        main = {
+            "source_url": main_url,
+            "name": main_link.get_text(strip=True),
+            "source_key": _extract_source_key(main_url),
+        }
+        results.append((main, subs))
+
+    return results
+
+
 class CatalogSpider:
     def __init__(
         self, 
         config: Config, 
         http: HttpClient, 
-        groq: GroqClient, 
+        groq: LLMClient, 
         supabase,
         logger: logging.Logger
     ):
@@ -124,82 +198,30 @@ class CatalogSpider:
             self.logger.error(f"Failed to fetch {category_url}: {e}")
             return []
 
-        soup = BeautifulSoup(html, "lxml")
-        
         self.logger.info("Parsing Master Directory...")
-        blocks = soup.select(".categoryBlock")
+        directory = parse_master_directory(html, self.config.source_base_url)
         
         total_top = 0
         total_sub = 0
 
-        for block in blocks:
-            # 1. Top Level Category
-            # Selector: matches <a ...><h2>...</h2></a>
-            main_link = block.select_one("a:has(h2)")
-            
-            if not main_link:
-                # Fallback: link inside h2?
-                main_link = block.select_one("h2 a")
-            
-            if not main_link:
-                # Fallback: look for generic header link
-                main_link = block.select_one(".catHeader a")
-            
-            if not main_link:
-                continue
-                
-            main_url = self._normalize_url(self.config.source_base_url, main_link.get("href"))
-            if not main_url:
-                continue
-
-            h1_text = main_link.get_text(strip=True)
-            source_key = self._extract_source_key(main_url)
-            
+        for main, subs in directory:
+            h1_text = main["name"]
             try:
-                upserted = upsert_categories(self.supabase, [{"source_url": main_url, "name": h1_text, "parent_id": None, "source_key": source_key}], self.logger)
-                main_id = upserted.get(main_url)
+                upserted = upsert_categories(self.supabase, [{**main, "parent_id": None}], self.logger)
+                main_id = upserted.get(main["source_url"])
                 
                 if main_id:
                     total_top += 1
                     await self._check_translate(main_id, h1_text)
                     
                     # 2. Sub Categories (Level 2)
-                    # Try specific class first, then general list, then fall back to all links
-                    sub_links = block.select("ul.catList li a")
-                    if not sub_links:
-                        sub_links = block.select("ul li a")
-                    if not sub_links:
-                        # Fallback: get all links in block, exclude the main header link/urls
-                        main_href = main_link.get("href")
-                        all_a = block.select("a")
-                        sub_links = []
-                        for a in all_a:
-                           h = a.get("href")
-                           # Important: main_link might be one of those A tags or wrapping H2
-                           # We exclude it by ref or href comparison
-                           if h and h != main_href and a != main_link:
-                               sub_links.append(a)
-
-                    seen_subs = set()
-                    for sub in sub_links:
-                        sub_href = sub.get("href")
-                        sub_url = self._normalize_url(self.config.source_base_url, sub_href)
-                        if not sub_url: continue
-                        if sub_url == main_url: continue 
-                        if sub_url in seen_subs: continue
-                        seen_subs.add(sub_url)
-                        
-                        sub_name = sub.get_text(strip=True)
-                        if not sub_name: continue
-                        
-                        sub_key = self._extract_source_key(sub_url)
-                        
-                        upserted_sub = upsert_categories(self.supabase, [{"source_url": sub_url, "name": sub_name, "parent_id": main_id, "source_key": sub_key}], self.logger)
-                        sub_id = upserted_sub.get(sub_url)
+                    for sub in subs:
+                        upserted_sub = upsert_categories(self.supabase, [{**sub, "parent_id": main_id}], self.logger)
+                        sub_id = upserted_sub.get(sub["source_url"])
                         
                         if sub_id:
                             total_sub += 1
-                            await self._check_translate(sub_id, sub_name)
+                            await self._check_translate(sub_id, sub["name"])
             except Exception as e:
                 self.logger.error(f"Error processing block {h1_text}: {e}")
 
@@ -210,7 +232,13 @@ class CatalogSpider:
         existing_trans = self.supabase.select("category_translations", columns="category_id", filters=[("eq", "category_id", cat_id), ("eq", "lang", "en")])
         if not existing_trans:
             self.logger.info(f"Translating: {name_ru}")
-            translations = await translate_category(self.groq, name_ru, self.config.langs, self.logger)
+            translations = await translate_category(
+                self.groq,
+                name_ru,
+                self.config.langs,
+                self.logger,
+                batched=self.config.llm_batch_translations,
+            )
             if translations:
                 upsert_category_translations(self.supabase, cat_id, translations.values(), self.logger)
     
@@ -0,0 +1,101 @@
+"""
+Parsed page shared by the review parser, link discovery and text extraction.
+
+A fetched page used to be parsed by BeautifulSoup once per consumer (detail
+parser, excerpt, AI-extraction text, deep-dive link discovery). ParsedPage
+parses it once with lxml.html and answers the CSS selectors from
+`selectors.py` through compiled cssselect expressions.
+"""
+
+import html as html_lib
+from functools import lru_cache
+from typing import List, Optional, Union
+
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+# Text inside these never shows up in BeautifulSoup's get_text() either
+_TEXT_XPATH = etree.XPath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+# clean_html also drops these with their content; excerpts must not see that text either
+_CONTENT_TEXT_XPATH = etree.XPath(
+    ".//text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::noscript) and not(ancestor::iframe)]"
+)
+
+
+@lru_cache(maxsize=512)
+def _compiled(selector: str) -> CSSSelector:
+    return CSSSelector(selector)
+
+
+def _build_tree(html: str) -> lxml.html.HtmlElement:
+    if not html or not html.strip():
+        return lxml.html.document_fromstring("<html><body></body></html>")
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml rejects str input that carries an XML encoding declaration
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return lxml.html.document_fromstring("<html><body></body></html>")
+
+
+def node_text(node: lxml.html.HtmlElement, separator: str = "", strip: bool = True) -> str:
+    """Same output as BeautifulSoup's `get_text(separator, strip=strip)`."""
+    parts = [str(part) for part in _TEXT_XPATH(node)]
+    if strip:
+        parts = [part.strip() for part in parts]
+        parts = [part for part in parts if part]
+    return separator.join(parts)
+
+
+def content_text(node: lxml.html.HtmlElement) -> str:
+    """Text of a content node as it survives clean_html (unstripped, like get_text())."""
+    return "".join(str(part) for part in _CONTENT_TEXT_XPATH(node))
+
+
+def inner_html(node: lxml.html.HtmlElement) -> str:
+    parts = [html_lib.escape(node.text, quote=False)] if node.text else []
+    parts.extend(lxml.html.tostring(child, encoding="unicode", with_tail=True) for child in node)
+    return "".join(parts)
+
+
+def html_text(html: str, separator: str = "") -> str:
+    """Plain text of an HTML fragment (for content that was not part of a fetched page)."""
+    if not html:
+        return ""
+    return node_text(_build_tree(html), separator, strip=False)
+
+
+class ParsedPage:
+    def __init__(self, html: str, url: Optional[str] = None) -> None:
+        self.html = html or ""
+        self.url = url
+        self.root = _build_tree(self.html)
+        self._text: dict = {}
+
+    def select(self, selector: str, node: Optional[lxml.html.HtmlElement] = None) -> List[lxml.html.HtmlElement]:
+        return _compiled(selector)(self.root if node is None else node)
+
+    def select_one(self, selector: str, node: Optional[lxml.html.HtmlElement] = None) -> Optional[lxml.html.HtmlElement]:
+        matches = self.select(selector, node)
+        return matches[0] if matches else None
+
+    def first(self, selectors: List[str]) -> Optional[lxml.html.HtmlElement]:
+        for selector in selectors:
+            node = self.select_one(selector)
+            if node is not None:
+                return node
+        return None
+
+    def text(self, separator: str = "\n") -> str:
+        """Whole-page text, stripped per string; cached per separator."""
+        if separator not in self._text:
+            self._text[separator] = node_text(self.root, separator)
+        return self._text[separator]
+
+
+def as_page(html_or_page: Union[str, ParsedPage], url: Optional[str] = None) -> ParsedPage:
+    if isinstance(html_or_page, ParsedPage):
+        return html_or_page
+    return ParsedPage(html_or_page, url)
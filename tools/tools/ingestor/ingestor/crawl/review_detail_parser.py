@@ -1,12 +1,11 @@
 import logging
 import re
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
-
 from ..utils.text_clean import clean_html, normalize_whitespace
+from .document import ParsedPage, as_page, content_text, inner_html, node_text
 from .selectors import (
     BREADCRUMB_SELECTORS,
     REVIEW_CONTENT_SELECTORS,
@@ -70,17 +69,17 @@ _MONTHS_RU = {
 }
 
 
-def _extract_text(soup: BeautifulSoup, selectors: List[str]) -> Optional[str]:
+def _extract_text(page: ParsedPage, selectors: List[str]) -> Optional[str]:
     for selector in selectors:
-        node = soup.select_one(selector)
-        if not node:
+        node = page.select_one(selector)
+        if node is None:
             continue
-        if node.name == "meta":
+        if node.tag == "meta":
             value = node.get("content")
-        elif node.name == "time":
-            value = node.get("datetime") or node.get_text(strip=True)
+        elif node.tag == "time":
+            value = node.get("datetime") or node_text(node)
         else:
-            value = node.get_text(strip=True)
+            value = node_text(node)
         if value:
             return value
     return None
@@ -134,13 +133,13 @@ def _parse_date(text: Optional[str]) -> Optional[str]:
     return None
 
 
-def _extract_breadcrumbs(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+def _extract_breadcrumbs(page: ParsedPage) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
     crumbs = []
     for selector in BREADCRUMB_SELECTORS:
-        nodes = soup.select(selector)
+        nodes = page.select(selector)
         for node in nodes:
             href = node.get("href")
-            text = node.get_text(strip=True)
+            text = node_text(node)
             if href:
                 crumbs.append((href, text))
         if crumbs:
@@ -166,42 +165,36 @@ def _extract_breadcrumbs(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[s
     
     # Product name is usually in H1
     product_name = None
-    h1 = soup.select_one("h1")
-    if h1:
+    h1 = page.select_one("h1")
+    if h1 is not None:
         # Strip suffix like " — отзыв", " -- отзыв"
         # Includes em-dash (—) and regular dash
-        text = h1.get_text(strip=True)
+        text = node_text(h1)
         text = re.sub(r"\s*[-—]+\s*\u043e\u0442\u0437\u044b\u0432\s*$", "", text, flags=re.I)
         product_name = text
 
     return category_url, subcategory_url, category_name, subcategory_name, product_name
 
 
-def _extract_content_html(soup: BeautifulSoup) -> str:
+def _extract_content_html(page: ParsedPage) -> Tuple[str, str]:
+    """Cleaned content HTML plus the plain text of the node it came from (for the excerpt)."""
     cleaned = ""
     for selector in REVIEW_CONTENT_SELECTORS:
-        node = soup.select_one(selector)
-        if not node:
+        node = page.select_one(selector)
+        if node is None:
             continue
-        raw_html = "".join(str(child) for child in node.contents)
-        cleaned = clean_html(raw_html)
+        cleaned = clean_html(inner_html(node))
         if cleaned:
-            return cleaned
-    return cleaned
+            return cleaned, content_text(node)
+    return cleaned, ""
 
 
 
-def _extract_image_urls(soup: BeautifulSoup, base_url: str) -> List[str]:
+def _extract_image_urls(page: ParsedPage, base_url: str) -> List[str]:
     urls = []
     
     # Try to find the main review container first to avoid picking up avatars from comments
-    content_node = None
-    for selector in REVIEW_CONTENT_SELECTORS:
-        content_node = soup.select_one(selector)
-        if content_node:
-            break
-            
-    search_node = content_node or soup
+    search_node = page.first(REVIEW_CONTENT_SELECTORS)
     
     # Blacklist patterns for URLs we definitely don't want (avatars, icons, etc)
     # Be careful not to block '/user-images/' which is where IRecommend stores review photos!
@@ -212,8 +205,8 @@ def _extract_image_urls(soup: BeautifulSoup, base_url: str) -> List[str]:
     }
 
     for selector in REVIEW_IMAGE_SELECTORS:
-        for node in search_node.select(selector):
-            if node.name == "a":
+        for node in page.select(selector, search_node):
+            if node.tag == "a":
                 src = node.get("href")
             else:
                 src = node.get("data-src") or node.get("data-original") or node.get("src")
@@ -252,13 +245,13 @@ def _extract_image_urls(soup: BeautifulSoup, base_url: str) -> List[str]:
 
 
 
-def _extract_list(soup: BeautifulSoup, selectors: List[str], exclude_prefix: Optional[str] = None) -> List[str]:
+def _extract_list(page: ParsedPage, selectors: List[str], exclude_prefix: Optional[str] = None) -> List[str]:
     for selector in selectors:
-        node = soup.select_one(selector)
-        if not node:
+        node = page.select_one(selector)
+        if node is None:
             continue
         # IRecommend often has a title like 'Достоинства' or 'Недостатки'
-        text = node.get_text("\n", strip=True)
+        text = node_text(node, "\n")
         lines = [l.strip() for l in text.split("\n") if l.strip()]
         if exclude_prefix and lines and lines[0].lower().startswith(exclude_prefix.lower()):
             lines = lines[1:]
@@ -267,24 +260,26 @@ def _extract_list(soup: BeautifulSoup, selectors: List[str], exclude_prefix: Opt
     return []
 
 
-def parse_review_detail(html: str, source_url: str, base_url: str, logger: logging.Logger) -> ReviewDetail:
-    soup = BeautifulSoup(html, "lxml")
-    title = _extract_text(soup, REVIEW_TITLE_SELECTORS) or ""
-    content_html = _extract_content_html(soup)
-    rating = _extract_number(_extract_text(soup, REVIEW_RATING_SELECTORS))
-    rating_count = _extract_int(_extract_text(soup, REVIEW_RATING_COUNT_SELECTORS))
-    like_up = _extract_int(_extract_text(soup, REVIEW_LIKES_UP_SELECTORS))
-    like_down = _extract_int(_extract_text(soup, REVIEW_LIKES_DOWN_SELECTORS))
-    published_at = _parse_date(_extract_text(soup, REVIEW_PUBLISHED_SELECTORS))
+def parse_review_detail(
+    html: Union[str, ParsedPage], source_url: str, base_url: str, logger: logging.Logger
+) -> ReviewDetail:
+    page = as_page(html, source_url)
+    title = _extract_text(page, REVIEW_TITLE_SELECTORS) or ""
+    content_html, content_text = _extract_content_html(page)
+    rating = _extract_number(_extract_text(page, REVIEW_RATING_SELECTORS))
+    rating_count = _extract_int(_extract_text(page, REVIEW_RATING_COUNT_SELECTORS))
+    like_up = _extract_int(_extract_text(page, REVIEW_LIKES_UP_SELECTORS))
+    like_down = _extract_int(_extract_text(page, REVIEW_LIKES_DOWN_SELECTORS))
+    published_at = _parse_date(_extract_text(page, REVIEW_PUBLISHED_SELECTORS))
 
-    cat_url, sub_url, cat_name, sub_name, prod_name = _extract_breadcrumbs(soup)
+    cat_url, sub_url, cat_name, sub_name, prod_name = _extract_breadcrumbs(page)
 
-    image_urls = _extract_image_urls(soup, base_url)
+    image_urls = _extract_image_urls(page, base_url)
     
     product_image_url = None
     for sel in PRODUCT_IMAGE_SELECTORS:
-        node = soup.select_one(sel)
-        if node and node.get("src"):
+        node = page.select_one(sel)
+        if node is not None and node.get("src"):
             product_image_url = node.get("src")
             break
             
@@ -303,7 +298,7 @@ def parse_review_detail(html: str, source_url: str, base_url: str, logger: loggi
     product_source_url = None
     crumbs = []
     for selector in BREADCRUMB_SELECTORS:
-        nodes = soup.select(selector)
+        nodes = page.select(selector)
         for node in nodes:
             href = node.get("href")
             if href:
@@ -331,12 +326,11 @@ def parse_review_detail(html: str, source_url: str, base_url: str, logger: loggi
     # Method 2: Fallback to looking for a link wrapping the H1 or main title? 
     # (Not strictly reliable, Method 1 is better for structured sites like IRecommend)
 
-    # Basic excerpt generation
-    excerpt_soup = BeautifulSoup(content_html or "", "lxml")
-    excerpt = normalize_whitespace(excerpt_soup.get_text())[:300]
+    # Basic excerpt generation (from the content node already in the tree)
+    excerpt = normalize_whitespace(content_text)[:300]
 
-    pros = _extract_list(soup, REVIEW_PROS_SELECTORS, exclude_prefix="Достоинства")
-    cons = _extract_list(soup, REVIEW_CONS_SELECTORS, exclude_prefix="Недостатки")
+    pros = _extract_list(page, REVIEW_PROS_SELECTORS, exclude_prefix="Достоинства")
+    cons = _extract_list(page, REVIEW_CONS_SELECTORS, exclude_prefix="Недостатки")
 
     return ReviewDetail(
         source_url=source_url,
@@ -362,7 +356,7 @@ def parse_review_detail(html: str, source_url: str, base_url: str, logger: loggi
     )
 
 
-def extract_product_name(html: str) -> Optional[str]:
+def extract_product_name(html: Union[str, ParsedPage]) -> Optional[str]:
     """
     Extract product name from HTML content.
     Typically extracts from H1 tag and cleans up common suffixes.
@@ -371,12 +365,12 @@ def extract_product_name(html: str) -> Optional[str]:
     if not html:
         return None
     
-    soup = BeautifulSoup(html, "lxml")
+    page = as_page(html)
     
     # Try H1 first
-    h1 = soup.select_one("h1")
-    if h1:
-        text = h1.get_text(strip=True)
+    h1 = page.select_one("h1")
+    if h1 is not None:
+        text = node_text(h1)
         # Strip common Russian review suffixes
         text = re.sub(r"\s*[-—]+\s*\u043e\u0442\u0437\u044b\u0432\s*$", "", text, flags=re.I)
         text = re.sub(r"\s*[-—]+\s*review\s*$", "", text, flags=re.I)
@@ -385,13 +379,13 @@ def extract_product_name(html: str) -> Optional[str]:
             return text
     
     # Fallback: Try meta title
-    meta_title = soup.select_one('meta[property="og:title"]')
-    if meta_title and meta_title.get("content"):
+    meta_title = page.select_one('meta[property="og:title"]')
+    if meta_title is not None and meta_title.get("content"):
         return normalize_whitespace(meta_title.get("content"))
     
-    title_tag = soup.select_one("title")
-    if title_tag:
-        text = title_tag.get_text(strip=True)
+    title_tag = page.select_one("title")
+    if title_tag is not None:
+        text = node_text(title_tag)
         # Remove site name suffix
         text = re.sub(r"\s*[\|–—-]\s*[A-Za-z]+\.ru.*$", "", text, flags=re.I)
         return normalize_whitespace(text)
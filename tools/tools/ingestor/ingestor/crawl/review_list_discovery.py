@@ -1,9 +1,8 @@
 import logging
-from typing import List, Set
+from typing import List, Set, Union
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
-
+from .document import ParsedPage, as_page
 from .selectors import REVIEW_LINK_SELECTORS
 
 
@@ -25,11 +24,11 @@ def _page_url(base_url: str, page: int, sort_new: bool = False) -> str:
     return f"{base_url}{joiner}page={page}"
 
 
-def discover_review_links(html: str, base_url: str, logger: logging.Logger) -> List[str]:
-    soup = BeautifulSoup(html, "lxml")
+def discover_review_links(html: Union[str, ParsedPage], base_url: str, logger: logging.Logger) -> List[str]:
+    page = as_page(html)
     links: Set[str] = set()
     for selector in REVIEW_LINK_SELECTORS:
-        for link in soup.select(selector):
+        for link in page.select(selector):
             href = link.get("href")
             if not href:
                 continue
@@ -0,0 +1,133 @@
+"""
+Direct Postgres bulk path for maintenance scripts (backfills, resets, merges).
+
+PostgREST takes one request per batch and one statement per row change; for
+tables with tens of thousands of rows that turns into hours. Here rows are
+streamed with COPY into a temp table and merged with a single statement,
+inside one transaction.
+
+Needs `pip install "psycopg[binary]" psycopg_pool` and a direct connection
+string (Supabase: Project Settings -> Database -> Connection string), passed as
+DATABASE_URL. The ingestor itself never requires it.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+STAGING_TABLE = "_bulk_staged"
+MERGE_MODES = ("upsert", "ignore", "update")
+
+
+class PostgresBulk:
+    def __init__(self, dsn: str, logger: logging.Logger, pool_size: int = 4) -> None:
+        try:
+            from psycopg import sql
+            from psycopg.types.json import Jsonb
+            from psycopg_pool import ConnectionPool
+        except ImportError as exc:
+            raise RuntimeError('Direct Postgres path needs: pip install "psycopg[binary]" psycopg_pool') from exc
+        self._sql = sql
+        self._jsonb = Jsonb
+        self.logger = logger
+        self.pool = ConnectionPool(dsn, min_size=1, max_size=max(1, pool_size), open=True)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _value(self, value: Any) -> Any:
+        # COPY has no default adapter for dicts; lists go out as Postgres arrays
+        return self._jsonb(value) if isinstance(value, dict) else value
+
+    def run_staged(
+        self,
+        staging_select: str,
+        columns: Sequence[str],
+        rows: Iterable[Dict[str, Any]],
+        statements: List[str],
+    ) -> List[int]:
+        """
+        COPY `rows` into a temp table shaped like `staging_select` (e.g.
+        "select id, name from products"), run `statements` against it (they refer to
+        it as _bulk_staged) and commit. Returns the row count of each statement.
+        """
+        sql = self._sql
+        with self.pool.connection() as conn:
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute(
+                    sql.SQL("create temp table {} on commit drop as {} with no data").format(
+                        sql.Identifier(STAGING_TABLE), sql.SQL(staging_select)
+                    )
+                )
+                copy_sql = sql.SQL("copy {} ({}) from stdin").format(
+                    sql.Identifier(STAGING_TABLE), sql.SQL(", ").join(map(sql.Identifier, columns))
+                )
+                staged = 0
+                with cur.copy(copy_sql) as copy:
+                    for row in rows:
+                        copy.write_row([self._value(row.get(column)) for column in columns])
+                        staged += 1
+                counts = []
+                for statement in statements:
+                    cur.execute(statement)
+                    counts.append(cur.rowcount)
+        self.logger.info("Bulk: staged %d rows, statements affected %s", staged, counts)
+        return counts
+
+    def copy_rows(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        key_columns: Sequence[str],
+        mode: str = "upsert",
+        update_columns: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Merge `rows` into `table` in one transaction: COPY into a temp table, then
+        - upsert: INSERT ... ON CONFLICT (keys) DO UPDATE SET update_columns
+        - ignore: INSERT ... ON CONFLICT (keys) DO NOTHING
+        - update: UPDATE table FROM the staged rows, matched on keys (partial rows are fine)
+        Columns are taken from the first row. Returns the number of rows written.
+        """
+        if mode not in MERGE_MODES:
+            raise ValueError(f"Unsupported merge mode: {mode}")
+        if not rows:
+            return 0
+        sql = self._sql
+        columns = list(rows[0].keys())
+        keys = list(key_columns)
+        updates = [column for column in (update_columns or columns) if column not in keys]
+        target = sql.Identifier(table)
+        staged = sql.Identifier(STAGING_TABLE)
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        key_list = sql.SQL(", ").join(map(sql.Identifier, keys))
+
+        if mode == "update":
+            statement = sql.SQL("update {t} as t set {sets} from {s} as s where {match}").format(
+                t=target,
+                s=staged,
+                sets=sql.SQL(", ").join(
+                    sql.SQL("{c} = s.{c}").format(c=sql.Identifier(column)) for column in updates
+                ),
+                match=sql.SQL(" and ").join(
+                    sql.SQL("t.{k} = s.{k}").format(k=sql.Identifier(key)) for key in keys
+                ),
+            )
+        else:
+            if mode == "upsert" and updates:
+                conflict = sql.SQL("do update set {}").format(
+                    sql.SQL(", ").join(
+                        sql.SQL("{c} = excluded.{c}").format(c=sql.Identifier(column)) for column in updates
+                    )
+                )
+            else:
+                conflict = sql.SQL("do nothing")
+            # distinct on: a key staged twice would make ON CONFLICT touch the same row twice
+            statement = sql.SQL(
+                "insert into {t} ({cols}) select distinct on ({keys}) {cols} from {s} on conflict ({keys}) {conflict}"
+            ).format(t=target, s=staged, cols=column_list, keys=key_list, conflict=conflict)
+
+        staging_select = sql.SQL("select {} from {}").format(column_list, target)
+        with self.pool.connection() as conn:
+            staging_select_text = staging_select.as_string(conn)
+            statement_text = statement.as_string(conn)
+        return self.run_staged(staging_select_text, columns, rows, [statement_text])[0]
@@ -79,3 +79,92 @@ create table if not exists category_translations (
 
 create unique index if not exists category_translations_lang_slug_key
   on category_translations (lang, slug);
+
+
+create index if not exists source_map_status_discovered_at_idx
+  on source_map (status, discovered_at desc);
+
+alter table source_map add column if not exists claimed_by text;
+alter table source_map add column if not exists lease_expires_at timestamptz;
+
+-- Replaced by claim_sources below
+drop function if exists claim_source_batch(int, boolean, int, text[]);
+
+-- Atomically claim a batch of sources for one ingestor process (lease model).
+-- Candidates locked by a concurrent claim are skipped instead of waited on,
+-- so parallel ingestors never receive the same row. Rows left in `processing`
+-- whose lease ran out (crashed or killed worker) are claimed again, counting
+-- as one retry; rows from before leases existed expire lease_seconds after last_seen_at.
+create or replace function claim_sources(
+  p_worker_id text,
+  p_limit int,
+  p_lease_seconds int default 900,
+  p_include_failed boolean default false,
+  p_max_retries int default 3,
+  p_source_urls text[] default null
+)
+returns setof source_map
+language sql
+as $$
+  update source_map s
+     set status = 'processing',
+         retries = s.retries + case when s.status = 'processing' then 1 else 0 end,
+         claimed_by = p_worker_id,
+         lease_expires_at = now() + make_interval(secs => p_lease_seconds),
+         last_seen_at = now()
+   where s.source_url in (
+     select c.source_url
+       from source_map c
+      where (c.status = 'new'
+             or (p_include_failed and c.status = 'failed' and c.retries < p_max_retries)
+             or (c.status = 'processing'
+                 and c.retries < p_max_retries
+                 and coalesce(c.lease_expires_at, c.last_seen_at + make_interval(secs => p_lease_seconds)) < now()))
+        and (p_source_urls is null or c.source_url = any(p_source_urls))
+      order by c.discovered_at desc
+      limit p_limit
+      for update skip locked
+   )
+  returning s.*;
+$$;
+
+-- Extend the leases a worker still holds; returns how many it still owns.
+create or replace function renew_source_leases(
+  p_worker_id text,
+  p_source_urls text[],
+  p_lease_seconds int default 900
+)
+returns int
+language sql
+as $$
+  with renewed as (
+    update source_map
+       set lease_expires_at = now() + make_interval(secs => p_lease_seconds)
+     where claimed_by = p_worker_id
+       and status = 'processing'
+       and source_url = any(p_source_urls)
+    returning 1
+  )
+  select count(*)::int from renewed;
+$$;
+
+-- Hand back claimed rows a worker never started (shutdown before reaching them).
+create or replace function release_sources(
+  p_worker_id text,
+  p_source_urls text[]
+)
+returns int
+language sql
+as $$
+  with released as (
+    update source_map
+       set status = case when retries > 0 then 'failed' else 'new' end,
+           claimed_by = null,
+           lease_expires_at = null
+     where claimed_by = p_worker_id
+       and status = 'processing'
+       and source_url = any(p_source_urls)
+    returning 1
+  )
+  select count(*)::int from released;
+$$;
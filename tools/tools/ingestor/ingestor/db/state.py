@@ -1,7 +1,11 @@
+import asyncio
 import logging
-from datetime import datetime, timezone
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from ..stability import GracefulShutdown
 from .supabase_client import SupabaseClient
 
 
@@ -35,10 +39,34 @@ def fetch_new_sources(
     limit: int,
     include_failed: bool = False,
     max_retries: Optional[int] = None,
+    reclaim_lease_seconds: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     # Default to 3 retries if not specified - prevents infinite retry loops
     effective_max_retries = max_retries if max_retries and max_retries > 0 else 3
     
+    if reclaim_lease_seconds:
+        # Also offer `processing` rows whose lease ran out; claim_sources re-checks on the server
+        now = datetime.now(timezone.utc)
+        stale_before = (now - timedelta(seconds=reclaim_lease_seconds)).isoformat()
+        conditions = [
+            "status.eq.new",
+            f'and(status.eq.processing,retries.lt.{effective_max_retries},lease_expires_at.lt."{now.isoformat()}")',
+            f'and(status.eq.processing,retries.lt.{effective_max_retries},lease_expires_at.is.null,last_seen_at.lt."{stale_before}")',
+        ]
+        if include_failed:
+            conditions.append(f"and(status.eq.failed,retries.lt.{effective_max_retries})")
+        try:
+            return supabase.select(
+                "source_map",
+                columns="source_url, source_slug, retries, status",
+                filters=[("or", ",".join(conditions))],
+                order=("discovered_at", True),
+                limit=limit,
+            )
+        except Exception as exc:
+            # 42703: lease columns not migrated yet, select the plain way
+            if "42703" not in str(exc) and "lease_expires_at" not in str(exc):
+                raise
     if include_failed:
         filters: List[Tuple[str, str, Any]] = [("in", "status", ["new", "failed"])]
         # Always filter by max retries for failed items
@@ -54,6 +82,33 @@ def fetch_new_sources(
     )
 
 
+# Source URLs per `in` filter; keeps the request line well under proxy URL limits
+EXISTING_LOOKUP_CHUNK = 100
+
+
+def fetch_existing_reviews(supabase: SupabaseClient, source_urls: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Look up which candidate sources already have a review, one `in` query per chunk.
+    Returns {source_url: created_at} for every URL that exists in `reviews`.
+    """
+    existing: Dict[str, Optional[str]] = {}
+    unique = list(dict.fromkeys(url for url in source_urls if url))
+    for start in range(0, len(unique), EXISTING_LOOKUP_CHUNK):
+        chunk = unique[start : start + EXISTING_LOOKUP_CHUNK]
+        rows = supabase.select("reviews", "source_url, created_at", [("in", "source_url", chunk)])
+        for row in rows:
+            existing[row["source_url"]] = row.get("created_at")
+    return existing
+
+
+def mark_sources_processed(supabase: SupabaseClient, source_urls: List[str]) -> None:
+    for start in range(0, len(source_urls), EXISTING_LOOKUP_CHUNK):
+        supabase.update(
+            "source_map",
+            {"status": "processed", "last_seen_at": _now_iso()},
+            filters=[("in", "source_url", source_urls[start : start + EXISTING_LOOKUP_CHUNK])],
+        )
+
 
 def mark_processing(supabase: SupabaseClient, source_url: str) -> None:
     supabase.update(
@@ -90,3 +145,215 @@ def mark_failed(
         },
         filters=[("eq", "source_url", source_url)],
     )
+
+
+def claim_sources(
+    supabase: SupabaseClient,
+    worker_id: str,
+    limit: int,
+    lease_seconds: int,
+    include_failed: bool = False,
+    max_retries: Optional[int] = None,
+    source_urls: Optional[List[str]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Atomically lease up to `limit` sources to `worker_id` for `lease_seconds` in one
+    RPC (`claim_sources`, see schema.sql): new rows, failed rows if asked, and
+    `processing` rows whose lease expired. Rows locked or leased by another ingestor
+    are skipped, so parallel instances never get the same source. `source_urls`
+    restricts the claim to an already chosen set.
+
+    Returns None when the RPC is not installed (caller falls back to fetch_new_sources).
+    """
+    effective_max_retries = max_retries if max_retries and max_retries > 0 else 3
+    try:
+        rows = supabase.rpc(
+            "claim_sources",
+            {
+                "p_worker_id": worker_id,
+                "p_limit": limit,
+                "p_lease_seconds": lease_seconds,
+                "p_include_failed": include_failed,
+                "p_max_retries": effective_max_retries,
+                "p_source_urls": source_urls,
+            },
+        )
+    except Exception as exc:
+        message = str(exc)
+        if "PGRST202" in message or "claim_sources" in message:
+            if logger:
+                logger.warning("claim_sources RPC unavailable, falling back to unclaimed selects: %s", exc)
+            return None
+        raise
+    if source_urls:
+        # Keep the caller's ordering (category-interleaved)
+        by_url = {row["source_url"]: row for row in rows}
+        return [by_url[url] for url in source_urls if url in by_url]
+    return rows
+
+
+class SourceLeases:
+    """
+    Leases this worker holds on claimed source_map rows.
+
+    `keep_alive()` renews them every lease_seconds / 3 while items are in flight, so
+    long items (big translations, slow image uploads) are not reclaimed by another
+    ingestor. A source is released once its final state has been written.
+    """
+
+    def __init__(self, supabase: SupabaseClient, worker_id: str, lease_seconds: int, logger: logging.Logger) -> None:
+        self.supabase = supabase
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.logger = logger
+        self.renewals = 0
+        self._held: set = set()
+        self._lock = threading.Lock()
+
+    def track(self, source_urls: List[str]) -> None:
+        with self._lock:
+            self._held.update(source_urls)
+
+    def release(self, source_urls: List[str]) -> None:
+        with self._lock:
+            self._held.difference_update(source_urls)
+
+    def held(self) -> List[str]:
+        with self._lock:
+            return sorted(self._held)
+
+    def renew(self) -> int:
+        held = self.held()
+        if not held:
+            return 0
+        owned = self.supabase.rpc(
+            "renew_source_leases",
+            {"p_worker_id": self.worker_id, "p_source_urls": held, "p_lease_seconds": self.lease_seconds},
+        )
+        self.renewals += 1
+        if isinstance(owned, int) and owned < len(held):
+            self.logger.warning("Lease renewal: still own %d of %d sources (expired leases were reclaimed)", owned, len(held))
+        return len(held)
+
+    async def keep_alive(self) -> None:
+        interval = max(5.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.renew)
+            except Exception as exc:
+                self.logger.warning("Lease renewal failed: %s", exc)
+
+    def release_unfinished(self) -> int:
+        """Give back sources that never got a final state (e.g. shutdown before they started)."""
+        held = self.held()
+        if not held:
+            return 0
+        self.supabase.rpc("release_sources", {"p_worker_id": self.worker_id, "p_source_urls": held})
+        self.release(held)
+        return len(held)
+
+
+class SourceStateBuffer:
+    """
+    Collects source_map status transitions and writes them in bulk.
+
+    Transitions for the same source are coalesced (processing -> processed becomes one
+    row). The buffer is flushed with one upsert per column set once `flush_every`
+    sources are pending, `flush_seconds` have passed since the last flush, or a
+    graceful shutdown was requested; callers flush the rest at the end of a cycle.
+    Rows whose final state never reached the DB stay `processing` and are picked up
+    again as stale claims.
+    """
+
+    def __init__(
+        self,
+        supabase: SupabaseClient,
+        logger: logging.Logger,
+        flush_every: int = 20,
+        flush_seconds: float = 10.0,
+        leases: Optional[SourceLeases] = None,
+    ) -> None:
+        self.supabase = supabase
+        self.logger = logger
+        self.leases = leases
+        self.flush_every = max(1, flush_every)
+        self.flush_seconds = flush_seconds
+        self.flushes = 0
+        self.rows_written = 0
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def mark_processing(self, source_url: str) -> None:
+        self._record(source_url, {"status": "processing"})
+
+    def mark_processed(self, source_url: str, content_hash: Optional[str]) -> None:
+        updates: Dict[str, Any] = {"status": "processed"}
+        if content_hash:
+            updates["content_hash"] = content_hash
+        self._record(source_url, self._with_lease_cleared(updates))
+
+    def mark_failed(self, source_url: str, retries: int, error: str) -> None:
+        self._record(source_url, self._with_lease_cleared({"status": "failed", "retries": retries, "last_error": error[:500]}))
+
+    def _with_lease_cleared(self, updates: Dict[str, Any]) -> Dict[str, Any]:
+        # Only when leases are in use: the columns come with the claim_sources migration
+        if self.leases is not None:
+            updates.update({"claimed_by": None, "lease_expires_at": None})
+        return updates
+
+    def _record(self, source_url: str, updates: Dict[str, Any]) -> None:
+        with self._lock:
+            row = self._pending.setdefault(source_url, {"source_url": source_url})
+            row.update(updates)
+            row["last_seen_at"] = _now_iso()
+            due = (
+                len(self._pending) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+                or GracefulShutdown.get_instance().should_stop
+            )
+        if due:
+            # A buffered write must not fail the item that triggered it: the batch is
+            # back in the buffer and goes out with the next flush
+            try:
+                self.flush()
+            except Exception as exc:
+                self.logger.warning("source_map flush failed, retrying on the next flush: %s", exc)
+
+    def flush(self) -> int:
+        # One flush at a time so a slower earlier write cannot overwrite a newer state
+        with self._flush_lock:
+            with self._lock:
+                pending = list(self._pending.values())
+                self._pending = {}
+                self._last_flush = time.monotonic()
+            if not pending:
+                return 0
+            # PostgREST requires identical keys for every object in a bulk upsert
+            groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for row in pending:
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+            try:
+                for rows in groups.values():
+                    self.supabase.upsert("source_map", rows, on_conflict="source_url", returning="minimal")
+            except Exception:
+                # Put the batch back (newer transitions recorded meanwhile win) and let the caller see the error
+                with self._lock:
+                    for row in pending:
+                        newer = self._pending.get(row["source_url"])
+                        self._pending[row["source_url"]] = {**row, **newer} if newer else row
+                raise
+            self.flushes += 1
+            self.rows_written += len(pending)
+            if self.leases is not None:
+                # Final state is stored; stop renewing these leases
+                self.leases.release([row["source_url"] for row in pending if row["status"] != "processing"])
+            return len(pending)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {"flushes": self.flushes, "rows_written": self.rows_written, "pending": pending}
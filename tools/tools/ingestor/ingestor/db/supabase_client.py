@@ -1,34 +1,171 @@
 import logging
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+import httpx
 from supabase import Client, create_client
 
+from ..stability import get_db_limiter
+from .pg_bulk import MERGE_MODES, PostgresBulk
+
+COUNT_MODES = ("exact", "planned", "estimated")
+
+# Values per `in` filter, so the request line stays within proxy limits
+IN_FILTER_CHUNK = 100
+
+# Upper bounds (ms) of the request latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def quote_filter_value(value: Any) -> str:
+    # PostgREST logical filters: values with reserved characters must be double-quoted
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
 
 class SupabaseClient:
-    def __init__(self, url: str, key: str, logger: logging.Logger, dry_run: bool = False) -> None:
+    """
+    PostgREST access for the ingestor and the maintenance scripts.
+
+    One instance is shared by every thread the pipeline hands DB work to
+    (asyncio.to_thread): requests go through a single pooled httpx.Client with
+    keep-alive (HTTP/2 when `h2` is installed), so concurrent items reuse a few
+    TLS connections instead of opening new ones.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        logger: logging.Logger,
+        dry_run: bool = False,
+        pool_size: int = 10,
+        timeout_seconds: float = 30.0,
+        http2: bool = True,
+        database_url: Optional[str] = None,
+    ) -> None:
         self.client: Client = create_client(url, key)
-        self.logger = logger
+        self.logger = logger or logging.getLogger(__name__)
         self.dry_run = dry_run
+        self._use_pooled_session(pool_size, timeout_seconds, http2)
+        # Optional direct Postgres connection for copy_rows(); maintenance scripts only
+        self.direct: Optional[PostgresBulk] = (
+            PostgresBulk(database_url, self.logger, pool_size=min(4, pool_size)) if database_url else None
+        )
+        # HTTP requests per "<op> <table>", to compare round-trips before/after batching
+        self.round_trips: Counter = Counter()
+        self._round_trips_lock = threading.Lock()
+        # table -> request count per LATENCY_BUCKETS_MS bucket, plus total seconds
+        self.latency: Dict[str, List[int]] = {}
+        self.latency_seconds: Counter = Counter()
+
+    def _use_pooled_session(self, pool_size: int, timeout_seconds: float, http2: bool) -> None:
+        # Replace postgrest's default session with one sized for our DB concurrency;
+        # every query builder is created from `postgrest.session`
+        postgrest = self.client.postgrest
+        current = postgrest.session
+        limits = httpx.Limits(
+            max_connections=max(1, pool_size),
+            max_keepalive_connections=max(1, pool_size),
+            keepalive_expiry=60.0,
+        )
+        try:
+            session = httpx.Client(
+                base_url=current.base_url,
+                headers=current.headers,
+                timeout=timeout_seconds,
+                limits=limits,
+                http2=http2,
+                follow_redirects=True,
+            )
+        except ImportError:
+            # httpx without the `h2` extra
+            self.logger.warning("HTTP/2 unavailable (pip install httpx[http2]); using HTTP/1.1 keep-alive")
+            session = httpx.Client(
+                base_url=current.base_url,
+                headers=current.headers,
+                timeout=timeout_seconds,
+                limits=limits,
+                follow_redirects=True,
+            )
+        current.close()
+        postgrest.session = session
+
+    def close(self) -> None:
+        self.client.postgrest.session.close()
+        if self.direct is not None:
+            self.direct.close()
+
+    def _count_round_trip(self, label: str) -> None:
+        with self._round_trips_lock:
+            self.round_trips[label] += 1
+
+    def get_round_trips(self) -> Dict[str, int]:
+        with self._round_trips_lock:
+            stats = dict(self.round_trips.most_common())
+        stats["total"] = sum(self.round_trips.values())
+        return stats
+
+    def _record_latency(self, label: str, seconds: float) -> None:
+        # "select reviews" -> "reviews"; RPCs keep their prefix so they do not look like tables
+        table = label if label.startswith("rpc ") else label.split(" ", 1)[-1]
+        bucket = bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)
+        with self._round_trips_lock:
+            counts = self.latency.setdefault(table, [0] * (len(LATENCY_BUCKETS_MS) + 1))
+            counts[bucket] += 1
+            self.latency_seconds[table] += seconds
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per table: requests, total/mean ms, approximate p50/p95 (bucket upper bound) and the histogram."""
+        bounds = [f"<={ms}ms" for ms in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._round_trips_lock:
+            snapshot = {table: list(counts) for table, counts in self.latency.items()}
+            totals = dict(self.latency_seconds)
+
+        def percentile(counts: List[int], fraction: float) -> str:
+            target = fraction * sum(counts)
+            seen = 0
+            for idx, count in enumerate(counts):
+                seen += count
+                if count and seen >= target:
+                    return bounds[idx]
+            return bounds[-1]
+
+        stats = {}
+        for table, counts in sorted(snapshot.items(), key=lambda item: -totals[item[0]]):
+            requests = sum(counts)
+            stats[table] = {
+                "requests": requests,
+                "total_ms": round(totals[table] * 1000),
+                "mean_ms": round(totals[table] * 1000 / requests, 1),
+                "p50": percentile(counts, 0.5),
+                "p95": percentile(counts, 0.95),
+                "histogram": {bounds[idx]: count for idx, count in enumerate(counts) if count},
+            }
+        return stats
 
     def _execute(self, query: Any, label: str, allow_write: bool) -> List[Dict[str, Any]]:
         if self.dry_run and allow_write:
             self.logger.info("DRY RUN: skip %s", label)
             return []
-        response = query.execute()
+        self._count_round_trip(label)
+        with get_db_limiter():
+            started = time.perf_counter()
+            try:
+                response = query.execute()
+            finally:
+                self._record_latency(label, time.perf_counter() - started)
         error = getattr(response, "error", None)
         if error:
             raise RuntimeError(str(error))
         return response.data or []
 
-    def select(
-        self,
-        table: str,
-        columns: str = "*",
-        filters: Optional[List[Tuple[str, str, Any]]] = None,
-        order: Optional[Tuple[str, bool]] = None,
-        limit: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
-        query = self.client.table(table).select(columns)
+    @staticmethod
+    def _apply_filters(query: Any, filters: Optional[List[Tuple[str, str, Any]]]) -> Any:
         if filters:
             for filter_tuple in filters:
                 op = filter_tuple[0]
@@ -63,6 +200,17 @@ class SupabaseClient:
                         raise ValueError(f"Unsupported filter op: {op}")
                 else:
                     raise ValueError(f"Invalid filter tuple format: {filter_tuple}")
+        return query
+
+    def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[List[Tuple[str, str, Any]]] = None,
+        order: Optional[Tuple[str, bool]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        query = self._apply_filters(self.client.table(table).select(columns), filters)
         if order:
             column, desc = order
             query = query.order(column, desc=desc)
@@ -70,20 +218,220 @@ class SupabaseClient:
             query = query.limit(limit)
         return self._execute(query, f"select {table}", allow_write=False)
 
-    def insert(self, table: str, data: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def select_iter(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[List[Tuple[str, str, Any]]] = None,
+        key: Union[str, Sequence[str]] = "id",
+        page_size: int = 1000,
+        prefetch: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every matching row, `page_size` rows per request.
+
+        Pages are read by keyset on `key` (the primary key; a list of columns for
+        composite keys such as product_translations' (product_id, lang)) instead of
+        OFFSET, so late pages cost the same as the first and rows are not skipped or
+        repeated when the table changes underneath. Key columns are selected even when
+        `columns` leaves them out, and dropped again before yielding.
+        Only an empty page ends the iteration: PostgREST's `max-rows` silently caps
+        pages below `page_size`, so a short page is not taken as the last one.
+        With `prefetch`, the next page is requested while the caller works through the current one.
+        """
+        key_columns = [key] if isinstance(key, str) else list(key)
+        projection = columns
+        extra_keys: List[str] = []
+        if columns.strip() != "*":
+            selected = {column.strip() for column in columns.split(",")}
+            extra_keys = [column for column in key_columns if column not in selected]
+            if extra_keys:
+                projection = ", ".join([columns] + extra_keys)
+
+        def fetch_page(after: Optional[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+            page_filters = list(filters or [])
+            if after is not None:
+                page_filters.append(self._keyset_filter(key_columns, after))
+            query = self._apply_filters(self.client.table(table).select(projection), page_filters)
+            for column in key_columns:
+                query = query.order(column)
+            return self._execute(query.limit(page_size), f"select {table}", allow_write=False)
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            rows = fetch_page(None)
+            warned = False
+            while rows:
+                last = rows[-1]
+                cursor = tuple(last[column] for column in key_columns)
+                pending = executor.submit(fetch_page, cursor) if executor else None
+                short_page = len(rows) < page_size
+                for row in rows:
+                    for column in extra_keys:
+                        row.pop(column, None)
+                    yield row
+                rows = pending.result() if pending else fetch_page(cursor)
+                if rows and short_page and not warned:
+                    warned = True
+                    self.logger.warning(
+                        "select_iter %s: got a short page before the end (server max-rows below page_size=%d?)",
+                        table,
+                        page_size,
+                    )
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _keyset_filter(key_columns: List[str], after: Tuple[Any, ...]) -> Tuple[str, ...]:
+        if len(key_columns) == 1:
+            return ("gt", key_columns[0], after[0])
+        # (a, b) > (x, y)  ->  a > x or (a = x and b > y), as a PostgREST `or` filter
+        conditions = []
+        for idx, column in enumerate(key_columns):
+            equal = [f"{prev}.eq.{quote_filter_value(after[i])}" for i, prev in enumerate(key_columns[:idx])]
+            greater = f"{column}.gt.{quote_filter_value(after[idx])}"
+            conditions.append(f"and({','.join(equal + [greater])})" if equal else greater)
+        return ("or", ",".join(conditions))
+
+    def count(
+        self,
+        table: str,
+        filters: Optional[List[Tuple[str, str, Any]]] = None,
+        mode: str = "exact",
+    ) -> int:
+        """
+        Row count computed by PostgREST (HEAD request + `Prefer: count=<mode>`), no rows transferred.
+        mode: "exact" (COUNT(*)), "planned" (planner estimate) or "estimated" (exact up to the row cap, then planned).
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Unsupported count mode: {mode}")
+        query = self._apply_filters(self.client.table(table).select("*", count=mode, head=True), filters)
+        self._count_round_trip(f"count {table}")
+        with get_db_limiter():
+            started = time.perf_counter()
+            try:
+                response = query.execute()
+            finally:
+                self._record_latency(f"count {table}", time.perf_counter() - started)
+        error = getattr(response, "error", None)
+        if error:
+            raise RuntimeError(str(error))
+        return int(response.count or 0)
+
+    @staticmethod
+    def _with_returning(query: Any, returning: Optional[str]) -> Any:
+        # PostgREST answers a write with `Prefer: return=representation` using the
+        # `select` query param, so the requested columns come back in the same response
+        if returning and returning != "minimal":
+            query.params = query.params.set("select", returning.replace(" ", ""))
+        return query
+
+    def insert(
+        self,
+        table: str,
+        data: Iterable[Dict[str, Any]],
+        returning: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """returning: column list to get back (e.g. "id, source_url"), or "minimal" for no body."""
         payload = list(data)
         if not payload:
             return []
-        query = self.client.table(table).insert(payload)
+        if returning == "minimal":
+            query = self.client.table(table).insert(payload, returning="minimal")
+        else:
+            query = self._with_returning(self.client.table(table).insert(payload), returning)
         return self._execute(query, f"insert {table}", allow_write=True)
 
-    def upsert(self, table: str, data: Iterable[Dict[str, Any]], on_conflict: Optional[str] = None) -> List[Dict[str, Any]]:
+    def upsert(
+        self,
+        table: str,
+        data: Iterable[Dict[str, Any]],
+        on_conflict: Optional[str] = None,
+        returning: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """returning: column list to get back (e.g. "id, source_url"), or "minimal" for no body."""
         payload = list(data)
         if not payload:
             return []
-        query = self.client.table(table).upsert(payload, on_conflict=on_conflict)
+        if returning == "minimal":
+            query = self.client.table(table).upsert(payload, on_conflict=on_conflict, returning="minimal")
+        else:
+            query = self._with_returning(self.client.table(table).upsert(payload, on_conflict=on_conflict), returning)
         return self._execute(query, f"upsert {table}", allow_write=True)
 
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Call a Postgres function through PostgREST. Treated as a write (skipped in dry run)."""
+        query = self.client.rpc(function, params or {})
+        return self._execute(query, f"rpc {function}", allow_write=True)
+
+    def copy_rows(
+        self,
+        table: str,
+        rows: Iterable[Dict[str, Any]],
+        key_columns: Sequence[str],
+        mode: str = "upsert",
+        update_columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 500,
+    ) -> int:
+        """
+        Bulk-merge rows into `table` (mode: "upsert", "ignore" or "update", see PostgresBulk.copy_rows).
+
+        With a direct Postgres connection (database_url) this is one COPY + one merge
+        statement; without it the same merge goes through PostgREST in chunks
+        ("update" then costs one request per row). Rows should share the same keys.
+        """
+        if mode not in MERGE_MODES:
+            raise ValueError(f"Unsupported merge mode: {mode}")
+        payload = list(rows)
+        if not payload:
+            return 0
+        label = f"copy {table}"
+        if self.dry_run:
+            self.logger.info("DRY RUN: skip %s (%d rows)", label, len(payload))
+            return 0
+        if self.direct is not None:
+            written = 0
+            # One COPY per column set; the staging table takes its columns from the first row
+            by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for row in payload:
+                by_columns.setdefault(tuple(row), []).append(row)
+            for group in by_columns.values():
+                self._count_round_trip(label)
+                started = time.perf_counter()
+                try:
+                    written += self.direct.copy_rows(table, group, key_columns, mode, update_columns)
+                finally:
+                    self._record_latency(label, time.perf_counter() - started)
+            return written
+
+        if mode == "update":
+            # Rows setting the same values share one `in` request when the key is a single column
+            same_values: Dict[Tuple[Any, ...], List[Any]] = {}
+            for row in payload:
+                updates = {column: value for column, value in row.items() if column not in key_columns}
+                if update_columns:
+                    updates = {column: updates[column] for column in update_columns if column in updates}
+                if len(key_columns) == 1:
+                    try:
+                        same_values.setdefault(tuple(sorted(updates.items())), []).append(row[key_columns[0]])
+                        continue
+                    except TypeError:
+                        pass  # unhashable (json) values: one request for this row
+                self.update(table, updates, filters=[("eq", key, row[key]) for key in key_columns])
+            for values, keys in same_values.items():
+                for start in range(0, len(keys), IN_FILTER_CHUNK):
+                    self.update(table, dict(values), filters=[("in", key_columns[0], keys[start : start + IN_FILTER_CHUNK])])
+            return len(payload)
+        on_conflict = ",".join(key_columns)
+        for start in range(0, len(payload), chunk_size):
+            chunk = payload[start : start + chunk_size]
+            query = self.client.table(table).upsert(
+                chunk, on_conflict=on_conflict, ignore_duplicates=(mode == "ignore"), returning="minimal"
+            )
+            self._execute(query, f"upsert {table}", allow_write=True)
+        return len(payload)
+
     def update(
         self,
         table: str,
@@ -1,9 +1,10 @@
 import logging
-from typing import Any, Dict, Iterable, List, Optional
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from ..utils.hashing import short_hash
 from ..utils.slugify import slugify, contains_cyrillic, transliterate_name
-from .supabase_client import SupabaseClient
+from .supabase_client import SupabaseClient, quote_filter_value
 
 
 def fetch_categories_by_source_urls(
@@ -40,10 +41,12 @@ def upsert_categories(
 
     if unique_payload:
         payload = list(unique_payload.values())
-        supabase.upsert("categories", payload, on_conflict="source_url")
+        rows = supabase.upsert("categories", payload, on_conflict="source_url", returning="id, source_url")
         logger.info("Categories upserted: %s", len(payload))
+        if rows:
+            return {row["source_url"]: row["id"] for row in rows}
 
-
+    # Dry run (no rows come back from the write): read the existing ids
     return fetch_categories_by_source_urls(supabase, source_urls)
 
 
@@ -51,13 +54,7 @@ def upsert_review(
     supabase: SupabaseClient,
     payload: Dict[str, Any],
 ) -> str:
-    supabase.upsert("reviews", [payload], on_conflict="source_url")
-    rows = supabase.select(
-        "reviews",
-        columns="id",
-        filters=[("eq", "source_url", payload["source_url"])],
-        limit=1,
-    )
+    rows = supabase.upsert("reviews", [payload], on_conflict="source_url", returning="id")
     if not rows:
         raise RuntimeError("Failed to fetch review after upsert")
     return rows[0]["id"]
@@ -79,14 +76,147 @@ def update_review_photos(
 
 
 
+def _is_slug_conflict(exc: Exception) -> bool:
+    msg = str(exc).lower()
+    return "duplicate" in msg or "slug" in msg or "23505" in msg
+
+
+_CONFLICT_KEY_RE = re.compile(r"Key \((?:lang, )?slug\)=\((?:([^,()]+), )?([^)]+)\)")
+
+
+def _conflicting_slug(exc: Exception) -> Optional[Tuple[Optional[str], str]]:
+    # Postgres reports the violated key: 'Key (slug)=(some-slug) already exists.'
+    # (or 'Key (lang, slug)=(en, some-slug)' on tables with a per-language index)
+    match = _CONFLICT_KEY_RE.search(str(exc))
+    if not match:
+        return None
+    lang = match.group(1).strip() if match.group(1) else None
+    return lang, match.group(2).strip()
+
+
+def _suffix_slug(payload: Dict[str, Any], original_slug: str, entropy_prefix: str, owner_id: Any, attempt: int) -> None:
+    entropy = f"{entropy_prefix}{owner_id}-{payload['lang']}-{attempt}-{original_slug}"
+    payload["slug"] = f"{original_slug}-{short_hash(entropy)}"
+
+
+def _upsert_translation_row(
+    supabase: SupabaseClient,
+    table: str,
+    owner_column: str,
+    owner_id: Any,
+    payload: Dict[str, Any],
+    original_slug: str,
+    entropy_prefix: str,
+    label: str,
+    logger: logging.Logger,
+) -> None:
+    for attempt in range(10):
+        try:
+            supabase.upsert(table, [payload], on_conflict=f"{owner_column},lang")
+            return
+        except Exception as exc:
+            if not _is_slug_conflict(exc):
+                raise
+            _suffix_slug(payload, original_slug, entropy_prefix, owner_id, attempt)
+            logger.warning("%s slug conflict for %s (attempt %d/10), retrying with %s",
+                           label, payload["lang"], attempt + 1, payload["slug"])
+    raise RuntimeError(f"Failed to upsert {label.lower()} translation after retries (lang={payload['lang']})")
+
+
+def _upsert_translations(
+    supabase: SupabaseClient,
+    table: str,
+    owner_column: str,
+    owner_id: Any,
+    payloads: List[Dict[str, Any]],
+    entropy_prefix: str,
+    label: str,
+    logger: logging.Logger,
+    slug_per_lang: bool = False,
+) -> None:
+    """
+    Upsert all languages of one review/category/product in a single request.
+
+    Slugs are unique across all languages, or per language with slug_per_lang
+    (category_translations is only unique on (lang, slug)). Slugs already held by
+    any other row (another owner, or this owner in another language when unique
+    across languages) are found up front with one `in` lookup, and languages that
+    share a slug inside the batch (brand names often transliterate the same) are
+    suffixed before sending. If the batch still hits a
+    slug conflict, only the row named in the error gets a new slug; when the error
+    does not say which row, every row falls back to the per-row retry loop.
+    """
+    # One row per language (last wins, as with the old per-row loop); Postgres rejects
+    # an upsert batch that touches the same conflict key twice
+    payloads = list({payload["lang"]: payload for payload in payloads}.values())
+    if not payloads:
+        return
+    original_slugs = {payload["lang"]: payload["slug"] for payload in payloads}
+
+    taken = supabase.select(
+        table,
+        columns=f"{owner_column}, lang, slug",
+        filters=[("in", "slug", sorted({payload["slug"] for payload in payloads}))],
+    )
+    def key(lang: str, slug: str) -> Any:
+        return (lang, slug) if slug_per_lang else slug
+
+    # A slug is free only for the row that already holds it (same owner, same lang);
+    # that row keeps it, other languages of the batch asking for it get a suffix
+    holders = {key(row["lang"], row["slug"]): (str(row[owner_column]), row["lang"]) for row in taken}
+    claimed = {
+        key(payload["lang"], payload["slug"]) for payload in payloads
+        if holders.get(key(payload["lang"], payload["slug"])) == (str(owner_id), payload["lang"])
+    }
+    for payload in payloads:
+        holder = holders.get(key(payload["lang"], payload["slug"]))
+        if holder == (str(owner_id), payload["lang"]):
+            continue
+        if key(payload["lang"], payload["slug"]) in claimed or holder:
+            _suffix_slug(payload, original_slugs[payload["lang"]], entropy_prefix, owner_id, 0)
+            logger.warning("%s slug taken for %s, using %s", label, payload["lang"], payload["slug"])
+        claimed.add(key(payload["lang"], payload["slug"]))
+
+    attempts: Dict[str, int] = {}
+    for _ in range(10):
+        try:
+            supabase.upsert(table, payloads, on_conflict=f"{owner_column},lang")
+            return
+        except Exception as exc:
+            if not _is_slug_conflict(exc):
+                raise
+            conflict = _conflicting_slug(exc)
+            row = None
+            if conflict:
+                conflict_lang, slug = conflict
+                row = next((
+                    p for p in payloads
+                    if p["slug"] == slug and (conflict_lang is None or p["lang"] == conflict_lang)
+                ), None)
+            if row is None:
+                break
+            lang = row["lang"]
+            attempts[lang] = attempts.get(lang, 0) + 1
+            _suffix_slug(row, original_slugs[lang], entropy_prefix, owner_id, attempts[lang])
+            logger.warning("%s slug conflict for %s (attempt %d/10), retrying with %s",
+                           label, lang, attempts[lang], row["slug"])
+
+    for payload in payloads:
+        _upsert_translation_row(
+            supabase, table, owner_column, owner_id, payload,
+            original_slugs[payload["lang"]], entropy_prefix, label, logger,
+        )
+
+
 def upsert_review_translations(
     supabase: SupabaseClient,
     review_id: str,
     translations: Iterable[Dict[str, Any]],
     logger: logging.Logger,
 ) -> None:
+    payloads = []
     for translation in translations:
-        payload = {
+        payloads.append({
             "review_id": review_id,
             "lang": translation["lang"],
             "title": translation["title"],
@@ -100,32 +230,9 @@ def upsert_review_translations(
             "specs": translation.get("specs"),
             "pros": translation.get("pros"),
             "cons": translation.get("cons"),
-        }
-        
-        # Suffix slug with review identifier to ensure uniqueness across the board
-        original_slug = payload["slug"]
-        for attempt in range(10):
-            try:
-                supabase.upsert(
-                    "review_translations",
-                    [payload],
-                    on_conflict="review_id,lang",
-                )
-                break
-            except Exception as exc:
-                msg = str(exc).lower()
-                if "duplicate" in msg or "slug" in msg or "23505" in msg:
-                    # Append a unique hash based on review_id, lang, and attempt
-                    # Adding a larger chunk of review_id to ensure global uniqueness
-                    entropy = f"{review_id}-{translation['lang']}-{attempt}-{original_slug}"
-                    suffix = short_hash(entropy)
-                    payload["slug"] = f"{original_slug}-{suffix}"
-                    logger.warning("Slug conflict for %s (attempt %d/10), retrying with %s", 
-                                   translation["lang"], attempt + 1, payload["slug"])
-                else:
-                    raise
-        else:
-            raise RuntimeError(f"Failed to upsert review translation after retries (lang={translation['lang']})")
+        })
+    # Conflicting slugs get a hash of review_id, lang and attempt appended for global uniqueness
+    _upsert_translations(supabase, "review_translations", "review_id", review_id, payloads, "", "Review", logger)
 
 def upsert_category_translations(
     supabase: SupabaseClient,
@@ -133,39 +240,25 @@ def upsert_category_translations(
     translations: Iterable[Dict[str, Any]],
     logger: logging.Logger,
 ) -> None:
-    for translation in translations:
-        payload = {
+    payloads = [
+        {
             "category_id": category_id,
             "lang": translation["lang"],
             "name": translation["name"],
             "slug": translation["slug"],
         }
-        original_slug = payload["slug"]
-        for attempt in range(10):
-            try:
-                supabase.upsert(
-                    "category_translations",
-                    [payload],
-                    on_conflict="category_id,lang",
-                )
-                break
-            except Exception as exc:
-                msg = str(exc).lower()
-                if "duplicate" in msg or "slug" in msg or "23505" in msg:
-                    # Append unique hash for category lang unique slug
-                    entropy = f"cat-{category_id}-{translation['lang']}-{attempt}-{original_slug}"
-                    suffix = short_hash(entropy)
-                    payload["slug"] = f"{original_slug}-{suffix}"
-                    logger.warning("Category slug conflict for %s (attempt %d/10), retrying with %s", 
-                                   translation["lang"], attempt + 1, payload["slug"])
-                else:
-                    raise
-        else:
-            raise RuntimeError(f"Failed to upsert category translation after retries (lang={translation['lang']})")
+        for translation in translations
+    ]
+    # category_translations is unique on (lang, slug): the same slug in several languages is fine
+    _upsert_translations(
+        supabase, "category_translations", "category_id", category_id, payloads, "cat-", "Category", logger,
+        slug_per_lang=True,
+    )
 
 def upsert_product(
     supabase: SupabaseClient,
     payload: Dict[str, Any],
+    legacy_url_lookup: bool = True,
 ) -> str:
     # Check if product exists by source_url (column or legacy description marker) or slug
     name = payload.get("name", "Unknown Product")
@@ -181,21 +274,38 @@ def upsert_product(
         message = str(exc).lower()
         return column.lower() in message and "does not exist" in message
 
-    use_source_url_column = True
-    if source_url:
-        try:
-            rows = supabase.select(
-                "products",
-                columns="id",
-                filters=[("eq", "source_url", source_url)],
-                limit=1,
-            )
-            if rows:
-                return rows[0]["id"]
-        except Exception as exc:
-            if _is_missing_column(exc, "source_url"):
-                use_source_url_column = False
+    def _lookup(with_source_url: bool) -> List[Dict[str, Any]]:
+        # One request for the "already exists" case: source_url, slug or exact name
+        conditions = [f"slug.eq.{quote_filter_value(base_slug)}", f"name.eq.{quote_filter_value(name)}"]
+        columns = "id, slug, name"
+        if with_source_url:
+            conditions.insert(0, f"source_url.eq.{quote_filter_value(source_url)}")
+            columns = "id, source_url, slug, name"
+        return supabase.select(
+            "products",
+            columns=columns,
+            filters=[("or", ",".join(conditions))],
+            limit=10,
+        )
 
+    use_source_url_column = bool(source_url)
+    try:
+        candidates = _lookup(use_source_url_column)
+    except Exception as exc:
+        if not (use_source_url_column and _is_missing_column(exc, "source_url")):
+            raise
+        use_source_url_column = False
+        candidates = _lookup(False)
+
+    # 1. Match by source_url
+    if use_source_url_column:
+        for row in candidates:
+            if row.get("source_url") == source_url:
+                return row["id"]
+
+    # Legacy marker: products created before the source_url column kept it in the description.
+    # Leading-wildcard scan; skipped once migrate_product_source_urls.py has backfilled the column
+    if source_url and (legacy_url_lookup or not use_source_url_column):
         try:
             rows = supabase.select(
                 "products",
@@ -217,15 +327,15 @@ def upsert_product(
         except Exception:
             pass
 
-    # 2. Try to find existing product by Slug
-    rows = supabase.select("products", columns="id", filters=[("eq", "slug", base_slug)], limit=1)
-    if rows:
-        return rows[0]["id"]
+    # 2. Existing product by Slug
+    for row in candidates:
+        if row.get("slug") == base_slug:
+            return row["id"]
 
-    # 3. Fallback: Try match by Name (Exact Name Match)
-    rows_name = supabase.select("products", columns="id", filters=[("eq", "name", name)], limit=1)
-    if rows_name:
-        return rows_name[0]["id"]
+    # 3. Fallback: Exact Name Match
+    for row in candidates:
+        if row.get("name") == name:
+            return row["id"]
     
     # 4. Insert new product
     base_desc = payload.get("description") or f"Product: {name}"
@@ -244,50 +354,29 @@ def upsert_product(
         product_payload["source_url"] = source_url
     
     try:
-        supabase.upsert("products", [product_payload], on_conflict="slug")
+        rows = supabase.upsert("products", [product_payload], on_conflict="slug", returning="id")
     except Exception as e:
         handled = False
-        if source_url and use_source_url_column and _is_missing_column(e, "source_url"):
+        rows = []
+        if source_url and use_source_url_column and "products_source_url_key" in str(e):
+            # Another item inserted the same product between our lookup and the write
+            rows = supabase.select("products", columns="id", filters=[("eq", "source_url", source_url)], limit=1)
+            handled = True
+        elif source_url and use_source_url_column and _is_missing_column(e, "source_url"):
             product_payload.pop("source_url", None)
-            supabase.upsert("products", [product_payload], on_conflict="slug")
-            use_source_url_column = False
+            rows = supabase.upsert("products", [product_payload], on_conflict="slug", returning="id")
             handled = True
         if not handled:
             # Retry with hashed slug if conflict
             if source_url:
                 product_payload["slug"] = f"{base_slug}-{short_hash(source_url)}"
-                supabase.upsert("products", [product_payload], on_conflict="slug")
+                rows = supabase.upsert("products", [product_payload], on_conflict="slug", returning="id")
             else:
                 raise e
-    
-    # Fetch back ID
-    # Use strict match first if we just inserted with URL
-    if source_url and use_source_url_column:
-        try:
-            rows = supabase.select(
-                "products",
-                columns="id",
-                filters=[("eq", "source_url", source_url)],
-                limit=1,
-            )
-            if rows:
-                return rows[0]["id"]
-        except Exception:
-            pass
-    if source_url and not use_source_url_column:
-        rows = supabase.select("products", columns="id", filters=[("ilike", "description", f"%{source_url}%")], limit=1)
-        if rows:
-            return rows[0]["id"]
 
-    rows = supabase.select("products", columns="id", filters=[("eq", "name", name)], limit=1)
     if rows:
         return rows[0]["id"]
 
-    # Iterate to find what we just inserted if slug was modified
-    rows = supabase.select("products", columns="id", order=("created_at", "desc"), limit=1)
-    if rows and rows[0]["name"] == name: # Sanity check
-         return rows[0]["id"]
-
     raise RuntimeError(f"Failed to upsert product: {name}")
 
 def upsert_product_translations(
@@ -296,9 +385,10 @@ def upsert_product_translations(
     translations: Iterable[Dict[str, Any]],
     logger: logging.Logger,
 ) -> None:
+    payloads = []
     for translation in translations:
         name = translation.get("name") or "Unknown Product"
-        payload = {
+        payloads.append({
             "product_id": product_id,
             "lang": translation["lang"],
             "slug": translation.get("slug") or slugify(name),
@@ -306,25 +396,8 @@ def upsert_product_translations(
             "description": translation.get("description"),
             "meta_title": translation.get("meta_title"),
             "meta_description": translation.get("meta_description"),
-        }
-        original_slug = payload["slug"]
-        for attempt in range(10):
-            try:
-                supabase.upsert("product_translations", [payload], on_conflict="product_id,lang")
-                break
-            except Exception as exc:
-                msg = str(exc).lower()
-                if "duplicate" in msg or "slug" in msg or "23505" in msg:
-                    # Append unique hash for product lang unique slug
-                    entropy = f"prod-{product_id}-{translation['lang']}-{attempt}-{original_slug}"
-                    suffix = short_hash(entropy)
-                    payload["slug"] = f"{original_slug}-{suffix}"
-                    logger.warning("Product slug conflict for %s (attempt %d/10), retrying with %s", 
-                                   translation["lang"], attempt + 1, payload["slug"])
-                else:
-                    raise
-        else:
-            raise RuntimeError(f"Failed to upsert product translation after retries (lang={translation['lang']})")
+        })
+    _upsert_translations(supabase, "product_translations", "product_id", product_id, payloads, "prod-", "Product", logger)
 
 def upsert_product_image(
     supabase: SupabaseClient,
@@ -57,7 +57,7 @@ class ProfilePool:
         self.recent: Deque[str] = deque(maxlen=25)
 
     def load_or_create(self) -> None:
-        profiles = self.supabase.select("profiles", columns="user_id, username, bio")
+        profiles = list(self.supabase.select_iter("profiles", "user_id, username, bio", key="user_id"))
         if len(profiles) < self.desired_size:
             to_create = self.desired_size - len(profiles)
             new_profiles = []
@@ -71,7 +71,7 @@ class ProfilePool:
                     }
                 )
             self.supabase.upsert("profiles", new_profiles, on_conflict="username")
-            profiles = self.supabase.select("profiles", columns="user_id, username, bio")
+            profiles = list(self.supabase.select_iter("profiles", "user_id, username, bio", key="user_id"))
         
         # Normalize to the bot's expected internal format (id, display_name)
         # Assign virtual specialities
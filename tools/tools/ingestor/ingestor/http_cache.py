@@ -0,0 +1,258 @@
+"""
+On-disk cache for source-site pages fetched through HttpClient.get.
+
+Category listings are rescanned every discovery cycle. Responses are stored in SQLite (zlib-compressed body plus
+ETag / Last-Modified), keyed by the normalized URL:
+- A fresh entry (younger than the TTL of the first matching URL rule) is served
+  without touching the network or the politeness sleep
+- A stale entry is revalidated with If-None-Match / If-Modified-Since; a 304 reuses the stored body
+- URLs that match no rule are not cached. Review pages (/content/) are left out by
+  default: a 200 challenge page or a page that failed to parse would otherwise be
+  served again to every retry of that source until the entry expires
+- When the file grows past the size cap, least recently used entries are evicted
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+DEFAULT_CACHE_PATH = ".cache/http_responses.sqlite"
+DEFAULT_MAX_MB = 256
+# pattern=hours, first match wins; 0 = keep only for revalidation (always a conditional GET)
+DEFAULT_TTL_RULES = "new=1=0,/category/=6"
+
+# Check the total size every N writes instead of after each one
+_EVICT_CHECK_EVERY = 50
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "yclid")
+
+
+def normalize_url(url: str) -> str:
+    """Cache key: lowercased scheme/host, no fragment, sorted query without tracking params."""
+    parsed = urlparse(url)
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    )
+    path = parsed.path or "/"
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, "", urlencode(query), ""))
+
+
+def parse_ttl_rules(spec: str) -> List[Tuple[re.Pattern, float]]:
+    """"new=1=0,/category/=6" -> [(re("new=1"), 0s), (re("/category/"), 6h)]."""
+    rules = []
+    for part in (spec or "").split(","):
+        pattern, sep, hours = part.strip().rpartition("=")
+        if not sep or not pattern:
+            continue
+        try:
+            rules.append((re.compile(pattern), max(0.0, float(hours)) * 3600))
+        except (re.error, ValueError):
+            continue
+    return rules
+
+
+@dataclass
+class CachedResponse:
+    """The parts of a curl_cffi Response the crawlers use, rebuilt from the cache."""
+    url: str
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    status_code: int = 200
+    encoding: str = "utf-8"
+    from_cache: bool = True
+    revalidated: bool = False  # served after a 304
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpResponseCache:
+    def __init__(
+        self,
+        path: str,
+        logger: logging.Logger,
+        ttl_rules: str = DEFAULT_TTL_RULES,
+        max_mb: float = DEFAULT_MAX_MB,
+    ) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.logger = logger
+        self.rules = parse_ttl_rules(ttl_rules)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self._writes_since_check = 0
+        self._lock = threading.Lock()
+        # Fetches run in asyncio.to_thread workers; one shared connection behind a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+        self._conn.commit()
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """TTL in seconds of the first matching rule, None when the URL is not cached at all."""
+        for pattern, ttl in self.rules:
+            if pattern.search(url):
+                return ttl
+        return None
+
+    def lookup(self, url: str) -> Tuple[Optional[CachedResponse], Dict[str, str]]:
+        """
+        Returns (fresh response, {}) on a hit, or (None, conditional headers) when
+        the caller has to fetch; the headers are empty when nothing usable is stored.
+        """
+        ttl = self.ttl_for(url)
+        if ttl is None:
+            return None, {}
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, body, content_type, etag, last_modified, fetched_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, {}
+            stored_url, body, content_type, etag, last_modified, fetched_at = row
+            if now - fetched_at < ttl:
+                self._conn.execute("UPDATE pages SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+                content = zlib.decompress(body)
+                self.bytes_saved += len(content)
+                return CachedResponse(stored_url, content, {"Content-Type": content_type or ""}), {}
+            self.misses += 1
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return None, headers
+
+    def revalidate(self, url: str) -> Optional[CachedResponse]:
+        """The server answered 304: mark the entry fresh again and return it."""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT url, body, content_type FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET fetched_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+            self._conn.commit()
+            self.revalidated += 1
+            content = zlib.decompress(row[1])
+            self.bytes_saved += len(content)
+        return CachedResponse(row[0], content, {"Content-Type": row[2] or ""}, revalidated=True)
+
+    def store(self, url: str, response) -> None:
+        if self.ttl_for(url) is None or response.status_code != 200:
+            return
+        headers = response.headers or {}
+        content_type = headers.get("Content-Type") or headers.get("content-type") or ""
+        if content_type and "html" not in content_type and "xml" not in content_type:
+            return
+        body = zlib.compress(response.content, 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (key, url, body, content_type, etag, last_modified, size, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_url(url),
+                    str(getattr(response, "url", None) or url),
+                    body,
+                    content_type,
+                    headers.get("ETag") or headers.get("etag"),
+                    headers.get("Last-Modified") or headers.get("last-modified"),
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+            self.stores += 1
+            self._writes_since_check += 1
+            if self._writes_since_check >= _EVICT_CHECK_EVERY:
+                self._writes_since_check = 0
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if self.max_bytes and total > self.max_bytes:
+            # Evict down to 90% of the cap so we are not back here on the next write
+            to_free = total - int(self.max_bytes * 0.9)
+            keys = []
+            for key, size in self._conn.execute("SELECT key, size FROM pages ORDER BY last_access ASC"):
+                keys.append((key,))
+                to_free -= size
+                if to_free <= 0:
+                    break
+            self._conn.executemany("DELETE FROM pages WHERE key = ?", keys)
+            self.evictions += len(keys)
+            self.logger.info("HTTP cache: evicted %d least recently used pages", len(keys))
+        self._conn.commit()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated_304": self.revalidated,
+                "misses": self.misses,
+                "hit_rate": f"{(self.hits / lookups * 100) if lookups else 0:.1f}%",
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_mb": round(total / (1024 * 1024), 2),
+                "saved_mb": round(self.bytes_saved / (1024 * 1024), 2),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_http_cache(
+    path: Optional[str],
+    logger: logging.Logger,
+    ttl_rules: str = DEFAULT_TTL_RULES,
+    max_mb: float = DEFAULT_MAX_MB,
+) -> Optional[HttpResponseCache]:
+    """Open the cache, or return None when disabled (empty path) or unusable."""
+    if not path:
+        return None
+    try:
+        return HttpResponseCache(path, logger, ttl_rules=ttl_rules, max_mb=max_mb)
+    except sqlite3.Error as e:
+        logger.warning("HTTP response cache disabled, could not open %s: %s", path, e)
+        return None
@@ -1,15 +1,18 @@
+import asyncio
 import logging
 import time
 import random
 import threading
 import uuid
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Union
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
 import cloudscraper
 from curl_cffi import requests as cffi_requests
 import requests
 
+from .http_cache import HttpResponseCache
+from .stability import get_host_scheduler, get_source_limiter
 from .utils.backoff import backoff_delay, sleep_with_backoff
 
 
@@ -102,8 +105,10 @@ class HttpClient:
         logger: logging.Logger,
         proxy: Optional[str] = None,
         proxy_pool: Optional[List[str]] = None,
+        cache: Optional[HttpResponseCache] = None,
     ):
         self.timeout_seconds = timeout_seconds
+        self.cache = cache
         self.max_retries = max_retries
         self.logger = logger
         self._lock = threading.Lock()
@@ -250,6 +255,12 @@ class HttpClient:
         return self._rotate_proxy("cooldown")
 
     def _reset_sessions(self, reason: str, proxy: Optional[str]) -> None:
+        self._rotate_identity(reason)
+        self.session = cffi_requests.Session(impersonate=self._current_impersonation)
+        self._scraper = self._build_scraper()
+        self._warmup(proxy=proxy)
+
+    def _rotate_identity(self, reason: str) -> None:
         # Rotate browser impersonation to avoid TLS fingerprint blocking
         old_impersonation = getattr(self, '_current_impersonation', 'chrome120')
         self._current_impersonation = random.choice(BROWSER_IMPERSONATIONS)
@@ -270,10 +281,6 @@ class HttpClient:
             reason, old_impersonation, self._current_impersonation,
             old_session_id, self._session_id
         )
-        
-        self.session = cffi_requests.Session(impersonate=self._current_impersonation)
-        self._scraper = self._build_scraper()
-        self._warmup(proxy=proxy)
 
     def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
         if response is not None:
@@ -292,6 +299,7 @@ class HttpClient:
         allow_redirects: bool,
         proxies: Optional[Dict[str, str]],
         headers: Dict[str, str],
+        stream: bool = False,
     ) -> Optional[requests.Response]:
         try:
             merged_headers = dict(self._default_headers)
@@ -304,12 +312,85 @@ class HttpClient:
                 allow_redirects=allow_redirects,
                 proxies=proxies,
                 headers=merged_headers,
+                stream=stream,
             )
         except Exception as exc:
             self.logger.warning("Cloudscraper fallback failed for %s: %s", url, exc)
             return None
 
-    def get(self, url: str, allow_redirects: bool = True) -> cffi_requests.Response:
+    def get(self, url: str, allow_redirects: bool = True, stream: bool = False) -> cffi_requests.Response:
+        """
+        With stream=True the body is not read yet (iter_content) and the caller
+        must close the response; streamed requests bypass the page cache and
+        the per-host pacing.
+        """
+        if stream:
+            if _needs_proxy(url):
+                with get_source_limiter():
+                    return self._get(url, allow_redirects, stream=True)
+            return self._get(url, allow_redirects, stream=True)
+        conditional: Dict[str, str] = {}
+        if self.cache is not None:
+            cached, conditional = self.cache.lookup(url)
+            if cached is not None:
+                # Fresh copy: no request, no politeness sleep
+                return cached
+        # Source-site fetches share one politeness budget across concurrent items
+        if _needs_proxy(url):
+            with get_source_limiter():
+                response = self._get(url, allow_redirects, conditional)
+        else:
+            response = self._get(url, allow_redirects, conditional)
+        if self.cache is not None:
+            if response.status_code == 304 and conditional:
+                revalidated = self.cache.revalidate(url)
+                if revalidated is not None:
+                    return revalidated
+                # Entry evicted in the meantime: fetch the page itself
+                return self._get(url, allow_redirects)
+            else:
+                self.cache.store(url, response)
+        return response
+
+    def _select_proxy(self, url: str) -> Optional[str]:
+        if not _needs_proxy(url):
+            return None
+        selected_proxy = self._current_proxy()
+        # For rotating proxy, don't skip even if in cooldown - just reset session
+        if not selected_proxy and self._proxy_pool:
+            # Clear cooldowns and reset
+            self._proxy_cooldown_until.clear()
+            selected_proxy = self._proxy_pool[0]
+            self._proxy = selected_proxy
+        return selected_proxy
+
+    def _request_options(
+        self,
+        url: str,
+        selected_proxy: Optional[str],
+        extra_headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Optional[Dict[str, str]], Dict[str, str]]:
+        # Apply proxy with session ID for guaranteed new IP
+        proxies = None
+        if selected_proxy:
+            proxy_with_session = self._get_proxy_with_session_id(selected_proxy)
+            proxies = {"http": proxy_with_session, "https": proxy_with_session}
+
+        # Ensure Referer is set for deep links (basic heuristic)
+        headers = dict(self._default_headers)
+        if "irecommend.ru" in url and url != "https://irecommend.ru/":
+            headers["Referer"] = "https://irecommend.ru/"
+        if extra_headers:
+            headers.update(extra_headers)
+        return proxies, headers
+
+    def _get(
+        self,
+        url: str,
+        allow_redirects: bool = True,
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> cffi_requests.Response:
         last_exc: Optional[Exception] = None
         block_retries = 0  # Separate counter for bot protection retries
         
@@ -317,40 +398,28 @@ class HttpClient:
         effective_max_retries = max(self.max_retries, MAX_BLOCK_RETRIES) if _needs_proxy(url) else self.max_retries
         
         for attempt in range(effective_max_retries + 1):
-            selected_proxy = None
-            if _needs_proxy(url):
-                selected_proxy = self._current_proxy()
-                # For rotating proxy, don't skip even if in cooldown - just reset session
-                if not selected_proxy and self._proxy_pool:
-                    # Clear cooldowns and reset
-                    self._proxy_cooldown_until.clear()
-                    selected_proxy = self._proxy_pool[0]
-                    self._proxy = selected_proxy
+            selected_proxy = self._select_proxy(url)
+            # Per-host spacing between page requests (not while holding the session lock).
+            # Streamed image downloads are not paced: photos live on the source host too
+            if not stream:
+                get_host_scheduler().wait(url)
             
             try:
                 with self._lock:
-                    # Apply proxy with session ID for guaranteed new IP
-                    proxies = None
-                    if selected_proxy:
-                        proxy_with_session = self._get_proxy_with_session_id(selected_proxy)
-                        proxies = {"http": proxy_with_session, "https": proxy_with_session}
-                    
-                    # Ensure Referer is set for deep links (basic heuristic)
-                    headers = dict(self._default_headers)
-                    if "irecommend.ru" in url and url != "https://irecommend.ru/":
-                        headers["Referer"] = "https://irecommend.ru/"
-
+                    proxies, headers = self._request_options(url, selected_proxy, extra_headers)
                     response = self.session.get(
                         url,
                         timeout=self.timeout_seconds,
                         allow_redirects=allow_redirects,
                         proxies=proxies,
-                        headers=headers
+                        headers=headers,
+                        stream=stream,
                     )
             except Exception as exc:
                 last_exc = exc
                 if attempt >= effective_max_retries:
-                    time.sleep(random.uniform(10, 20)) 
+                    # Give the host a rest before whoever requests it next
+                    get_host_scheduler().back_off(url, random.uniform(10, 20))
                     break
                 
                 # Check for Proxy Failure (only relevant when using proxy)
@@ -380,10 +449,11 @@ class HttpClient:
             if response.status_code in BLOCK_STATUS_CODES:
                 block_retries += 1
                 
+                if stream:
+                    response.close()
                 # Try cloudscraper fallback
-                fallback = self._scraper_get(url, allow_redirects, proxies, headers)
+                fallback = self._scraper_get(url, allow_redirects, proxies, headers, stream)
                 if fallback and fallback.status_code not in BLOCK_STATUS_CODES:
-                    time.sleep(random.uniform(2, 4))
                     return fallback
                 
                 if attempt >= effective_max_retries:
@@ -409,10 +479,169 @@ class HttpClient:
                 time.sleep(delay)
                 continue
 
-            # Successful request - simulate "reading time"
-            time.sleep(random.uniform(2, 5))
+            # The pause before the next page of this host is the scheduler's job
             return response
         
         if last_exc:
             raise last_exc
         raise RuntimeError("HTTP request failed without exception")
+
+
+class AsyncHttpClient:
+    """
+    Non-blocking counterpart of HttpClient for the review pipeline (pages and images).
+
+    Shares the proxy pool, browser identity and response cache of the wrapped
+    HttpClient but sends requests through one curl_cffi AsyncSession. The lock
+    only covers swapping that session after a block; requests themselves run
+    concurrently, bounded by `max_clients` and, for source-site hosts, by the
+    shared "source" limiter.
+    """
+
+    def __init__(self, http: HttpClient, max_clients: int = 8) -> None:
+        self.http = http
+        self.logger = http.logger
+        self.max_clients = max(1, int(max_clients))
+        self._session = self._new_session()
+        self._retired: List[cffi_requests.AsyncSession] = []
+        self._session_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def cache(self) -> Optional[HttpResponseCache]:
+        return self.http.cache
+
+    def _new_session(self) -> "cffi_requests.AsyncSession":
+        return cffi_requests.AsyncSession(impersonate=self.http._current_impersonation, max_clients=self.max_clients)
+
+    def _get_session_lock(self) -> asyncio.Lock:
+        # Created lazily so it binds to the running event loop
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        return self._session_lock
+
+    async def _reset_session(self, reason: str, failed: "cffi_requests.AsyncSession") -> None:
+        async with self._get_session_lock():
+            if self._session is not failed:
+                return  # another request already replaced it
+            with self.http._lock:
+                self.http._rotate_identity(reason)
+            # Requests of other tasks may still run on the old session; close it at the end
+            self._retired.append(self._session)
+            self._session = self._new_session()
+
+    async def get(self, url: str, allow_redirects: bool = True, stream: bool = False) -> cffi_requests.Response:
+        """
+        With stream=True the body is read with aiter_content and the caller must
+        aclose the response; the page cache and per-host pacing are skipped.
+        The cloudscraper fallback has no async stream and comes back fully read.
+        """
+        if stream:
+            if _needs_proxy(url):
+                async with get_source_limiter():
+                    return await self._get(url, allow_redirects, stream=True)
+            return await self._get(url, allow_redirects, stream=True)
+        conditional: Dict[str, str] = {}
+        # The cache is blocking SQLite; keep it off the event loop
+        if self.cache is not None:
+            cached, conditional = await asyncio.to_thread(self.cache.lookup, url)
+            if cached is not None:
+                return cached
+        if _needs_proxy(url):
+            async with get_source_limiter():
+                response = await self._get(url, allow_redirects, conditional)
+        else:
+            response = await self._get(url, allow_redirects, conditional)
+        if self.cache is not None:
+            if response.status_code == 304 and conditional:
+                revalidated = await asyncio.to_thread(self.cache.revalidate, url)
+                if revalidated is not None:
+                    return revalidated
+                return await self._get(url, allow_redirects)
+            await asyncio.to_thread(self.cache.store, url, response)
+        return response
+
+    async def _get(
+        self,
+        url: str,
+        allow_redirects: bool = True,
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> cffi_requests.Response:
+        http = self.http
+        last_exc: Optional[Exception] = None
+        block_retries = 0
+        effective_max_retries = max(http.max_retries, MAX_BLOCK_RETRIES) if _needs_proxy(url) else http.max_retries
+
+        for attempt in range(effective_max_retries + 1):
+            if not stream:
+                await get_host_scheduler().wait_async(url)
+            with http._lock:
+                selected_proxy = http._select_proxy(url)
+                proxies, headers = http._request_options(url, selected_proxy, extra_headers)
+            session = self._session
+            try:
+                response = await session.get(
+                    url,
+                    timeout=http.timeout_seconds,
+                    allow_redirects=allow_redirects,
+                    proxies=proxies,
+                    headers=headers,
+                    stream=stream,
+                )
+            except Exception as exc:
+                last_exc = exc
+                if attempt >= effective_max_retries:
+                    # Same as the blocking client: rest the host before whoever requests it next
+                    get_host_scheduler().back_off(url, random.uniform(10, 20))
+                    break
+                if selected_proxy and ("407" in str(exc) or "Proxy Authentication Required" in str(exc)):
+                    if not http._force_raw_proxy:
+                        http._force_raw_proxy = True
+                        self.logger.warning(
+                            "Proxy auth failed; retrying without session suffix. (%s)",
+                            _redact_proxy(selected_proxy),
+                        )
+                        continue
+                    raise RuntimeError("Proxy authentication failed (407). Check CONTENT_PROXY credentials.")
+                if selected_proxy and ("ProxyError" in str(exc) or "Tunnel connection failed" in str(exc)):
+                    self.logger.warning("Proxy connection failed (%s). Creating new session for new IP...", exc)
+                    await self._reset_session("proxy_error", session)
+                    await asyncio.sleep(random.uniform(3, 6))
+                    continue
+                self.logger.warning("Connection error (attempt %d): %s", attempt + 1, exc)
+                await asyncio.sleep(backoff_delay(attempt, base=5.0))
+                continue
+
+            if response.status_code in BLOCK_STATUS_CODES:
+                block_retries += 1
+                if stream:
+                    await response.aclose()
+                # Cloudscraper is synchronous; keep it off the event loop
+                fallback = await asyncio.to_thread(http._scraper_get, url, allow_redirects, proxies, headers)
+                if fallback and fallback.status_code not in BLOCK_STATUS_CODES:
+                    return fallback
+                if attempt >= effective_max_retries:
+                    raise requests.HTTPError(f"HTTP {response.status_code} for {url}", response=response)
+                self.logger.warning(
+                    "Bot protection triggered (%d). Attempt %d/%d - Creating new session for new IP...",
+                    response.status_code, block_retries, MAX_BLOCK_RETRIES,
+                )
+                await self._reset_session(f"blocked_{response.status_code}", session)
+                delay = random.uniform(5, 10) * (1 + block_retries * 0.5)
+                self.logger.info("Waiting %.1fs before retry with new IP...", delay)
+                await asyncio.sleep(delay)
+                continue
+
+            return response
+
+        if last_exc:
+            raise last_exc
+        raise RuntimeError("HTTP request failed without exception")
+
+    async def aclose(self) -> None:
+        for session in self._retired + [self._session]:
+            try:
+                await session.close()
+            except Exception:
+                pass
+        self._retired.clear()
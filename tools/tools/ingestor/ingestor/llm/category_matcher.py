@@ -1,10 +1,10 @@
 import logging
 import json
 from typing import Dict, List, Optional
-from .groq_client import GroqClient
+from .groq_client import LLMClient, achat
 
 async def match_category_ai(
-    groq: GroqClient,
+    groq: LLMClient,
     target_category_name: str,
     available_categories: Dict[str, int],  # Name -> ID
     logger: logging.Logger
@@ -42,9 +42,8 @@ async def match_category_ai(
     """
 
     try:
-        import asyncio
-        response = await asyncio.to_thread(
-            groq.chat,
+        response = await achat(
+            groq,
             messages=[
                 {"role": "system", "content": "You are a precise JSON classifier."},
                 {"role": "user", "content": prompt}
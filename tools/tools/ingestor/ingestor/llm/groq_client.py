@@ -1,14 +1,35 @@
+import asyncio
 import logging
-from typing import List, Dict, Any
-from groq import Groq
+from typing import List, Dict, Any, Optional, Union
+
+import httpx
+from groq import AsyncGroq, Groq
+
+from ..stability import get_llm_limiter, get_llm_scheduler
+from .response_cache import LLMResponseCache, cache_key
+from .scheduler import current_priority, estimate_tokens
+
+
+def _settle_usage(estimated: int, response: Any) -> None:
+    usage = getattr(response, "usage", None)
+    actual = getattr(usage, "total_tokens", None) or 0
+    get_llm_scheduler().settle(estimated, actual)
 
 
 class GroqClient:
-    def __init__(self, api_key: str, model: str, logger: logging.Logger, vision_model: str = "llama-3.2-11b-vision-preview") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        logger: logging.Logger,
+        vision_model: str = "llama-3.2-11b-vision-preview",
+        cache: Optional[LLMResponseCache] = None,
+    ) -> None:
         self.client = Groq(api_key=api_key)
         self.model = model
         self.vision_model = vision_model
         self.logger = logger
+        self.cache = cache
     
     def analyze_image(self, image_url: str, prompt: str) -> str:
         messages = [
@@ -33,17 +54,52 @@ class GroqClient:
             self.logger.warning(f"Groq Vision failed: {e}")
             return ""
 
-    def chat(self, messages: List[Dict[str, str]], temperature: float = 0.2, max_tokens: int = 8192) -> str:
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: int = 8192,
+        use_cache: bool = True,
+    ) -> str:
+        """
+        Chat completion, served from the response cache when possible.
+
+        use_cache=False skips the lookup (for retries that want a fresh answer)
+        but still stores the new response.
+        """
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.model, messages, temperature, max_tokens)
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached:
+                    return cached
+            else:
+                self.cache.record_bypass()
+        content = self._chat_uncached(messages, temperature, max_tokens)
+        if key is not None:
+            try:
+                self.cache.put(key, self.model, content)
+            except Exception as e:
+                self.logger.warning(f"LLM cache write failed: {e}")
+        return content
+
+    def _chat_uncached(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
         import time
         max_attempts = 5
+        estimated = estimate_tokens(messages, max_tokens)
+        priority = current_priority()
         for attempt in range(max_attempts):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
+                get_llm_scheduler().acquire(estimated, priority)
+                with get_llm_limiter():
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    )
+                _settle_usage(estimated, response)
                 content = response.choices[0].message.content
                 if not content:
                     raise RuntimeError("Groq returned empty response")
@@ -58,9 +114,158 @@ class GroqClient:
                 time.sleep(wait_time)
         raise RuntimeError("Max retries exceeded")
 
-    def chat_json(self, system_prompt: str, user_prompt: str, temperature: float = 0.2, max_tokens: int = 8192) -> str:
+    def chat_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.2,
+        max_tokens: int = 8192,
+        use_cache: bool = True,
+    ) -> str:
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ]
-        return self.chat(messages=messages, temperature=temperature, max_tokens=max_tokens)
+        return self.chat(messages=messages, temperature=temperature, max_tokens=max_tokens, use_cache=use_cache)
+
+
+class AsyncGroqClient:
+    """
+    Async counterpart of GroqClient for the translation fan-out.
+
+    Requests share one pooled httpx.AsyncClient, retries back off with
+    asyncio.sleep, and `max_concurrency` caps in-flight calls across every
+    coroutine using this client, so no worker thread is held per call.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        logger: logging.Logger,
+        max_concurrency: int = 4,
+        timeout_seconds: float = 120.0,
+        cache: Optional[LLMResponseCache] = None,
+    ) -> None:
+        max_concurrency = max(1, int(max_concurrency))
+        self._http = httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_concurrency * 2,
+                max_keepalive_connections=max_concurrency,
+            ),
+        )
+        self.client = AsyncGroq(api_key=api_key, http_client=self._http)
+        self.model = model
+        self.logger = logger
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: int = 8192,
+        use_cache: bool = True,
+    ) -> str:
+        """Same contract and cache behaviour as GroqClient.chat."""
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.model, messages, temperature, max_tokens)
+            if use_cache:
+                # SQLite is blocking (and serialized by the cache lock); keep it off the event loop
+                cached = await asyncio.to_thread(self.cache.get, key)
+                if cached:
+                    return cached
+            else:
+                self.cache.record_bypass()
+        content = await self._chat_uncached(messages, temperature, max_tokens)
+        if key is not None:
+            try:
+                await asyncio.to_thread(self.cache.put, key, self.model, content)
+            except Exception as e:
+                self.logger.warning(f"LLM cache write failed: {e}")
+        return content
+
+    async def _chat_uncached(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        max_attempts = 5
+        estimated = estimate_tokens(messages, max_tokens)
+        priority = current_priority()
+        for attempt in range(max_attempts):
+            try:
+                await get_llm_scheduler().acquire_async(estimated, priority)
+                async with self._get_semaphore():
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    )
+                _settle_usage(estimated, response)
+                content = response.choices[0].message.content
+                if not content:
+                    raise RuntimeError("Groq returned empty response")
+                return content
+            except Exception as e:
+                if attempt == max_attempts - 1:
+                    raise e
+                # Exponential backoff: 5s, 10s, 20s, 40s (the slot is released while waiting)
+                wait_time = 5 * (2 ** attempt)
+                self.logger.warning(f"Groq chat failed (attempt {attempt+1}/{max_attempts}): {e}")
+                self.logger.info(f"Waiting {wait_time}s before retry...")
+                await asyncio.sleep(wait_time)
+        raise RuntimeError("Max retries exceeded")
+
+    async def chat_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.2,
+        max_tokens: int = 8192,
+        use_cache: bool = True,
+    ) -> str:
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+        return await self.chat(messages=messages, temperature=temperature, max_tokens=max_tokens, use_cache=use_cache)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+LLMClient = Union[GroqClient, AsyncGroqClient]
+
+
+async def achat(
+    client: LLMClient,
+    messages: List[Dict[str, str]],
+    temperature: float = 0.2,
+    max_tokens: int = 8192,
+    use_cache: bool = True,
+) -> str:
+    """Await a chat call on either client; the blocking one runs in a worker thread."""
+    if isinstance(client, AsyncGroqClient):
+        return await client.chat(messages, temperature, max_tokens, use_cache=use_cache)
+    return await asyncio.to_thread(client.chat, messages, temperature, max_tokens, use_cache)
+
+
+async def achat_json(
+    client: LLMClient,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float = 0.2,
+    max_tokens: int = 8192,
+    use_cache: bool = True,
+) -> str:
+    """chat_json counterpart of achat()."""
+    if isinstance(client, AsyncGroqClient):
+        return await client.chat_json(system_prompt, user_prompt, temperature, max_tokens, use_cache=use_cache)
+    return await asyncio.to_thread(client.chat_json, system_prompt, user_prompt, temperature, max_tokens, use_cache)
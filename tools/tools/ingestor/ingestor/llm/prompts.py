@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 # Language-specific tone and style guidelines
 LANGUAGE_STYLES = {
@@ -514,6 +514,75 @@ def build_product_translation_prompt(
     )
 
 
+def build_category_translation_batch_prompt(langs: List[str], category_name_ru: str) -> str:
+    lang_list = ", ".join(langs)
+    example = ",\n".join(f"  \"{lang}\": {{\"name\": \"...\", \"slug\": \"...\"}}" for lang in langs)
+    return (
+        "Translate Russian category name into EVERY target language and generate a slug for each.\n"
+        f"Target languages: {lang_list}\n"
+        f"Category (Russian): {category_name_ru}\n\n"
+        "Output JSON schema (one key per target language, no extra keys):\n"
+        "{\n"
+        f"{example}\n"
+        "}\n\n"
+        "Rules:\n"
+        "- Natural, native translation per language. NO RUSSIAN/CYRILLIC characters.\n"
+        "- slug must be lowercase, hyphenated, LATIN characters only, max 50 chars.\n"
+        "- Output only the JSON object."
+    )
+
+
+def build_product_translation_batch_prompt(
+    langs: List[str],
+    name_ru: str,
+    description_ru: Optional[str],
+    category_name_ru: Optional[str],
+    min_description_chars: Optional[Dict[str, int]] = None,
+) -> str:
+    category_line = category_name_ru or ""
+    description_line = description_ru or ""
+    style_lines = "".join(
+        f"- {lang} ({LANGUAGE_STYLES.get(lang, LANGUAGE_STYLES['en'])['name']}): "
+        f"{LANGUAGE_STYLES.get(lang, LANGUAGE_STYLES['en'])['tone']}\n"
+        for lang in langs
+    )
+    length_lines = "".join(
+        f"- {lang}: description at least {chars} characters.\n"
+        for lang, chars in (min_description_chars or {}).items()
+        if chars
+    )
+    example = ",\n".join(
+        f"  \"{lang}\": {{\"name\": \"...\", \"description\": \"...\", "
+        "\"meta_title\": \"...\", \"meta_description\": \"...\", \"slug\": \"...\"}"
+        for lang in langs
+    )
+    return (
+        "Translate Russian product name/description into EVERY target language and generate SEO fields for each.\n"
+        f"Target languages: {', '.join(langs)}\n"
+        f"Category (Russian): {category_line}\n\n"
+        "📝 TONE PER LANGUAGE:\n"
+        f"{style_lines}\n"
+        "Input JSON:\n"
+        "{\n"
+        f"  \"name_ru\": {name_ru!r},\n"
+        f"  \"description_ru\": {description_line!r}\n"
+        "}\n\n"
+        "Output JSON schema (one key per target language, no extra keys):\n"
+        "{\n"
+        f"{example}\n"
+        "}\n\n"
+        "Rules:\n"
+        "- Each language is written natively, not translated from another target language.\n"
+        "- ABSOLUTELY NO CYRILLIC/RUSSIAN CHARACTERS in any 'name' or 'slug'.\n"
+        "- IF a Brand Name is in Russian, TRANSLITERATE it to Latin (e.g. 'Макфа' -> 'Makfa') or Translate it.\n"
+        "- Description should be concise but keep all key details; do not invent specs.\n"
+        "- meta_description should be about 150-160 characters.\n"
+        "- slug must be lowercase, hyphenated, LATIN characters only, max 80 chars.\n"
+        "- Output only the JSON object.\n"
+        + length_lines
+    )
+
+
 def build_product_polish_prompt(
     lang: str,
     name: str,
@@ -835,10 +904,12 @@ def build_native_quality_prompt(
         "  \"fluency_score\": 1,\n"
         "  \"translation_smell_score\": 1,\n"
         "  \"issues\": [\"short description\", \"literal translation\", \"awkward phrasing\"],\n"
+        "  \"failed_artifacts\": [],\n"
         "  \"rewrite\": false\n"
         "}\n\n"
         "Rules:\n"
         "- translation_smell_score: 10 means no translation smell; 1 means obvious translation.\n"
         "- rewrite should be true if the text does not sound native, is too short, or feels SEO-thin/robotic.\n"
+        "- failed_artifacts lists only the parts that need rework, chosen from: title, body, summary, pros_cons, faq, specs (e.g. [\"faq\"] or [\"title\", \"summary\"]). Use [] when everything passes.\n"
         + (f"- Minimum content length target: {min_content_chars} characters (plain text).\n" if min_content_chars else "")
     )
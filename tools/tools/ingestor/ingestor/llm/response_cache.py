@@ -0,0 +1,177 @@
+"""
+On-disk cache for LLM chat responses.
+
+Responses are stored in SQLite, keyed by a hash of
+(model, messages, temperature, max_tokens), so re-runs, retries of failed
+sources and backfills reuse earlier translations instead of paying for them again.
+- Entries older than the TTL are treated as misses and dropped
+- When the file grows past the size cap, least recently used entries are evicted
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_PATH = ".cache/llm_responses.sqlite"
+DEFAULT_TTL_HOURS = 24 * 30
+DEFAULT_MAX_MB = 512
+
+# Check the total size every N writes instead of after each one
+_EVICT_CHECK_EVERY = 50
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], temperature: float, max_tokens: int) -> str:
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": round(float(temperature), 4),
+            "max_tokens": int(max_tokens),
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(
+        self,
+        path: str,
+        logger: logging.Logger,
+        ttl_hours: float = DEFAULT_TTL_HOURS,
+        max_mb: float = DEFAULT_MAX_MB,
+    ) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.logger = logger
+        self.ttl_seconds = max(0.0, ttl_hours * 3600)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.evictions = 0
+        self._writes_since_check = 0
+        self._lock = threading.Lock()
+        # Calls arrive from asyncio.to_thread workers; one shared connection behind a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return response
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._conn.commit()
+            self.stores += 1
+            self._writes_since_check += 1
+            if self._writes_since_check >= _EVICT_CHECK_EVERY:
+                self._writes_since_check = 0
+                self._evict_locked(now)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    def _evict_locked(self, now: float) -> None:
+        if self.ttl_seconds:
+            expired = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+            self.evictions += max(0, expired)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if self.max_bytes and total > self.max_bytes:
+            # Evict down to 90% of the cap so we are not back here on the next write
+            to_free = total - int(self.max_bytes * 0.9)
+            keys = []
+            for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+                keys.append((key,))
+                to_free -= size
+                if to_free <= 0:
+                    break
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+            self.evictions += len(keys)
+            self.logger.info("LLM cache: evicted %d least recently used entries", len(keys))
+        self._conn.commit()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": f"{(self.hits / lookups * 100) if lookups else 0:.1f}%",
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_mb": round(total / (1024 * 1024), 2),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_response_cache(
+    path: Optional[str],
+    logger: logging.Logger,
+    ttl_hours: float = DEFAULT_TTL_HOURS,
+    max_mb: float = DEFAULT_MAX_MB,
+) -> Optional[LLMResponseCache]:
+    """Open the cache, or return None when disabled (empty path) or unusable."""
+    if not path:
+        return None
+    try:
+        return LLMResponseCache(path, logger, ttl_hours=ttl_hours, max_mb=max_mb)
+    except sqlite3.Error as e:
+        logger.warning("LLM response cache disabled, could not open %s: %s", path, e)
+        return None
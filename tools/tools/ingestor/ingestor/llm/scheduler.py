@@ -0,0 +1,44 @@
+"""
+Priorities and token estimates for the shared LLM scheduler.
+
+Callers mark a block of work with `llm_priority(...)`; the Groq clients read
+the current priority when they queue a request. The value travels through
+asyncio tasks and asyncio.to_thread via contextvars.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List
+
+# Lower runs first
+PRIORITY_PIVOT = 0  # English translation other languages pivot from
+PRIORITY_DEFAULT = 1
+PRIORITY_QA = 2  # quality scoring can wait behind real translation work
+
+_current_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_DEFAULT)
+
+
+@contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """
+    Rough token cost of a chat call before sending it.
+
+    Prompt: ~1 token per 3 characters (Cyrillic text tokenizes denser than
+    English). Completion: translations come back about as long as the prompt,
+    so reserve the same again, capped by max_tokens.
+    """
+    chars = sum(len(str(message.get("content") or "")) for message in messages)
+    prompt_tokens = chars // 3 + 4 * len(messages)
+    return prompt_tokens + min(max_tokens, prompt_tokens)
@@ -1,11 +1,12 @@
 import logging
 import asyncio
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from ..utils.slugify import slugify
 from ..utils.text_clean import clean_html, normalize_whitespace
-from .groq_client import GroqClient
+from .groq_client import LLMClient, achat_json
 from .json_parse import parse_json_strict
+from .scheduler import PRIORITY_PIVOT, PRIORITY_QA, llm_priority
 from . import google_translate
 from .prompts import (
     SYSTEM_PROMPT,
@@ -15,9 +16,11 @@ from .prompts import (
     build_repair_prompt,
     build_translation_prompt,
     build_category_translation_prompt,
+    build_category_translation_batch_prompt,
     build_vision_prompt,
     build_sentiment_enrichment_prompt,
     build_product_translation_prompt,
+    build_product_translation_batch_prompt,
     build_extraction_prompt,
     build_content_expansion_prompt,
     build_content_translation_prompt,
@@ -61,6 +64,7 @@ LANGUAGE_SUFFIXES = {
 DIRECT_TRANSLATION_LANGS = set(LANGUAGE_STYLES.keys()) - {"en"}
 CHUNK_THRESHOLD = 6000
 CHUNK_SIZE = 3500
+CHUNK_CONCURRENCY = 4  # chunks of one review/language translated at the same time
 MAX_RETRIES = 4
 ENABLE_NATIVE_POLISH = True
 ENABLE_METADATA_POLISH = True
@@ -228,14 +232,14 @@ def _normalize_payload(payload: dict, lang: str, fallback_title: str) -> dict:
     return data
 
 
-async def _parse_or_repair(client: GroqClient, raw: str, logger: logging.Logger) -> dict:
+async def _parse_or_repair(client: LLMClient, raw: str, logger: logging.Logger) -> dict:
     parsed = parse_json_strict(raw)
     if parsed is not None:
         return parsed
     logger.warning("Invalid JSON from Groq. Raw response follows:\n%s", raw)
     logger.warning("Retrying with repair prompt")
     repair_prompt = build_repair_prompt(raw)
-    repaired_raw = await asyncio.to_thread(client.chat_json, SYSTEM_PROMPT, repair_prompt, 0.1)
+    repaired_raw = await achat_json(client, SYSTEM_PROMPT, repair_prompt, 0.1)
     repaired = parse_json_strict(repaired_raw)
     if repaired is None:
         logger.error("Failed to parse JSON after repair. Repaired raw: %s", repaired_raw[:500] + "...")
@@ -315,6 +319,40 @@ def _sample_for_qa(content_html: str, max_chars: int = 6000) -> str:
     return f"{head}\n...\n{tail}"
 
 
+# Parts of a translated review the QA judge can reject independently
+QA_ARTIFACTS = ("title", "body", "summary", "pros_cons", "faq", "specs")
+_METADATA_ARTIFACTS = {"summary", "pros_cons", "faq", "specs"}
+_ARTIFACT_FIELDS = {
+    "summary": ("summary",),
+    "pros_cons": ("pros", "cons"),
+    "faq": ("faq",),
+    "specs": ("specs",),
+}
+# Built from the title by _generate_metadata; a new title needs new ones
+_TITLE_DERIVED_FIELDS = ("meta_title", "og_title", "slug")
+_ARTIFACT_KEYWORDS = {
+    "title": ("title", "headline"),
+    "summary": ("summary",),
+    "pros_cons": ("pros", "cons", "advantage", "disadvantage"),
+    "faq": ("faq", "question"),
+    "specs": ("spec", "aspect"),
+}
+
+
+def _failed_artifacts(qa_parsed: dict, issues: List[str]) -> Set[str]:
+    """Which artifacts the next quality pass must regenerate."""
+    reported = {str(x).strip().lower() for x in qa_parsed.get("failed_artifacts") or [] if x}
+    failed = reported & set(QA_ARTIFACTS)
+    if failed:
+        return failed
+    # Older/loose QA answers: infer from the issue texts, anything unrecognised is about the body
+    for issue in issues:
+        text = issue.lower()
+        matched = {artifact for artifact, words in _ARTIFACT_KEYWORDS.items() if any(w in text for w in words)}
+        failed |= matched or {"body"}
+    return failed or {"body"}
+
+
 def _min_content_length(lang: str, source_html: str) -> int:
     base_len = _text_length(source_html)
     if base_len == 0:
@@ -338,7 +376,7 @@ def _min_summary_length(source_html: str) -> int:
 
 
 async def translate_review(
-    client: GroqClient,
+    client: LLMClient,
     title_ru: str,
     content_html_ru: str,
     category_name_ru: Optional[str],
@@ -351,9 +389,22 @@ async def translate_review(
     title_ru = title_ru or ""
     content_html_ru = content_html_ru or ""
     
-    async def _translate_with_retry(prompt: str, label: str, temperature: float, attempt: int = 0) -> Optional[dict]:
+    async def _translate_with_retry(
+        prompt: str,
+        label: str,
+        temperature: float,
+        attempt: int = 0,
+        use_cache: bool = True,
+    ) -> Optional[dict]:
         try:
-            raw = await asyncio.to_thread(client.chat_json, SYSTEM_PROMPT, prompt, temperature)
+            # A retry of the same prompt must not get the same cached answer back
+            raw = await achat_json(
+                client,
+                SYSTEM_PROMPT,
+                prompt,
+                temperature,
+                use_cache=use_cache and attempt == 0,
+            )
             parsed = await _parse_or_repair(client, raw, logger)
             return parsed
         except Exception as e:
@@ -366,11 +417,11 @@ async def translate_review(
                     str(e)[:100],
                 )
                 await asyncio.sleep(2 * (attempt + 1))
-                return await _translate_with_retry(prompt, label, temperature, attempt + 1)
+                return await _translate_with_retry(prompt, label, temperature, attempt + 1, use_cache)
             logger.error("All %d translation attempts failed for %s: %s", MAX_RETRIES, label, e)
             return None
 
-    async def _translate_title(lang: str, title_source: str, source_lang_name: str) -> str:
+    async def _translate_title(lang: str, title_source: str, source_lang_name: str, use_cache: bool = True) -> str:
         """Translate title with retry logic. Never returns Russian/Cyrillic."""
         max_title_attempts = 3
         
@@ -393,11 +444,14 @@ async def translate_review(
                 parsed = await _translate_with_retry(
                     direct_prompt, 
                     f"{lang}_title_retry{attempt}", 
-                    min(_temperature_for(lang, "title") + 0.1 * attempt, 0.7)
+                    min(_temperature_for(lang, "title") + 0.1 * attempt, 0.7),
+                    use_cache=False,
                 )
             else:
                 prompt = build_title_translation_prompt(lang, title_source, source_lang_name)
-                parsed = await _translate_with_retry(prompt, f"{lang}_title", _temperature_for(lang, "title"))
+                parsed = await _translate_with_retry(
+                    prompt, f"{lang}_title", _temperature_for(lang, "title"), use_cache=use_cache
+                )
             
             if parsed and parsed.get("title"):
                 translated = normalize_whitespace(str(parsed.get("title")))
@@ -449,27 +503,35 @@ async def translate_review(
         min_chars: Optional[int],
         issues: Optional[List[str]],
         temperature: float,
+        use_cache: bool = True,
     ) -> Optional[tuple]:
         content_length = len(content_source or "")
         if content_length > CHUNK_THRESHOLD:
             logger.info("Long content detected (%d chars), using chunked translation for %s", content_length, lang)
-            translated_title = await _translate_title(lang, title_source, source_lang_name)
             chunks = _split_html(content_source, CHUNK_SIZE)
             if not chunks:
-                return translated_title, content_source
-            translated_chunks = []
-            for i, chunk in enumerate(chunks):
+                return await _translate_title(lang, title_source, source_lang_name, use_cache=use_cache), content_source
+            semaphore = asyncio.Semaphore(CHUNK_CONCURRENCY)
+
+            async def _translate_chunk(i: int, chunk: str) -> str:
                 chunk_prompt = build_chunked_translation_prompt(lang, chunk, i + 1, len(chunks))
-                result = await _translate_with_retry(
-                    chunk_prompt,
-                    f"{lang}_chunk_{i+1}",
-                    temperature,
-                )
+                async with semaphore:
+                    result = await _translate_with_retry(
+                        chunk_prompt,
+                        f"{lang}_chunk_{i+1}",
+                        temperature,
+                        use_cache=use_cache,
+                    )
                 if result and result.get("translated_text"):
-                    translated_chunks.append(result["translated_text"])
-                else:
-                    logger.warning("Chunk %d/%d translation failed for %s, using original", i + 1, len(chunks), lang)
-                    translated_chunks.append(chunk)
+                    return result["translated_text"]
+                logger.warning("Chunk %d/%d translation failed for %s, using original", i + 1, len(chunks), lang)
+                return chunk
+
+            # gather keeps the source order, so chunks reassemble correctly
+            translated_title, *translated_chunks = await asyncio.gather(
+                _translate_title(lang, title_source, source_lang_name, use_cache=use_cache),
+                *[_translate_chunk(i, chunk) for i, chunk in enumerate(chunks)],
+            )
             combined_content = "".join(translated_chunks)
             return translated_title, combined_content
 
@@ -484,7 +546,7 @@ async def translate_review(
             min_chars=min_chars,
             issues=issues,
         )
-        parsed = await _translate_with_retry(prompt, f"{lang}_content", temperature)
+        parsed = await _translate_with_retry(prompt, f"{lang}_content", temperature, use_cache=use_cache)
         if not parsed:
             return None
         translated_title = normalize_whitespace(str(parsed.get("title") or ""))
@@ -493,7 +555,7 @@ async def translate_review(
             logger.warning("Detected placeholder title '%s' from content translation, retrying title separately", 
                          translated_title[:50] if translated_title else "")
             # Get a proper translated title
-            translated_title = await _translate_title(lang, title_source, source_lang_name)
+            translated_title = await _translate_title(lang, title_source, source_lang_name, use_cache=use_cache)
         translated_content = str(parsed.get("content_html") or content_source)
         return translated_title, translated_content
 
@@ -504,12 +566,13 @@ async def translate_review(
         min_chars: Optional[int],
         issues: Optional[List[str]],
         temperature: Optional[float] = None,
+        use_cache: bool = True,
     ) -> tuple:
         if not ENABLE_NATIVE_POLISH:
             return title, content_html
         temp = temperature if temperature is not None else _temperature_for(lang, "polish")
         prompt = build_native_polish_prompt(lang, title, content_html, min_chars=min_chars, issues=issues)
-        parsed = await _translate_with_retry(prompt, f"{lang}_polish", temp)
+        parsed = await _translate_with_retry(prompt, f"{lang}_polish", temp, use_cache=use_cache)
         if parsed:
             polished_title = normalize_whitespace(str(parsed.get("title") or ""))
             polished_content = str(parsed.get("content_html") or content_html)
@@ -530,6 +593,8 @@ async def translate_review(
         pros: Optional[List[str]],
         cons: Optional[List[str]],
         issues: Optional[List[str]],
+        use_cache: bool = True,
+        enrich_specs: bool = True,
     ) -> dict:
         min_summary_chars = _min_summary_length(content_html)
         summary = ""
@@ -563,6 +628,7 @@ async def translate_review(
                 metadata_prompt,
                 f"{lang}_metadata",
                 _temperature_for(lang, "metadata"),
+                use_cache=use_cache and attempt == 0,
             )
             if not metadata:
                 continue
@@ -615,6 +681,7 @@ async def translate_review(
                 polish_prompt,
                 f"{lang}_metadata_polish",
                 _temperature_for(lang, "polish"),
+                use_cache=use_cache,
             )
             if polished:
                 summary = normalize_whitespace(str(polished.get("summary") or summary))
@@ -632,13 +699,14 @@ async def translate_review(
                 og_title = normalize_whitespace(str(polished.get("og_title") or og_title))
                 og_description = normalize_whitespace(str(polished.get("og_description") or og_description))
 
-        if ENABLE_SENTIMENT_ENRICHMENT:
+        if ENABLE_SENTIMENT_ENRICHMENT and enrich_specs:
             try:
                 sentiment_prompt = build_sentiment_enrichment_prompt(lang, title, content_html)
                 sentiment_data = await _translate_with_retry(
                     sentiment_prompt,
                     f"{lang}_sentiment",
                     _temperature_for(lang, "analysis"),
+                    use_cache=use_cache,
                 ) or {}
                 if sentiment_data.get("aspects"):
                     for k, v in sentiment_data["aspects"].items():
@@ -682,88 +750,129 @@ async def translate_review(
         translated_title: Optional[str] = None
         translated_content: Optional[str] = None
 
+        # Artifacts to (re)build this pass; the first pass builds everything
+        failed: Set[str] = set(QA_ARTIFACTS)
+
         for attempt in range(MAX_QUALITY_PASSES):
             logger.info("Quality pass %d/%d for %s", attempt + 1, MAX_QUALITY_PASSES, lang)
             temp = min(_temperature_for(lang, "translation") + (0.08 * attempt), 0.7)
-            logger.info("Quality pass %d/%d for %s: translating", attempt + 1, MAX_QUALITY_PASSES, lang)
-            content_result = await _translate_content(
-                lang,
-                title_source,
-                content_source,
-                category,
-                pros,
-                cons,
-                source_lang_name,
-                min_chars=min_content_chars if min_content_chars > 0 else None,
-                issues=qa_issues if qa_issues else None,
-                temperature=temp,
-            )
-            if not content_result:
-                logger.warning("Content translation failed for %s, attempting fallback", lang)
-                fallback_prompt = build_translation_prompt(
+            # Later passes exist to get a different answer; never serve them from cache
+            use_cache = attempt == 0
+            if best_payload is None or "body" in failed:
+                logger.info("Quality pass %d/%d for %s: translating", attempt + 1, MAX_QUALITY_PASSES, lang)
+                content_result = await _translate_content(
                     lang,
-                    title_ru,
-                    content_html_ru,
-                    category_name_ru,
-                    pros_ru,
-                    cons_ru,
+                    title_source,
+                    content_source,
+                    category,
+                    pros,
+                    cons,
+                    source_lang_name,
                     min_chars=min_content_chars if min_content_chars > 0 else None,
                     issues=qa_issues if qa_issues else None,
+                    temperature=temp,
+                    use_cache=use_cache,
                 )
-                fallback_parsed = await _translate_with_retry(
-                    fallback_prompt,
-                    f"{lang}_fallback_full",
-                    _temperature_for(lang, "translation"),
-                )
-                if fallback_parsed:
-                    return _normalize_payload(fallback_parsed, lang, fallback_title=title_ru)
-                return None
-            translated_title, translated_content = content_result
+                if not content_result:
+                    logger.warning("Content translation failed for %s, attempting fallback", lang)
+                    fallback_prompt = build_translation_prompt(
+                        lang,
+                        title_ru,
+                        content_html_ru,
+                        category_name_ru,
+                        pros_ru,
+                        cons_ru,
+                        min_chars=min_content_chars if min_content_chars > 0 else None,
+                        issues=qa_issues if qa_issues else None,
+                    )
+                    fallback_parsed = await _translate_with_retry(
+                        fallback_prompt,
+                        f"{lang}_fallback_full",
+                        _temperature_for(lang, "translation"),
+                    )
+                    if fallback_parsed:
+                        return _normalize_payload(fallback_parsed, lang, fallback_title=title_ru)
+                    return None
+                translated_title, translated_content = content_result
 
-            translated_title, translated_content = await _polish_content(
-                lang,
-                translated_title or title_source,
-                translated_content or content_source,
-                min_chars=min_content_chars if min_content_chars > 0 else None,
-                issues=qa_issues if qa_issues else None,
-                temperature=min(_temperature_for(lang, "translation") + 0.1, 0.7) if attempt > 0 else None,
-            )
-            if min_content_chars and _text_length(translated_content or "") < min_content_chars:
-                logger.info(
-                    "Content below target length for %s (%d < %d). Expanding.",
+                translated_title, translated_content = await _polish_content(
+                    lang,
+                    translated_title or title_source,
+                    translated_content or content_source,
+                    min_chars=min_content_chars if min_content_chars > 0 else None,
+                    issues=qa_issues if qa_issues else None,
+                    temperature=min(_temperature_for(lang, "translation") + 0.1, 0.7) if attempt > 0 else None,
+                    use_cache=use_cache,
+                )
+                if min_content_chars and _text_length(translated_content or "") < min_content_chars:
+                    logger.info(
+                        "Content below target length for %s (%d < %d). Expanding.",
+                        lang,
+                        _text_length(translated_content or ""),
+                        min_content_chars,
+                    )
+                    expanded = await expand_review_content_ai(
+                        client,
+                        title=translated_title or title_source,
+                        content_html=translated_content or content_source,
+                        product_name=None,
+                        category_name=None,
+                        pros=None,
+                        cons=None,
+                        rating=None,
+                        logger=logger,
+                        min_chars=min_content_chars,
+                    )
+                    if expanded:
+                        translated_content = expanded
+                logger.info("Quality pass %d/%d for %s: metadata", attempt + 1, MAX_QUALITY_PASSES, lang)
+                payload = await _generate_metadata(
                     lang,
-                    _text_length(translated_content or ""),
-                    min_content_chars,
+                    translated_title or title_source,
+                    translated_content or content_source,
+                    category,
+                    pros,
+                    cons,
+                    qa_issues if qa_issues else None,
+                    use_cache=use_cache,
                 )
-                expanded = await expand_review_content_ai(
-                    client,
-                    title=translated_title or title_source,
-                    content_html=translated_content or content_source,
-                    product_name=None,
-                    category_name=None,
-                    pros=None,
-                    cons=None,
-                    rating=None,
-                    logger=logger,
-                    min_chars=min_content_chars,
+            else:
+                # Body passed: keep it and only redo the rejected parts
+                logger.info(
+                    "Quality pass %d/%d for %s: regenerating %s",
+                    attempt + 1,
+                    MAX_QUALITY_PASSES,
+                    lang,
+                    ", ".join(sorted(failed)),
                 )
-                if expanded:
-                    translated_content = expanded
-            logger.info("Quality pass %d/%d for %s: metadata", attempt + 1, MAX_QUALITY_PASSES, lang)
-            payload = await _generate_metadata(
-                lang,
-                translated_title or title_source,
-                translated_content or content_source,
-                category,
-                pros,
-                cons,
-                qa_issues if qa_issues else None,
-            )
+                payload = dict(best_payload)
+                if "title" in failed:
+                    translated_title = await _translate_title(lang, title_source, source_lang_name, use_cache=False)
+                    payload["title"] = translated_title
+                if failed & (_METADATA_ARTIFACTS | {"title"}):
+                    metadata = await _generate_metadata(
+                        lang,
+                        payload.get("title") or title_source,
+                        translated_content or content_source,
+                        category,
+                        pros,
+                        cons,
+                        qa_issues if qa_issues else None,
+                        use_cache=False,
+                        enrich_specs="specs" in failed,
+                    )
+                    for artifact in failed & _METADATA_ARTIFACTS:
+                        for key in _ARTIFACT_FIELDS[artifact]:
+                            payload[key] = metadata.get(key)
+                    if "title" in failed:
+                        for key in _TITLE_DERIVED_FIELDS:
+                            payload[key] = metadata.get(key)
             best_payload = payload
 
             translated_len = _text_length(payload.get("content_html", ""))
             if min_content_chars and translated_len < min_content_chars:
                 qa_issues = ["content too short", "missing details", "expand with existing facts"]
+                failed = {"body"}
                 if attempt < MAX_QUALITY_PASSES - 1:
                     logger.warning(
                         "Length guard failed for %s (min %d, got %d). Retrying.",
@@ -785,12 +894,14 @@ async def translate_review(
                     payload.get("faq") or [],
                     min_content_chars=min_content_chars if min_content_chars > 0 else None,
                 )
-                qa_raw = await asyncio.to_thread(
-                    client.chat_json,
-                    QUALITY_SYSTEM_PROMPT,
-                    qa_prompt,
-                    _temperature_for(lang, "analysis"),
-                )
+                with llm_priority(PRIORITY_QA):
+                    qa_raw = await achat_json(
+                        client,
+                        QUALITY_SYSTEM_PROMPT,
+                        qa_prompt,
+                        _temperature_for(lang, "analysis"),
+                        use_cache=use_cache,
+                    )
                 qa_parsed = await _parse_or_repair(client, qa_raw, logger)
                 native_score = float(qa_parsed.get("native_score") or 0)
                 fluency_score = float(qa_parsed.get("fluency_score") or 0)
@@ -825,6 +936,7 @@ async def translate_review(
                 )
                 if not qa_issues:
                     qa_issues = ["literal translation", "unnatural phrasing", "translation smell", "thin content"]
+                failed = _failed_artifacts(qa_parsed, qa_issues)
                 continue
 
         if best_payload:
@@ -835,15 +947,17 @@ async def translate_review(
 
     # 1) English first to keep an optional pivot reference
     try:
-        en_result = await _translate_language(
-            "en",
-            title_ru,
-            content_html_ru,
-            "Russian",
-            category_name_ru,
-            pros_ru,
-            cons_ru,
-        )
+        # Other languages wait on this one, so its calls jump the LLM queue
+        with llm_priority(PRIORITY_PIVOT):
+            en_result = await _translate_language(
+                "en",
+                title_ru,
+                content_html_ru,
+                "Russian",
+                category_name_ru,
+                pros_ru,
+                cons_ru,
+            )
         if en_result:
             results["en"] = en_result
             logger.info("English translation successful")
@@ -919,18 +1033,53 @@ async def translate_review(
     return results
 
 
+async def _translate_batch(client: LLMClient, prompt: str, label: str, logger: logging.Logger) -> dict:
+    """One request covering several languages; returns {lang: {...}} or {} on failure."""
+    try:
+        raw = await achat_json(client, SYSTEM_PROMPT, prompt, _temperature_for("en", "translation"))
+        parsed = await _parse_or_repair(client, raw, logger)
+        return parsed if isinstance(parsed, dict) else {}
+    except Exception as e:
+        logger.warning("Batched translation failed for %s: %s", label, e)
+        return {}
+
+
 async def translate_category(
-    client: GroqClient,
+    client: LLMClient,
     name_ru: str,
     langs: List[str],
     logger: logging.Logger,
+    batched: bool = False,
 ) -> Dict[str, dict]:
+    """
+    Translate a category name into `langs`.
+
+    batched=True asks for all languages in one request and falls back to
+    per-language requests only for languages whose answer fails validation.
+    """
     results: Dict[str, dict] = {}
+    pending = list(langs)
+
+    if batched and len(langs) > 1:
+        prompt = build_category_translation_batch_prompt(langs, name_ru)
+        parsed = await _translate_batch(client, prompt, name_ru, logger)
+        for lang in langs:
+            data = parsed.get(lang)
+            if not isinstance(data, dict):
+                continue
+            name = normalize_whitespace(str(data.get("name") or ""))
+            if not name or _contains_cyrillic(name):
+                continue
+            slug = slugify(str(data.get("slug") or name), max_length=50, fallback=name_ru)
+            results[lang] = {"lang": lang, "name": name, "slug": slug}
+        pending = [lang for lang in langs if lang not in results]
+        if pending:
+            logger.info("Batched category translation incomplete for %s, retrying: %s", name_ru, ", ".join(pending))
 
     async def _do_one(lang):
         try:
             prompt = build_category_translation_prompt(lang, name_ru)
-            raw = await asyncio.to_thread(client.chat_json, SYSTEM_PROMPT, prompt, _temperature_for(lang, "translation"))
+            raw = await achat_json(client, SYSTEM_PROMPT, prompt, _temperature_for(lang, "translation"))
             parsed = await _parse_or_repair(client, raw, logger)
             
             name = normalize_whitespace(str(parsed.get("name") or name_ru))
@@ -940,7 +1089,7 @@ async def translate_category(
             logger.error("Failed to translate category %s to %s: %s", name_ru, lang, e)
             return lang, None
 
-    items = await asyncio.gather(*[_do_one(l) for l in langs])
+    items = await asyncio.gather(*[_do_one(l) for l in pending])
     for lang, res in items:
         if res:
             results[lang] = res
@@ -948,13 +1097,21 @@ async def translate_category(
 
 
 async def translate_product(
-    client: GroqClient,
+    client: LLMClient,
     name_ru: str,
     description_ru: Optional[str],
     category_name_ru: Optional[str],
     langs: List[str],
     logger: logging.Logger,
+    batched: bool = False,
 ) -> Dict[str, dict]:
+    """
+    Translate a product name/description into `langs`.
+
+    batched=True asks for all languages in one request (no polish step) and
+    falls back to the per-language flow only for languages whose answer fails
+    validation (placeholder or Cyrillic name, description below target length).
+    """
     results: Dict[str, dict] = {}
     
     def _contains_cyrillic(text: str) -> bool:
@@ -1003,11 +1160,12 @@ async def translate_product(
                     min_description_chars=min_desc_chars if min_desc_chars > 0 else None,
                     issues=issues if issues else None,
                 )
-                raw = await asyncio.to_thread(
-                    client.chat_json,
+                raw = await achat_json(
+                    client,
                     SYSTEM_PROMPT,
                     prompt,
                     _temperature_for(lang, "translation"),
+                    use_cache=attempt == 0,
                 )
                 parsed = await _parse_or_repair(client, raw, logger)
 
@@ -1057,11 +1215,12 @@ async def translate_product(
                         issues=issues if issues else None,
                         min_description_chars=min_desc_chars if min_desc_chars > 0 else None,
                     )
-                    polished_raw = await asyncio.to_thread(
-                        client.chat_json,
+                    polished_raw = await achat_json(
+                        client,
                         SYSTEM_PROMPT,
                         polish_prompt,
                         _temperature_for(lang, "polish"),
+                        use_cache=attempt == 0,
                     )
                     polished = await _parse_or_repair(client, polished_raw, logger)
                     polished_name = normalize_whitespace(str(polished.get("name") or ""))
@@ -1111,7 +1270,46 @@ async def translate_product(
             logger.error("Failed to translate product %s to %s: %s", name_ru, lang, e)
             return lang, None
 
-    items = await asyncio.gather(*[_do_one(l) for l in langs])
+    pending = list(langs)
+    if batched and len(langs) > 1:
+        min_desc = {lang: _min_description_length(lang, description_ru or "") for lang in langs}
+        prompt = build_product_translation_batch_prompt(
+            langs,
+            name_ru,
+            description_ru,
+            category_name_ru,
+            min_description_chars=min_desc,
+        )
+        parsed = await _translate_batch(client, prompt, name_ru, logger)
+        for lang in langs:
+            data = parsed.get(lang)
+            if not isinstance(data, dict):
+                continue
+            name = normalize_whitespace(str(data.get("name") or ""))
+            description = normalize_whitespace(str(data.get("description") or ""))
+            if _is_product_placeholder(name) or _contains_cyrillic(name):
+                continue
+            if min_desc[lang] and len(description) < min_desc[lang]:
+                continue
+            meta_title = normalize_whitespace(str(data.get("meta_title") or name))
+            meta_description = normalize_whitespace(str(data.get("meta_description") or ""))
+            if len(meta_description) > 170:
+                meta_description = meta_description[:160].rstrip()
+            if not meta_description:
+                meta_description = name[:160]
+            results[lang] = {
+                "lang": lang,
+                "name": name,
+                "description": description,
+                "meta_title": meta_title,
+                "meta_description": meta_description,
+                "slug": create_localized_slug(str(data.get("slug") or name), lang, max_length=80, fallback="product"),
+            }
+        pending = [lang for lang in langs if lang not in results]
+        if pending:
+            logger.info("Batched product translation incomplete for %s, retrying: %s", name_ru[:50], ", ".join(pending))
+
+    items = await asyncio.gather(*[_do_one(l) for l in pending])
     for lang, res in items:
         if res:
             results[lang] = res
@@ -1119,13 +1317,13 @@ async def translate_product(
 
 
 async def extract_review_details_ai(
-    client: GroqClient,
+    client: LLMClient,
     html_text: str,
     logger: logging.Logger,
 ) -> dict:
     try:
         prompt = build_extraction_prompt(html_text)
-        raw = await asyncio.to_thread(client.chat_json, EXTRACTION_SYSTEM_PROMPT, prompt, 0.2)
+        raw = await achat_json(client, EXTRACTION_SYSTEM_PROMPT, prompt, 0.2)
         parsed = await _parse_or_repair(client, raw, logger)
         return parsed
     except Exception as e:
@@ -1134,7 +1332,7 @@ async def extract_review_details_ai(
 
 
 async def expand_review_content_ai(
-    client: GroqClient,
+    client: LLMClient,
     title: str,
     content_html: str,
     product_name: Optional[str],
@@ -1158,7 +1356,7 @@ async def expand_review_content_ai(
             rating=rating,
             min_chars=min_chars,
         )
-        raw = await asyncio.to_thread(client.chat_json, SYSTEM_PROMPT, prompt, 0.25)
+        raw = await achat_json(client, SYSTEM_PROMPT, prompt, 0.25)
         parsed = await _parse_or_repair(client, raw, logger)
         content = clean_html(str(parsed.get("content_html") or "").strip())
         return content or None
@@ -3,22 +3,31 @@ import asyncio
 import logging
 import argparse
 import random
-import time
 import uuid
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
 import requests
 
 from .config import Config
-from .http_client import HttpClient
+from .http_client import AsyncHttpClient, HttpClient
 from .logger import setup_logging
 from .crawl.catalog_discovery import discover_catalog_categories
 from .crawl.category_discovery import discover_subcategories, parse_category_name
+from .crawl.document import ParsedPage, html_text
 from .crawl.review_detail_parser import ReviewDetail, parse_review_detail
 from .crawl.review_list_discovery import build_page_urls, discover_review_links
-from .db.state import fetch_new_sources, mark_failed, mark_processed, mark_processing, upsert_source_map
+from .db.state import (
+    SourceLeases,
+    SourceStateBuffer,
+    claim_sources,
+    fetch_existing_reviews,
+    fetch_new_sources,
+    mark_sources_processed,
+    upsert_source_map,
+)
 from .db.supabase_client import SupabaseClient
 from .db.upsert import (
     fetch_categories_by_source_urls,
@@ -33,7 +42,7 @@ from .db.upsert import (
     link_product_to_category,
 )
 from .db.user_pool import ProfilePool
-from .llm.groq_client import GroqClient
+from .llm.groq_client import AsyncGroqClient, GroqClient, LLMClient
 from .llm.translate_and_seo import (
     translate_product,
     translate_review,
@@ -41,35 +50,41 @@ from .llm.translate_and_seo import (
     expand_review_content_ai,
 )
 from .llm.category_matcher import match_category_ai
+from .llm.response_cache import open_response_cache
+from .http_cache import open_http_cache
 from .media.r2_upload import R2Uploader
-from .media.image_fetch import fetch_image
-from .media.image_process import process_image
+from .media.image_fetch import fetch_image, fetch_image_async
+from .media.image_pool import configure_image_pool, get_image_pool
 from .utils.backoff import sleep_with_backoff
 from .utils.hashing import sha1_bytes, sha1_text, short_hash
 from .utils.slugify import slugify, contains_cyrillic, transliterate_name
 from .utils.text_clean import clean_html, normalize_whitespace
 from .utils.timing import sleep_jitter
 from .utils.linker import inject_internal_links
+from .pipeline import StageSpec, parse_stage_workers, run_items_concurrent, run_items_sequential, run_items_staged
 from .stability import (
     setup_signal_handlers,
+    configure_limiters,
+    configure_llm_scheduler,
+    configure_host_scheduler,
+    get_host_scheduler,
     GracefulShutdown,
     get_stats,
 )
 
 
-async def _fetch_html_async(http: HttpClient, url: str, logger: logging.Logger) -> str:
-    # Use thread for cloudscraper sync get
-    def _fetch():
-        response = http.get(url)
+async def _fetch_html_async(http: Union[HttpClient, AsyncHttpClient], url: str, logger: logging.Logger) -> str:
+    # The blocking client (cloudscraper fallback) runs in a thread; the async one is awaited directly
+    def _decode(response):
         # Force UTF-8 as irecommend uses it, sometimes apparent_encoding fails or detects differently
         response.encoding = 'utf-8'
-        return response.text
-    
-    text = await asyncio.to_thread(_fetch)
-    logger.info("Fetched %s", url)
-    
-    # Small delay after fetch to be gentle on proxy
-    await asyncio.sleep(2)
+        return response.text, getattr(response, "from_cache", False)
+
+    if isinstance(http, AsyncHttpClient):
+        text, from_cache = _decode(await http.get(url))
+    else:
+        text, from_cache = await asyncio.to_thread(lambda: _decode(http.get(url)))
+    logger.info("Fetched %s%s", url, " (cache)" if from_cache else "")
     return text
 
 
@@ -102,6 +117,12 @@ def _preserve_original_url(existing_desc: Optional[str], new_desc: Optional[str]
     return new_desc
 
 
+async def _close_llm_client(groq: LLMClient) -> None:
+    # The async client owns a pooled HTTP connection that must be closed on this loop
+    if isinstance(groq, AsyncGroqClient):
+        await groq.aclose()
+
+
 def _purge_worker_cache(config: Config, review_id: Optional[str], logger: logging.Logger) -> None:
     if not review_id:
         return
@@ -124,7 +145,7 @@ def _purge_worker_cache(config: Config, review_id: Optional[str], logger: loggin
 
 
 async def _process_images_async(
-    http: HttpClient,
+    http: Union[HttpClient, AsyncHttpClient],
     uploader: Optional[R2Uploader],
     config: Config,
     image_urls: List[str],
@@ -139,12 +160,16 @@ async def _process_images_async(
     
     async def _process_one(img_url):
         async with semaphore:
-            raw = await asyncio.to_thread(fetch_image, http, img_url, logger)
+            max_bytes = config.image_max_mb * 1024 * 1024
+            if isinstance(http, AsyncHttpClient):
+                raw = await fetch_image_async(http, img_url, logger, max_bytes)
+            else:
+                raw = await asyncio.to_thread(fetch_image, http, img_url, logger, max_bytes)
             if not raw:
                 return None
-            processed = await asyncio.to_thread(
-                process_image, 
-                raw, 
+            # CPU-bound: runs in the image worker processes, not on the GIL
+            processed = await get_image_pool().process(
+                raw,
                 config.image_crop_right_pct, 
                 config.image_max_width, 
                 config.image_webp_quality,
@@ -172,7 +197,7 @@ async def _process_images_async(
 
 
 async def _ensure_category_ids_async(
-    http: HttpClient,
+    http: Union[HttpClient, AsyncHttpClient],
     supabase: SupabaseClient,
     category_map: Dict[str, int],
     category_name_map: Dict[str, int],
@@ -180,7 +205,7 @@ async def _ensure_category_ids_async(
     ai_match_cache: Dict[str, Optional[int]],
     detail: ReviewDetail,
     base_url: str,
-    groq: GroqClient,
+    groq: LLMClient,
     config: Config,
     uploader: Optional[R2Uploader],
     logger: logging.Logger,
@@ -321,7 +346,12 @@ async def _ensure_category_ids_async(
             "description": final_prod_desc,
             "status": "published",
         }
-        prod_id = await asyncio.to_thread(upsert_product, supabase, prod_payload)
+        prod_id = await asyncio.to_thread(
+            upsert_product,
+            supabase,
+            prod_payload,
+            legacy_url_lookup=not config.product_source_url_migrated,
+        )
         
         if prod_id:
             await asyncio.to_thread(link_product_to_category, supabase, prod_id, sub_id or cat_id, logger)
@@ -377,6 +407,7 @@ async def _ensure_category_ids_async(
                             detail.category_name,
                             missing_langs,
                             logger,
+                            batched=config.llm_batch_translations,
                         )
                         
                         if translations:
@@ -473,397 +504,567 @@ async def _ensure_category_ids_async(
     return updates
 
 
-async def _process_review_item_async(
-    item: Dict[str, str],
-    http: HttpClient,
-    supabase: SupabaseClient,
-    groq: GroqClient,
-    uploader: Optional[R2Uploader],
-    profile_pool: ProfilePool,
-    category_map: Dict[str, int],
-    category_name_map: Dict[str, int],
-    parent_map: Dict[int, int],
-    ai_match_cache: Dict[str, Optional[int]],
-    config: Config,
-    logger: logging.Logger,
-    dry_run: bool,
-    product_map: Dict[str, str],
-    semaphore: asyncio.Semaphore,
-) -> bool:
-    async with semaphore:
-        source_url = item["source_url"]
-        logger.info("Starting processing: %s", source_url)
+@dataclass
+class DailyReviewCounter:
+    """Reviews created today: counted in the DB once per cycle, then incremented locally."""
+    limit: int
+    count: int = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.count)
+
+    def record(self) -> None:
+        # Only called from the event loop thread, after the upsert returns
+        self.count += 1
+
+
+@dataclass
+class ReviewRunContext:
+    """Per-run clients and lookup tables shared by every review item."""
+    http: Union[HttpClient, AsyncHttpClient]
+    supabase: SupabaseClient
+    groq: LLMClient
+    uploader: Optional[R2Uploader]
+    profile_pool: ProfilePool
+    category_map: Dict[str, int]
+    category_name_map: Dict[str, int]
+    parent_map: Dict[int, int]
+    ai_match_cache: Dict[str, Optional[int]]
+    config: Config
+    logger: logging.Logger
+    dry_run: bool
+    product_map: Dict[str, str]
+    daily_counter: DailyReviewCounter
+    state_buffer: SourceStateBuffer
+    sources_claimed: bool  # rows were set to processing (and leased) by claim_sources
+    existing_reviews: Dict[str, Optional[str]]  # pre-checked source_url -> review created_at (None: not ingested)
+
+
+@dataclass
+class ReviewWorkItem:
+    """State handed from one pipeline stage to the next for a single source."""
+    item: Dict[str, str]
+    html: str = ""
+    detail: Optional[ReviewDetail] = None
+    category_ids: Dict[str, Optional[Any]] = field(default_factory=dict)
+    author_id: Optional[str] = None
+    created_at: Optional[str] = None
+    translation_payloads: List[Dict[str, Any]] = field(default_factory=list)
+    translation_error: Optional[str] = None
+    result: Optional[bool] = None
+
+    @property
+    def source_url(self) -> str:
+        return self.item["source_url"]
+
+
+async def _mark_item_failed(work: ReviewWorkItem, run: ReviewRunContext, reason: str) -> bool:
+    retries = int(work.item.get("retries") or 0) + 1
+    await asyncio.to_thread(run.state_buffer.mark_failed, work.source_url, retries, reason)
+    work.result = False
+    return False
+
+
+async def _stage_fetch(work: ReviewWorkItem, run: ReviewRunContext) -> bool:
+    """Skip already ingested sources, claim the row and download the review page."""
+    source_url = work.source_url
+    logger = run.logger
+    logger.info("Starting processing: %s", source_url)
+    if source_url in run.existing_reviews:
+        already_ingested = run.existing_reviews[source_url] is not None
+    else:
+        # Not covered by the batch pre-check (lookup failed)
         existing_rows = await asyncio.to_thread(
-            supabase.select,
+            run.supabase.select,
             "reviews",
             "id",
             [("eq", "source_url", source_url)],
             limit=1,
         )
-        if existing_rows:
-            logger.info("Existing review found; skipping to preserve legacy content: %s", source_url)
-            if not dry_run:
-                await asyncio.to_thread(mark_processed, supabase, source_url, None)
-            return True
-        await asyncio.to_thread(mark_processing, supabase, source_url)
-        try:
-            async def _mark_failed(reason: str) -> None:
-                retries = int(item.get("retries") or 0) + 1
-                await asyncio.to_thread(mark_failed, supabase, source_url, retries, reason)
-
-            html = await _fetch_html_async(http, source_url, logger)
-            detail = parse_review_detail(html, source_url, config.source_base_url, logger)
-            
-            # Deep Dive: If we land on a product overview page (short content), 
-            # try to jump into a real deep review.
-            if len(detail.content_html) < 500:
-                logger.info("Content looks like a summary/teaser (%d chars). Searching for deep review link.", len(detail.content_html))
-                deep_links = discover_review_links(html, config.source_base_url, logger)
-                # Prioritize links with -n suffix
-                real_reviews = [l for l in deep_links if "-n" in l and l != source_url]
-                if real_reviews:
-                    target_url = real_reviews[0]
-                    logger.info("Deep dive: jumping to full review -> %s", target_url)
-                    html = await _fetch_html_async(http, target_url, logger)
-                    detail = parse_review_detail(html, target_url, config.source_base_url, logger)
-                    # We continue using this detail, but keep original source_url 
-                    # for database tracking unless we want to update it.
-            
-            # Content quality validation & AI Fallback
-            needs_ai = not detail.content_html or len(detail.content_html) < 100 or not detail.category_name
-            
-            if needs_ai:
-                logger.warning("Content too short, missing, or missing category. Attempting deep AI extraction for %s", source_url)
-                soup_text = BeautifulSoup(html, "lxml").get_text(separator="\n", strip=True)
-                ai_data = await extract_review_details_ai(groq, soup_text, logger)
-                
-                if ai_data.get("content_html") and len(ai_data["content_html"]) >= 100:
-                    logger.info("Deep AI extraction successful for %s", source_url)
-                    detail.content_html = ai_data["content_html"]
-                    if not detail.title and ai_data.get("title"):
-                        detail.title = ai_data["title"]
-                    if not detail.rating and ai_data.get("rating"):
-                        detail.rating = ai_data["rating"]
-                    
-                    # Always take AI pros/cons if they look better or if original is empty
-                    if ai_data.get("pros"):
-                        detail.pros = ai_data["pros"]
-                    if ai_data.get("cons"):
-                        detail.cons = ai_data["cons"]
-                    
-                    if not detail.product_name and ai_data.get("product_name"):
-                        detail.product_name = ai_data["product_name"]
-                    
-                    # Category/Subcategory Fallback
-                    if not detail.category_name and ai_data.get("category_name"):
-                        detail.category_name = ai_data["category_name"]
-                        logger.info("AI inferred category: %s", detail.category_name)
-                    if not detail.subcategory_name and ai_data.get("subcategory_name"):
-                        detail.subcategory_name = ai_data["subcategory_name"]
-                else:
-                    if not detail.content_html or len(detail.content_html) < 100:
-                        logger.warning(
-                            "Content still short after AI fallback (%d chars), continuing: %s",
-                            len(detail.content_html or ""),
-                            source_url,
-                        )
-            if not detail.title:
-                detail.title = detail.product_name or detail.source_slug or "Untitled Review"
-
-            min_content_len = max(0, config.min_content_length or 0)
-            soft_min_content_len = max(min_content_len, 1200)
-            content_len = len(detail.content_html or "")
-            if soft_min_content_len and content_len < soft_min_content_len and config.enable_content_expansion:
+        already_ingested = bool(existing_rows)
+    if already_ingested:
+        logger.info("Existing review found; skipping to preserve legacy content: %s", source_url)
+        if not run.dry_run:
+            await asyncio.to_thread(run.state_buffer.mark_processed, source_url, None)
+        work.result = True
+        return False
+    if not run.sources_claimed:
+        await asyncio.to_thread(run.state_buffer.mark_processing, source_url)
+    work.html = await _fetch_html_async(run.http, source_url, logger)
+    return True
+
+
+async def _stage_parse(work: ReviewWorkItem, run: ReviewRunContext) -> bool:
+    """Parse the page, fill gaps with AI, apply the quality gate and resolve category/product/author."""
+    source_url = work.source_url
+    config = run.config
+    logger = run.logger
+    groq = run.groq
+    page = ParsedPage(work.html, source_url)
+    detail = parse_review_detail(page, source_url, config.source_base_url, logger)
+
+    # Deep Dive: If we land on a product overview page (short content),
+    # try to jump into a real deep review.
+    if len(detail.content_html) < 500:
+        logger.info("Content looks like a summary/teaser (%d chars). Searching for deep review link.", len(detail.content_html))
+        deep_links = discover_review_links(page, config.source_base_url, logger)
+        # Prioritize links with -n suffix
+        real_reviews = [l for l in deep_links if "-n" in l and l != source_url]
+        if real_reviews:
+            target_url = real_reviews[0]
+            logger.info("Deep dive: jumping to full review -> %s", target_url)
+            html = await _fetch_html_async(run.http, target_url, logger)
+            page = ParsedPage(html, target_url)
+            detail = parse_review_detail(page, target_url, config.source_base_url, logger)
+            # We continue using this detail, but keep original source_url
+            # for database tracking unless we want to update it.
+    parsed_content_html = detail.content_html
+
+    # Content quality validation & AI Fallback
+    needs_ai = not detail.content_html or len(detail.content_html) < 100 or not detail.category_name
+
+    if needs_ai:
+        logger.warning("Content too short, missing, or missing category. Attempting deep AI extraction for %s", source_url)
+        soup_text = page.text("\n")
+        ai_data = await extract_review_details_ai(groq, soup_text, logger)
+
+        if ai_data.get("content_html") and len(ai_data["content_html"]) >= 100:
+            logger.info("Deep AI extraction successful for %s", source_url)
+            detail.content_html = ai_data["content_html"]
+            if not detail.title and ai_data.get("title"):
+                detail.title = ai_data["title"]
+            if not detail.rating and ai_data.get("rating"):
+                detail.rating = ai_data["rating"]
+
+            # Always take AI pros/cons if they look better or if original is empty
+            if ai_data.get("pros"):
+                detail.pros = ai_data["pros"]
+            if ai_data.get("cons"):
+                detail.cons = ai_data["cons"]
+
+            if not detail.product_name and ai_data.get("product_name"):
+                detail.product_name = ai_data["product_name"]
+
+            # Category/Subcategory Fallback
+            if not detail.category_name and ai_data.get("category_name"):
+                detail.category_name = ai_data["category_name"]
+                logger.info("AI inferred category: %s", detail.category_name)
+            if not detail.subcategory_name and ai_data.get("subcategory_name"):
+                detail.subcategory_name = ai_data["subcategory_name"]
+        else:
+            if not detail.content_html or len(detail.content_html) < 100:
                 logger.warning(
-                    "Content below min length (%d < %d). Attempting AI expansion for %s",
-                    content_len,
-                    soft_min_content_len,
+                    "Content still short after AI fallback (%d chars), continuing: %s",
+                    len(detail.content_html or ""),
                     source_url,
                 )
-                expanded = await expand_review_content_ai(
-                    groq,
-                    title=detail.title,
-                    content_html=detail.content_html or "",
-                    product_name=detail.product_name,
-                    category_name=detail.category_name,
-                    pros=detail.pros,
-                    cons=detail.cons,
-                    rating=detail.rating,
-                    logger=logger,
-                    min_chars=soft_min_content_len,
-                )
-                if expanded:
-                    detail.content_html = expanded
-                    content_len = len(detail.content_html or "")
-                    logger.info("AI expansion successful (%d chars) for %s", content_len, source_url)
-                else:
-                    logger.warning("AI expansion failed or empty for %s", source_url)
-
-            if not detail.content_html:
-                detail.content_html = f"<p>{detail.title}</p>"
-
-            if detail.content_html:
-                detail.excerpt = normalize_whitespace(
-                    BeautifulSoup(detail.content_html, "lxml").get_text()
-                )[:300]
-            else:
-                detail.excerpt = detail.excerpt or ""
+    if not detail.title:
+        detail.title = detail.product_name or detail.source_slug or "Untitled Review"
 
-            if not detail.product_image_url and detail.image_urls:
-                detail.product_image_url = detail.image_urls[0]
-                logger.info("Fallback: using first review image as product image for %s", source_url)
+    min_content_len = max(0, config.min_content_length or 0)
+    soft_min_content_len = max(min_content_len, 1200)
+    content_len = len(detail.content_html or "")
+    if soft_min_content_len and content_len < soft_min_content_len and config.enable_content_expansion:
+        logger.warning(
+            "Content below min length (%d < %d). Attempting AI expansion for %s",
+            content_len,
+            soft_min_content_len,
+            source_url,
+        )
+        expanded = await expand_review_content_ai(
+            groq,
+            title=detail.title,
+            content_html=detail.content_html or "",
+            product_name=detail.product_name,
+            category_name=detail.category_name,
+            pros=detail.pros,
+            cons=detail.cons,
+            rating=detail.rating,
+            logger=logger,
+            min_chars=soft_min_content_len,
+        )
+        if expanded:
+            detail.content_html = expanded
+            content_len = len(detail.content_html or "")
+            logger.info("AI expansion successful (%d chars) for %s", content_len, source_url)
+        else:
+            logger.warning("AI expansion failed or empty for %s", source_url)
 
-            if not detail.image_urls and detail.product_image_url:
-                detail.image_urls = [detail.product_image_url]
-                logger.info("Fallback: using product image as review image for %s", source_url)
-            
-            if not detail.image_urls and config.fallback_review_image_url:
-                detail.image_urls = [config.fallback_review_image_url]
-                logger.info("Fallback: using default review image for %s", source_url)
+    if not detail.content_html:
+        detail.content_html = f"<p>{detail.title}</p>"
 
-            if not detail.product_image_url and config.fallback_review_image_url:
-                detail.product_image_url = config.fallback_review_image_url
-                logger.info("Fallback: using default product image for %s", source_url)
+    # The parser built the excerpt from the page tree; only rebuild it if the content was replaced
+    if detail.content_html != parsed_content_html or not detail.excerpt:
+        detail.excerpt = normalize_whitespace(html_text(detail.content_html))[:300]
 
-            if not detail.image_urls:
-                logger.warning("No review images for %s; continuing with empty photo list", source_url)
-                
-            if not detail.product_image_url:
-                logger.warning("No product image for %s; continuing without product image", source_url)
-            
-            # QUALITY GATE
-            # 1. Length Check
-            content_len = len(detail.content_html or "")
-            hard_min_len = max(0, config.min_content_length_hard or 0)
-            if hard_min_len and content_len < hard_min_len:
-                logger.warning(
-                    "Quality Gate Failed: Content too short (%d chars; hard min %d). Skipping %s",
-                    content_len,
-                    hard_min_len,
-                    source_url,
-                )
-                await _mark_failed(f"Quality gate failed: content too short ({content_len} chars)")
-                return False
-
-            # 2. Image Check
-            if not detail.image_urls and not detail.product_image_url:
-                 # Try fallback from config if needed, but if strictly no images found:
-                 if not config.fallback_review_image_url:
-                     logger.warning("Quality Gate Failed: No images found. Skipping %s", source_url)
-                     await _mark_failed("Quality gate failed: no images found")
-                     return False
-            
-            if min_content_len and content_len < min_content_len:
-                logger.warning(
-                    "Quality check SOFT PASS: %d chars < %d, %d review images, product image %s",
-                    content_len,
-                    min_content_len,
-                    len(detail.image_urls),
-                    "ok" if detail.product_image_url else "missing",
-                )
-            else:
-                logger.info(
-                    "Quality check PASSED: %d chars, %d review images, product image %s",
-                    content_len,
-                    len(detail.image_urls),
-                    "ok" if detail.product_image_url else "missing",
-                )
+    if not detail.product_image_url and detail.image_urls:
+        detail.product_image_url = detail.image_urls[0]
+        logger.info("Fallback: using first review image as product image for %s", source_url)
 
-            try:
-                category_ids = await _ensure_category_ids_async(
-                    http,
-                    supabase,
-                    category_map,
-                    category_name_map,
-                    parent_map,
-                    ai_match_cache,
-                    detail,
-                    config.source_base_url,
-                    groq,
-                    config,
-                    uploader,
-                    logger,
-                    dry_run,
-                )
-            except Exception as e:
-                logger.error("Category/product enrichment failed, continuing without it: %s", e)
-                category_ids = {"category_id": None, "sub_category_id": None, "product_id": None}
-
-            cat_id = category_ids.get("category_id")
-            if not cat_id:
-                # Debug log to see why it failed
-                cat_url_debug = _normalize_url(config.source_base_url, detail.category_url)
-                sub_url_debug = _normalize_url(config.source_base_url, detail.subcategory_url)
-                logger.warning(
-                    "Missing/Unmatched category. SKIPPING.\n"
-                    "  Source URL: %s\n"
-                    "  Found Cat URL: %s\n"
-                    "  Found Sub URL: %s\n"
-                    "  Detail Cat Name: %s\n"
-                    "  Detail Sub Name: %s\n"
-                    "  Total DB Categories Loaded: %d",
-                    source_url, cat_url_debug, sub_url_debug, detail.category_name, detail.subcategory_name, len(category_map)
-                )
-                await _mark_failed("Category mismatch: missing or unmatched category")
-                return False
+    if not detail.image_urls and detail.product_image_url:
+        detail.image_urls = [detail.product_image_url]
+        logger.info("Fallback: using product image as review image for %s", source_url)
 
-            try:
-                author_id = profile_pool.pick(category_name=detail.category_name)
-            except Exception as exc:
-                logger.error("Profile pool unavailable, continuing without author: %s", exc)
-                author_id = None
+    if not detail.image_urls and config.fallback_review_image_url:
+        detail.image_urls = [config.fallback_review_image_url]
+        logger.info("Fallback: using default review image for %s", source_url)
 
-            full_title = detail.title or ""
-            if detail.product_name and detail.product_name.lower() not in full_title.lower():
-                full_title = f"{detail.product_name} - {full_title}"
+    if not detail.product_image_url and config.fallback_review_image_url:
+        detail.product_image_url = config.fallback_review_image_url
+        logger.info("Fallback: using default product image for %s", source_url)
 
-            existing_created_at = None
-            try:
-                existing_rows = await asyncio.to_thread(
-                    supabase.select,
-                    "reviews",
-                    "id, created_at",
-                    [("eq", "source_url", detail.source_url)],
-                    None,
-                    1,
-                )
-                if existing_rows:
-                    existing_created_at = existing_rows[0].get("created_at")
-            except Exception as exc:
-                logger.warning("Failed to check existing review timestamps: %s", exc)
+    if not detail.image_urls:
+        logger.warning("No review images for %s; continuing with empty photo list", source_url)
 
-            if existing_created_at:
-                created_at = existing_created_at
-            elif config.use_source_published_at and detail.published_at:
-                created_at = detail.published_at
-            else:
-                created_at = datetime.now(timezone.utc).isoformat()
-
-            review_payload = {
-                "source_url": detail.source_url,
-                "source_slug": detail.source_slug,
-                "source": "irecommend",
-                "slug": detail.source_slug,
-                "title": full_title,
-                "excerpt": detail.excerpt,
-                "content_html": detail.content_html,
-                "category_id": cat_id,
-                "sub_category_id": category_ids.get("sub_category_id") or cat_id,
-                "product_id": category_ids.get("product_id"),
-                "user_id": author_id,
-                "rating_avg": detail.rating or 0,
-                "rating_count": detail.rating_count or 0,
-                "votes_up": detail.like_up or 0,
-                "votes_down": detail.like_down or 0,
-                "photo_urls": [],
-                "photo_count": 0,
+    if not detail.product_image_url:
+        logger.warning("No product image for %s; continuing without product image", source_url)
+
+    # QUALITY GATE
+    # 1. Length Check
+    content_len = len(detail.content_html or "")
+    hard_min_len = max(0, config.min_content_length_hard or 0)
+    if hard_min_len and content_len < hard_min_len:
+        logger.warning(
+            "Quality Gate Failed: Content too short (%d chars; hard min %d). Skipping %s",
+            content_len,
+            hard_min_len,
+            source_url,
+        )
+        return await _mark_item_failed(work, run, f"Quality gate failed: content too short ({content_len} chars)")
+
+    # 2. Image Check
+    if not detail.image_urls and not detail.product_image_url:
+         # Try fallback from config if needed, but if strictly no images found:
+         if not config.fallback_review_image_url:
+             logger.warning("Quality Gate Failed: No images found. Skipping %s", source_url)
+             return await _mark_item_failed(work, run, "Quality gate failed: no images found")
+
+    if min_content_len and content_len < min_content_len:
+        logger.warning(
+            "Quality check SOFT PASS: %d chars < %d, %d review images, product image %s",
+            content_len,
+            min_content_len,
+            len(detail.image_urls),
+            "ok" if detail.product_image_url else "missing",
+        )
+    else:
+        logger.info(
+            "Quality check PASSED: %d chars, %d review images, product image %s",
+            content_len,
+            len(detail.image_urls),
+            "ok" if detail.product_image_url else "missing",
+        )
+
+    try:
+        category_ids = await _ensure_category_ids_async(
+            run.http,
+            run.supabase,
+            run.category_map,
+            run.category_name_map,
+            run.parent_map,
+            run.ai_match_cache,
+            detail,
+            config.source_base_url,
+            groq,
+            config,
+            run.uploader,
+            logger,
+            run.dry_run,
+        )
+    except Exception as e:
+        logger.error("Category/product enrichment failed, continuing without it: %s", e)
+        category_ids = {"category_id": None, "sub_category_id": None, "product_id": None}
+
+    cat_id = category_ids.get("category_id")
+    if not cat_id:
+        # Debug log to see why it failed
+        cat_url_debug = _normalize_url(config.source_base_url, detail.category_url)
+        sub_url_debug = _normalize_url(config.source_base_url, detail.subcategory_url)
+        logger.warning(
+            "Missing/Unmatched category. SKIPPING.\n"
+            "  Source URL: %s\n"
+            "  Found Cat URL: %s\n"
+            "  Found Sub URL: %s\n"
+            "  Detail Cat Name: %s\n"
+            "  Detail Sub Name: %s\n"
+            "  Total DB Categories Loaded: %d",
+            source_url, cat_url_debug, sub_url_debug, detail.category_name, detail.subcategory_name, len(run.category_map)
+        )
+        return await _mark_item_failed(work, run, "Category mismatch: missing or unmatched category")
+
+    try:
+        author_id = run.profile_pool.pick(category_name=detail.category_name)
+    except Exception as exc:
+        logger.error("Profile pool unavailable, continuing without author: %s", exc)
+        author_id = None
+
+    existing_created_at = None
+    if detail.source_url in run.existing_reviews:
+        existing_created_at = run.existing_reviews[detail.source_url]
+    else:
+        # Deep-dive target (or pre-check failed): not looked up with the batch
+        try:
+            existing_rows = await asyncio.to_thread(
+                run.supabase.select,
+                "reviews",
+                "id, created_at",
+                [("eq", "source_url", detail.source_url)],
+                None,
+                1,
+            )
+            if existing_rows:
+                existing_created_at = existing_rows[0].get("created_at")
+        except Exception as exc:
+            logger.warning("Failed to check existing review timestamps: %s", exc)
+
+    if existing_created_at:
+        created_at = existing_created_at
+    elif config.use_source_published_at and detail.published_at:
+        created_at = detail.published_at
+    else:
+        created_at = datetime.now(timezone.utc).isoformat()
+
+    work.html = ""  # Page no longer needed; keep queued items small
+    work.detail = detail
+    work.category_ids = category_ids
+    work.author_id = author_id
+    work.created_at = created_at
+    return True
+
+
+async def _stage_translate(work: ReviewWorkItem, run: ReviewRunContext) -> bool:
+    """Translate the review into every configured language (allowing partial failure)."""
+    detail = work.detail
+    logger = run.logger
+    translation_error = None
+    try:
+        translations = await translate_review(
+            run.groq,
+            detail.title,
+            detail.content_html,
+            detail.category_name,
+            run.config.langs,
+            logger,
+            pros_ru=detail.pros,
+            cons_ru=detail.cons
+        )
+    except Exception as te:
+        translation_error = str(te)
+        logger.warning("Translation skipped: reason=%s source_url=%s", translation_error, work.source_url)
+        translations = {}
+
+    required_langs = run.config.langs or ["en"]
+    missing_langs = [lang for lang in required_langs if lang not in translations]
+    if missing_langs:
+        fallback_title = detail.title or detail.product_name or detail.source_slug or "Untitled Review"
+        fallback_excerpt = detail.excerpt or fallback_title
+        fallback_content = detail.content_html or f"<p>{fallback_title}</p>"
+        for lang in missing_langs:
+            translations[lang] = {
+                "title": fallback_title,
+                "content_html": fallback_content,
+                "meta_title": fallback_title[:60],
+                "meta_description": fallback_excerpt[:160],
+                "slug": slugify(fallback_title, max_length=80, fallback=fallback_title),
+                "summary": "",
+                "faq": [],
                 "pros": detail.pros or [],
                 "cons": detail.cons or [],
-                "created_at": created_at,
-                "status": "published",
             }
-
-            review_id = None
-            if not dry_run:
-                review_id = await asyncio.to_thread(upsert_review, supabase, review_payload)
-            
-            # Process Images
-            if detail.image_urls:
-                logger.info("Processing %d images for %s", len(detail.image_urls), source_url)
-                photos = await _process_images_async(http, uploader, config, detail.image_urls, review_id, detail.source_slug, logger, dry_run)
-                if photos and review_id and not dry_run:
-                    await asyncio.to_thread(update_review_photos, supabase, review_id, photos)
-                    logger.info("Saved %d photos for review %s", len(photos), review_id)
-
-            # Translate (allow partial failure)
-            translation_error = None
+        logger.warning("Fallback translations created for %s", ", ".join(missing_langs))
+
+    translation_payloads = []
+    for lang, data in translations.items():
+        base_slug = slugify(data["slug"], max_length=80, fallback=detail.title)
+
+        # We no longer inject Pros/Cons/FAQ/Specs into HTML.
+        # The frontend now renders these from structured fields in the DB.
+        # This prevents "broken text" issues and allows for clean, localized UI components.
+
+        raw_content = data["content_html"]
+
+        translation_payloads.append({
+            "lang": lang,
+            "title": data["title"],
+            "content_html": clean_html(inject_internal_links(raw_content, run.product_map)),
+            "meta_title": data["meta_title"],
+            "meta_description": data["meta_description"],
+            "slug": base_slug,
+            "summary": data.get("summary"),
+            "faq": data.get("faq"),
+            "specs": data.get("specs"),
+            "pros": data.get("pros"),
+            "cons": data.get("cons"),
+        })
+
+    work.translation_payloads = translation_payloads
+    work.translation_error = translation_error
+    return True
+
+
+async def _stage_persist(work: ReviewWorkItem, run: ReviewRunContext) -> bool:
+    """Write the review, its photos and translations, then mark the source processed."""
+    detail = work.detail
+    category_ids = work.category_ids
+    config = run.config
+    logger = run.logger
+    source_url = work.source_url
+    cat_id = category_ids.get("category_id")
+
+    full_title = detail.title or ""
+    if detail.product_name and detail.product_name.lower() not in full_title.lower():
+        full_title = f"{detail.product_name} - {full_title}"
+
+    review_payload = {
+        "source_url": detail.source_url,
+        "source_slug": detail.source_slug,
+        "source": "irecommend",
+        "slug": detail.source_slug,
+        "title": full_title,
+        "excerpt": detail.excerpt,
+        "content_html": detail.content_html,
+        "category_id": cat_id,
+        "sub_category_id": category_ids.get("sub_category_id") or cat_id,
+        "product_id": category_ids.get("product_id"),
+        "user_id": work.author_id,
+        "rating_avg": detail.rating or 0,
+        "rating_count": detail.rating_count or 0,
+        "votes_up": detail.like_up or 0,
+        "votes_down": detail.like_down or 0,
+        "photo_urls": [],
+        "photo_count": 0,
+        "pros": detail.pros or [],
+        "cons": detail.cons or [],
+        "created_at": work.created_at,
+        "status": "published",
+    }
+
+    review_id = None
+    if not run.dry_run:
+        review_id = await asyncio.to_thread(upsert_review, run.supabase, review_payload)
+        run.daily_counter.record()
+
+    # Process Images
+    if detail.image_urls:
+        logger.info("Processing %d images for %s", len(detail.image_urls), source_url)
+        photos = await _process_images_async(run.http, run.uploader, config, detail.image_urls, review_id, detail.source_slug, logger, run.dry_run)
+        if photos and review_id and not run.dry_run:
+            await asyncio.to_thread(update_review_photos, run.supabase, review_id, photos)
+            logger.info("Saved %d photos for review %s", len(photos), review_id)
+
+    if review_id and not run.dry_run:
+        if work.translation_payloads:
             try:
-                translations = await translate_review(
-                    groq, 
-                    detail.title, 
-                    detail.content_html, 
-                    detail.category_name, 
-                    config.langs, 
-                    logger,
-                    pros_ru=detail.pros,
-                    cons_ru=detail.cons
-                )
-            except Exception as te:
-                translation_error = str(te)
-                logger.warning("Translation skipped: reason=%s source_url=%s", translation_error, source_url)
-                translations = {}
-
-            required_langs = config.langs or ["en"]
-            missing_langs = [lang for lang in required_langs if lang not in translations]
-            if missing_langs:
-                fallback_title = detail.title or detail.product_name or detail.source_slug or "Untitled Review"
-                fallback_excerpt = detail.excerpt or fallback_title
-                fallback_content = detail.content_html or f"<p>{fallback_title}</p>"
-                for lang in missing_langs:
-                    translations[lang] = {
-                        "title": fallback_title,
-                        "content_html": fallback_content,
-                        "meta_title": fallback_title[:60],
-                        "meta_description": fallback_excerpt[:160],
-                        "slug": slugify(fallback_title, max_length=80, fallback=fallback_title),
-                        "summary": "",
-                        "faq": [],
-                        "pros": detail.pros or [],
-                        "cons": detail.cons or [],
-                    }
-                logger.warning("Fallback translations created for %s", ", ".join(missing_langs))
-            
-            translation_payloads = []
-            for lang, data in translations.items():
-                base_slug = slugify(data["slug"], max_length=80, fallback=detail.title)
-                
-                # We no longer inject Pros/Cons/FAQ/Specs into HTML.
-                # The frontend now renders these from structured fields in the DB.
-                # This prevents "broken text" issues and allows for clean, localized UI components.
-                
-                raw_content = data["content_html"]
-                
-                translation_payloads.append({
-                    "lang": lang,
-                    "title": data["title"],
-                    "content_html": clean_html(inject_internal_links(raw_content, product_map)),
-                    "meta_title": data["meta_title"],
-                    "meta_description": data["meta_description"],
-                    "slug": base_slug,
-                    "summary": data.get("summary"),
-                    "faq": data.get("faq"),
-                    "specs": data.get("specs"),
-                    "pros": data.get("pros"),
-                    "cons": data.get("cons"),
-                })
-
-            if review_id and not dry_run:
-                if translation_payloads:
-                    try:
-                        await asyncio.to_thread(upsert_review_translations, supabase, review_id, translation_payloads, logger)
-                    except Exception as exc:
-                        logger.error("Translation upsert failed for %s: %s", source_url, exc)
-                elif not translation_error:
-                    logger.warning("Translation empty for %s", source_url)
-                content_hash = sha1_text(f"{detail.title}|{detail.content_html}")
-                await asyncio.to_thread(mark_processed, supabase, source_url, content_hash)
-                await asyncio.to_thread(_purge_worker_cache, config, review_id, logger)
-            
-            logger.info("Successfully processed: %s", source_url)
-            return True
+                await asyncio.to_thread(upsert_review_translations, run.supabase, review_id, work.translation_payloads, logger)
+            except Exception as exc:
+                logger.error("Translation upsert failed for %s: %s", source_url, exc)
+        elif not work.translation_error:
+            logger.warning("Translation empty for %s", source_url)
+        content_hash = sha1_text(f"{detail.title}|{detail.content_html}")
+        await asyncio.to_thread(run.state_buffer.mark_processed, source_url, content_hash)
+        await asyncio.to_thread(_purge_worker_cache, config, review_id, logger)
+
+    logger.info("Successfully processed: %s", source_url)
+    work.result = True
+    return True
+
+
+REVIEW_STAGES = (
+    ("fetch", _stage_fetch),
+    ("parse", _stage_parse),
+    ("translate", _stage_translate),
+    ("persist", _stage_persist),
+)
 
+
+def _guard_stage(stage, run: ReviewRunContext):
+    """Wrap a stage so an unexpected error marks the source failed instead of escaping."""
+    async def _guarded(work: ReviewWorkItem) -> bool:
+        try:
+            return await stage(work, run)
         except Exception as exc:
-            logger.error("Failed processing %s: %s", source_url, exc)
+            run.logger.error("Failed processing %s: %s", work.source_url, exc)
             # If it's a conflict error we already tried to resolve but maybe failed again
-            retries = int(item.get("retries") or 0) + 1
-            await asyncio.to_thread(mark_failed, supabase, source_url, retries, str(exc))
-            return False
+            return await _mark_item_failed(work, run, str(exc))
+    return _guarded
+
+
+async def _process_review_item_async(item: Dict[str, str], run: ReviewRunContext) -> bool:
+    """Run every stage for one item in order (sequential and concurrent modes)."""
+    work = ReviewWorkItem(item=item)
+    for _, stage in REVIEW_STAGES:
+        if not await _guard_stage(stage, run)(work):
+            return bool(work.result)
+    return bool(work.result)
+
+
+async def _drop_ingested_sources(
+    sources: List[Dict[str, Any]],
+    existing_reviews: Dict[str, Optional[str]],
+    supabase: SupabaseClient,
+    dry_run: bool,
+    logger: logging.Logger,
+) -> List[Dict[str, Any]]:
+    """
+    Check a whole batch of candidates against `reviews` at once and mark the ones
+    already ingested as processed, instead of one existence select per item.
+    Results (created_at or None) are added to `existing_reviews`.
+    """
+    urls = [item["source_url"] for item in sources if item["source_url"] not in existing_reviews]
+    if not urls:
+        return [item for item in sources if existing_reviews.get(item["source_url"]) is None]
+    try:
+        found = await asyncio.to_thread(fetch_existing_reviews, supabase, urls)
+    except Exception as exc:
+        logger.warning("Batch check of existing reviews failed, checking per item: %s", exc)
+        return sources
+    for url in urls:
+        existing_reviews[url] = found.get(url)
+    if found:
+        logger.info("Existing review found for %d/%d candidates; marking processed", len(found), len(urls))
+        if not dry_run:
+            try:
+                await asyncio.to_thread(mark_sources_processed, supabase, list(found))
+            except Exception as exc:
+                logger.warning("Failed to mark ingested sources processed: %s", exc)
+    return [item for item in sources if existing_reviews.get(item["source_url"]) is None]
+
 
 async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] = None) -> None:
     run_id = run_id or uuid.uuid4().hex[:8]
     logger = setup_logging(config.log_file, run_id=run_id)
+    # Per-cycle clients and caches are closed on every exit: early returns, errors, shutdown
+    async with AsyncExitStack() as resources:
+        await _run_cycle_async(config, dry_run, logger, resources)
+
+
+async def _run_cycle_async(config: Config, dry_run: bool, logger: logging.Logger, resources: AsyncExitStack) -> None:
     groq_model_source = "env GROQ_MODEL" if os.getenv("GROQ_MODEL") else "default"
     logger.info("LLM model: %s (%s)", config.groq_model, groq_model_source)
+    configure_limiters(
+        source=config.source_fetch_concurrency,
+        llm=config.llm_concurrency,
+        db=config.db_concurrency,
+        r2=config.r2_concurrency,
+    )
+    llm_scheduler = configure_llm_scheduler(
+        config.llm_requests_per_minute,
+        config.llm_tokens_per_minute,
+    )
+    # Pauses between source-site requests; every other host goes out unpaced
+    host_scheduler = configure_host_scheduler(config.host_min_intervals)
+    image_pool = configure_image_pool(config.image_workers, logger)
+    # Worker processes must not outlive a failed cycle (main_async keeps looping)
+    resources.push_async_callback(asyncio.to_thread, image_pool.shutdown)
+    http_cache = open_http_cache(
+        config.http_cache_path,
+        logger,
+        ttl_rules=config.http_cache_ttls,
+        max_mb=config.http_cache_max_mb,
+    )
+    if http_cache is not None:
+        resources.callback(http_cache.close)
     http = HttpClient(
         timeout_seconds=config.http_timeout_seconds,
         max_retries=config.http_max_retries,
@@ -871,6 +1072,7 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
         logger=logger,
         proxy=config.http_proxy,
         proxy_pool=config.http_proxy_pool,
+        cache=http_cache,
     )
     
     supabase = SupabaseClient(
@@ -878,8 +1080,37 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
         key=config.supabase_service_role_key,
         logger=logger,
         dry_run=dry_run,
+        pool_size=config.db_pool_size or config.db_concurrency,
+        timeout_seconds=config.db_timeout_seconds,
+        http2=config.db_http2,
+    )
+    resources.callback(supabase.close)
+    llm_cache = open_response_cache(
+        config.llm_cache_path,
+        logger,
+        ttl_hours=config.llm_cache_ttl_hours,
+        max_mb=config.llm_cache_max_mb,
     )
-    groq = GroqClient(api_key=config.groq_api_key, model=config.groq_model, logger=logger, vision_model=config.groq_vision_model)
+    if llm_cache is not None:
+        resources.callback(llm_cache.close)
+    groq: LLMClient
+    if config.llm_async_client:
+        groq = AsyncGroqClient(
+            api_key=config.groq_api_key,
+            model=config.groq_model,
+            logger=logger,
+            max_concurrency=config.llm_concurrency,
+            cache=llm_cache,
+        )
+    else:
+        groq = GroqClient(
+            api_key=config.groq_api_key,
+            model=config.groq_model,
+            logger=logger,
+            vision_model=config.groq_vision_model,
+            cache=llm_cache,
+        )
+    resources.push_async_callback(_close_llm_client, groq)
     
     uploader = None
     if not dry_run:
@@ -898,18 +1129,17 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
 
     # Check daily limit
     today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    daily_counter = DailyReviewCounter(limit=config.daily_review_limit)
     try:
-        daily_rows = await asyncio.to_thread(
-            supabase.select, 
-            "reviews", 
-            "id", 
-            [("gte", "created_at", today_start)]
+        daily_counter.count = await asyncio.to_thread(
+            supabase.count,
+            "reviews",
+            [("gte", "created_at", today_start)],
         )
-        daily_count = len(daily_rows)
-        if daily_count >= config.daily_review_limit:
-            logger.warning("Daily limit reached (%d/%d). Sleeping...", daily_count, config.daily_review_limit)
+        if daily_counter.remaining <= 0:
+            logger.warning("Daily limit reached (%d/%d). Sleeping...", daily_counter.count, config.daily_review_limit)
             return
-        logger.info("Daily count: %d/%d", daily_count, config.daily_review_limit)
+        logger.info("Daily count: %d/%d", daily_counter.count, config.daily_review_limit)
     except Exception as e:
         logger.error("Failed to check daily limit: %s", e)
         # We might want to continue or return. Let's continue but be cautious? 
@@ -918,7 +1148,9 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
         # I'll continue for now.
 
     # Load categories
-    rows = await asyncio.to_thread(supabase.select, "categories", "id, source_url, name, parent_id")
+    rows = await asyncio.to_thread(
+        lambda: list(supabase.select_iter("categories", "id, source_url, name, parent_id"))
+    )
     category_map = {}
     category_name_map = {}
     parent_map = {} # ID -> Parent ID
@@ -973,7 +1205,10 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
         fetch_limit,
         config.retry_failed_sources,
         config.max_source_retries,
+        None if dry_run else config.source_lease_seconds,
     )
+    existing_reviews: Dict[str, Optional[str]] = {}
+    raw_sources = await _drop_ingested_sources(raw_sources, existing_reviews, supabase, dry_run, logger)
     
     # Smart Shuffle Logic
     # Group by 'category_signature' (derived from URL path segments)
@@ -1010,7 +1245,7 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
                 new_sources.append(grouped_sources[key][i])
                 
     # Now trim to the actual limit we want to process
-    remaining_daily = config.daily_review_limit - daily_count
+    remaining_daily = daily_counter.remaining
     if remaining_daily <= 0:
         logger.info("Daily limit reached (checked again).")
         return
@@ -1064,24 +1299,20 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
                         logger.info("Scanning category %d/%d: %s (Page %d/%d) %s", 
                                     idx + 1, len(targets), c_url, p_idx + 1, len(page_urls), 
                                     "[Fresh]" if "new=1" in page_url else "[Popular]")
-                        p_html = http.get(page_url).text
-                        found_links = discover_review_links(p_html, config.source_base_url, logger)
+                        p_response = http.get(page_url)
+                        found_links = discover_review_links(p_response.text, config.source_base_url, logger)
                         for link in found_links:
                             if "-n" in link:
                                 cat_links.add(link)
                             else:
                                 product_urls.add(link)
-                        # Gentle delay between pages to avoid bot detection
-                        time.sleep(random.uniform(2, 4))
                     except Exception as e:
                         logger.warning("Page scan failed %s: %s", page_url, e)
-                        time.sleep(random.uniform(5, 10))  # Extra delay on error
+                        # Extra pause before the next request to this host
+                        get_host_scheduler().back_off(page_url, random.uniform(5, 10))
                 
                 if cat_links:
                     links_by_category.append(list(cat_links))
-                
-                # Delay between categories to be gentle
-                time.sleep(random.uniform(3, 6))
 
             # Interleave the cat_links to ensure variety in source_map ordering
             interleaved_reviews = []
@@ -1099,17 +1330,15 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
                 random.shuffle(p_list)
                 for p_idx, p_url in enumerate(p_list[:deep_scan_limit]):
                     try:
-                        p_html = http.get(p_url).text
-                        deep_links = discover_review_links(p_html, config.source_base_url, logger)
+                        p_response = http.get(p_url)
+                        deep_links = discover_review_links(p_response.text, config.source_base_url, logger)
                         for d_link in deep_links:
                             if "-n" in d_link and d_link not in interleaved_reviews:
                                 interleaved_reviews.append(d_link)
                         logger.info("Deep scan progress: %d/%d", p_idx + 1, deep_scan_limit)
-                        # Gentle delay between product pages
-                        time.sleep(random.uniform(3, 6))
                     except Exception as e:
                         logger.warning("Deep scan failed for %s: %s", p_url, e)
-                        time.sleep(random.uniform(8, 15))  # Longer delay on error
+                        get_host_scheduler().back_off(p_url, random.uniform(8, 15))  # Longer pause on error
 
             logger.info("Discovery complete. Total unique reviews found (interleaved): %d", len(interleaved_reviews))
             
@@ -1134,47 +1363,139 @@ async def run_once_async(config: Config, dry_run: bool, run_id: Optional[str] =
             config.max_new_reviews_per_loop,
             config.retry_failed_sources,
             config.max_source_retries,
+            None if dry_run else config.source_lease_seconds,
         )
+        new_sources = await _drop_ingested_sources(new_sources, existing_reviews, supabase, dry_run, logger)
         if len(new_sources) > remaining_daily:
             new_sources = new_sources[:remaining_daily]
 
+    sources_claimed = False
+    leases: Optional[SourceLeases] = None
+    if new_sources and not dry_run:
+        claimed = await asyncio.to_thread(
+            claim_sources,
+            supabase,
+            config.worker_id,
+            len(new_sources),
+            config.source_lease_seconds,
+            config.retry_failed_sources,
+            config.max_source_retries,
+            [item["source_url"] for item in new_sources],
+            logger,
+        )
+        if claimed is not None:
+            if len(claimed) < len(new_sources):
+                logger.info("Claimed %d/%d sources; the rest were taken by another ingestor", len(claimed), len(new_sources))
+            new_sources = claimed
+            sources_claimed = True
+            leases = SourceLeases(supabase, config.worker_id, config.source_lease_seconds, logger)
+            leases.track([item["source_url"] for item in claimed])
+
     logger.info("Items to process: %d", len(new_sources))
-    
-    # Sequential processing with delays for gentle proxy usage
-    successful = 0
-    failed = 0
-    
+
     # Initialize AI Match Cache for this run
     ai_match_cache: Dict[str, Optional[int]] = {}
-    semaphore = asyncio.Semaphore(1)
 
-    for idx, item in enumerate(new_sources):
-        logger.info("Processing item %d/%d", idx + 1, len(new_sources))
-        
-        try:
-            result = await _process_review_item_async(
-                item, http, supabase, groq, uploader, profile_pool, category_map, category_name_map, parent_map, ai_match_cache, config, logger, dry_run, product_map, semaphore
+    # Discovery above stays on the blocking client; review items share one async session
+    item_http = AsyncHttpClient(http, config.source_fetch_concurrency + config.r2_concurrency) if config.http_async_client else http
+    if isinstance(item_http, AsyncHttpClient):
+        resources.push_async_callback(item_http.aclose)
+
+    run = ReviewRunContext(
+        http=item_http,
+        supabase=supabase,
+        groq=groq,
+        uploader=uploader,
+        profile_pool=profile_pool,
+        category_map=category_map,
+        category_name_map=category_name_map,
+        parent_map=parent_map,
+        ai_match_cache=ai_match_cache,
+        config=config,
+        logger=logger,
+        dry_run=dry_run,
+        product_map=product_map,
+        daily_counter=daily_counter,
+        state_buffer=SourceStateBuffer(
+            supabase, logger, config.state_flush_every, config.state_flush_seconds, leases=leases
+        ),
+        sources_claimed=sources_claimed,
+        existing_reviews=existing_reviews,
+    )
+
+    async def _process(item: Dict[str, str]) -> bool:
+        return await _process_review_item_async(item, run)
+
+    lease_task = asyncio.create_task(leases.keep_alive()) if leases is not None else None
+    try:
+        if config.pipeline_mode == "sequential":
+            # One item at a time; source requests are paced by the host scheduler
+            successful, failed = await run_items_sequential(new_sources, _process, logger)
+        elif config.pipeline_mode == "staged":
+            stage_sizes = parse_stage_workers(
+                config.pipeline_stages,
+                {
+                    "fetch": config.source_fetch_concurrency,
+                    "parse": 2,
+                    "translate": config.max_concurrent_tasks,
+                    "persist": 2,
+                },
             )
-            if result:
-                successful += 1
-            else:
-                failed += 1
-        except Exception as e:
-            logger.error("Unexpected error processing item: %s", e)
-            failed += 1
-        
-        # Wait 5 seconds between items to be gentle on proxy
-        if idx < len(new_sources) - 1:
-            logger.info("Waiting 5 seconds before next item...")
-            await asyncio.sleep(5)
-    
+            stages = [
+                StageSpec(name, _guard_stage(handler, run), *stage_sizes[name])
+                for name, handler in REVIEW_STAGES
+            ]
+            successful, failed = await run_items_staged(
+                new_sources, stages, lambda item: ReviewWorkItem(item=item), logger
+            )
+        else:
+            logger.info(
+                "Concurrent pipeline: %d items in flight (source=%d, llm=%d, db=%d, r2=%d)",
+                config.max_concurrent_tasks,
+                config.source_fetch_concurrency,
+                config.llm_concurrency,
+                config.db_concurrency,
+                config.r2_concurrency,
+            )
+            successful, failed = await run_items_concurrent(
+                new_sources, _process, config.max_concurrent_tasks, logger
+            )
+    finally:
+        # Whatever the pipeline got through must reach source_map, also on shutdown or error
+        try:
+            await asyncio.to_thread(run.state_buffer.flush)
+        except Exception as exc:
+            logger.error("Failed to flush source_map states: %s", exc)
+        if lease_task is not None:
+            lease_task.cancel()
+            try:
+                released = await asyncio.to_thread(leases.release_unfinished)
+                if released:
+                    logger.info("Released %d claimed sources that were not finished", released)
+            except Exception as exc:
+                logger.warning("Failed to release source leases (they expire on their own): %s", exc)
+
     logger.info("Processing complete: %d successful, %d failed", successful, failed)
+    logger.info("Daily count: %d/%d", daily_counter.count, config.daily_review_limit)
+    logger.info("Source state writes: %s", run.state_buffer.get_stats())
+    logger.info("DB round-trips: %s", supabase.get_round_trips())
+    logger.info("DB latency: %s", supabase.get_latency_stats())
+    if llm_cache is not None:
+        logger.info("LLM cache: %s", llm_cache.get_stats())
+    if http_cache is not None:
+        logger.info("HTTP cache: %s", http_cache.get_stats())
+    logger.info("LLM scheduler: %s", llm_scheduler.get_status())
+    logger.info("Host pacing: %s", host_scheduler.get_status())
 
 
 async def main_async() -> None:
     parser = argparse.ArgumentParser(description="iRecommend ingestor (Async)")
     parser.add_argument("--once", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--stages",
+        help='Run the staged pipeline with these worker counts, e.g. "fetch=1,parse=2,translate=4:8,persist=2"',
+    )
     args = parser.parse_args()
 
     # Setup graceful shutdown handler
@@ -1182,6 +1503,8 @@ async def main_async() -> None:
     stats = get_stats()
     
     config = Config.from_env()
+    if args.stages:
+        config = replace(config, pipeline_mode="staged", pipeline_stages=args.stages)
     if args.once:
         await run_once_async(config, args.dry_run)
     else:
@@ -1190,8 +1513,8 @@ async def main_async() -> None:
             logger = setup_logging(config.log_file, run_id=run_id)
             start = datetime.now(timezone.utc)
             try:
+                # Per-item outcomes are recorded in stats by the pipeline runners
                 await run_once_async(config, args.dry_run, run_id=run_id)
-                stats.record_success()
             except Exception as e:
                 logger.error("Loop error: %s", e)
                 stats.record_failure(str(e))
@@ -1,16 +1,131 @@
+"""
+Image downloads for the review and product galleries.
+
+Bodies are streamed instead of read in one go:
+- a Content-Type that is not an image, or a Content-Length over the cap, is rejected before the body
+- the download is aborted once it passes `max_bytes`
+- PIL reads the dimensions from the first chunks (Image.open is lazy), so avatars and
+  icons that process_image would drop anyway are abandoned after a few KB
+"""
+
 import logging
+from io import BytesIO
 from typing import Optional
 
-from ..http_client import HttpClient
+from PIL import Image
+
+from ..http_client import AsyncHttpClient, HttpClient
+from .image_process import MIN_IMAGE_SIDE
+
+DEFAULT_MAX_IMAGE_BYTES = 15 * 1024 * 1024
+# Give up on the early size check after this much data (process_image still checks)
+SNIFF_LIMIT_BYTES = 64 * 1024
+# Some CDNs label every file as binary
+_GENERIC_CONTENT_TYPES = ("application/octet-stream", "binary/octet-stream")
+
+
+def _accept_headers(response, url: str, max_bytes: int, logger: logging.Logger) -> bool:
+    if response.status_code != 200:
+        logger.warning("Image fetch failed %s: %s", response.status_code, url)
+        return False
+    headers = response.headers or {}
+    content_type = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    if content_type and not content_type.startswith("image/") and content_type not in _GENERIC_CONTENT_TYPES:
+        logger.warning("Image fetch skipped, content type %s: %s", content_type, url)
+        return False
+    length = headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        logger.warning("Image fetch skipped, %s bytes over the %d byte cap: %s", length, max_bytes, url)
+        return False
+    return True
+
+
+def _too_small(head: bytearray) -> Optional[bool]:
+    """True/False once PIL can read the dimensions from the data so far, None while it needs more."""
+    try:
+        with Image.open(BytesIO(head)) as img:
+            width, height = img.size
+    except Exception:
+        return None
+    return width < MIN_IMAGE_SIDE and height < MIN_IMAGE_SIDE
+
+
+class _ImageBuffer:
+    def __init__(self, url: str, max_bytes: int, logger: logging.Logger) -> None:
+        self.url = url
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.data = bytearray()
+        self.sniffed = False
+
+    def add(self, chunk: bytes) -> bool:
+        """Append a chunk; False means abort the download."""
+        self.data += chunk
+        if len(self.data) > self.max_bytes:
+            self.logger.warning("Image fetch aborted, over the %d byte cap: %s", self.max_bytes, self.url)
+            return False
+        if not self.sniffed:
+            small = _too_small(self.data)
+            self.sniffed = small is not None or len(self.data) >= SNIFF_LIMIT_BYTES
+            if small:
+                self.logger.debug("Image fetch aborted, smaller than %dpx: %s", MIN_IMAGE_SIDE, self.url)
+                return False
+        return True
+
+    def content(self) -> Optional[bytes]:
+        return bytes(self.data) or None
+
+
+def fetch_image(
+    http: HttpClient,
+    url: str,
+    logger: logging.Logger,
+    max_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+) -> Optional[bytes]:
+    try:
+        response = http.get(url, stream=True)
+        try:
+            if not _accept_headers(response, url, max_bytes, logger):
+                return None
+            buffer = _ImageBuffer(url, max_bytes, logger)
+            for chunk in response.iter_content():
+                if chunk and not buffer.add(chunk):
+                    return None
+            return buffer.content()
+        finally:
+            response.close()
+    except Exception as exc:
+        logger.warning("Image fetch error for %s: %s", url, exc)
+        return None
 
 
-def fetch_image(http: HttpClient, url: str, logger: logging.Logger) -> Optional[bytes]:
+async def fetch_image_async(
+    http: AsyncHttpClient,
+    url: str,
+    logger: logging.Logger,
+    max_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+) -> Optional[bytes]:
     try:
-        response = http.get(url)
-        if response.status_code != 200:
-            logger.warning("Image fetch failed %s: %s", response.status_code, url)
-            return None
-        return response.content
+        response = await http.get(url, stream=True)
+        try:
+            if not _accept_headers(response, url, max_bytes, logger):
+                return None
+            buffer = _ImageBuffer(url, max_bytes, logger)
+            if hasattr(response, "aiter_content"):
+                async for chunk in response.aiter_content():
+                    if chunk and not buffer.add(chunk):
+                        return None
+            else:
+                # Cloudscraper fallback: the body is already in memory
+                for chunk in response.iter_content(SNIFF_LIMIT_BYTES):
+                    if chunk and not buffer.add(chunk):
+                        return None
+            return buffer.content()
+        finally:
+            if hasattr(response, "aclose"):
+                await response.aclose()
+            else:
+                response.close()
     except Exception as exc:
         logger.warning("Image fetch error for %s: %s", url, exc)
         return None
@@ -0,0 +1,112 @@
+"""
+Process pool for process_image.
+
+Decode, crop, LANCZOS resize, watermark compositing and WebP encoding
+(method=6) are CPU-bound; in asyncio.to_thread they share one GIL, so the
+images of a review were processed one core at a time. ImageWorkerPool runs
+them in worker processes instead. Only the raw download and the encoded WebP
+cross the process boundary, both as plain bytes (a single buffer copy each
+way); no PIL objects are pickled.
+
+workers=1 keeps the old in-thread behaviour, 0 means one worker per core.
+Until configure_image_pool is called the shared pool runs in threads.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional
+
+from .image_process import process_image
+
+
+def default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+class ImageWorkerPool:
+    """
+    Usage:
+        pool = configure_image_pool(workers=0, logger=logger)
+        webp = await get_image_pool().process(raw, 0.15, 1600, 82, "UserReview.net")
+        pool.shutdown()
+    """
+
+    def __init__(self, workers: int = 0, logger: Optional[logging.Logger] = None) -> None:
+        self.workers = workers if workers > 0 else default_workers()
+        self.logger = logger or logging.getLogger(__name__)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        # Started on first use: runs without images never spawn workers
+        if self._executor is None and self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _on_broken(self, exc: Exception) -> None:
+        # A worker died (OOM on a huge image, killed): fall back to threads for the rest of the run
+        self.logger.warning("Image worker pool broken (%s); processing in threads from now on", exc)
+        self.shutdown()
+        self.workers = 1
+
+    async def process(
+        self,
+        image_bytes: bytes,
+        crop_right_pct: float,
+        max_width: int,
+        webp_quality: int,
+        watermark_text: Optional[str] = "userreview.net",
+    ) -> Optional[bytes]:
+        """Same arguments and result as process_image, run in a worker process."""
+        args = (image_bytes, crop_right_pct, max_width, webp_quality, watermark_text)
+        executor = self._get_executor()
+        if executor is None:
+            return await asyncio.to_thread(process_image, *args)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, process_image, *args)
+        except BrokenProcessPool as exc:
+            self._on_broken(exc)
+            return await asyncio.to_thread(process_image, *args)
+
+    def map(
+        self,
+        images: List[bytes],
+        crop_right_pct: float,
+        max_width: int,
+        webp_quality: int,
+        watermark_text: Optional[str] = "userreview.net",
+    ) -> Iterator[Optional[bytes]]:
+        """Process many images with the same settings, results in input order (bulk re-processing)."""
+        executor = self._get_executor()
+        if executor is None:
+            return (process_image(image, crop_right_pct, max_width, webp_quality, watermark_text) for image in images)
+        count = len(images)
+        return executor.map(
+            process_image,
+            images,
+            [crop_right_pct] * count,
+            [max_width] * count,
+            [webp_quality] * count,
+            [watermark_text] * count,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_image_pool = ImageWorkerPool(workers=1)
+
+def get_image_pool() -> ImageWorkerPool:
+    return _image_pool
+
+def configure_image_pool(workers: int, logger: Optional[logging.Logger] = None) -> ImageWorkerPool:
+    """Replace the shared pool (shutting down the previous one)."""
+    global _image_pool
+    _image_pool.shutdown()
+    _image_pool = ImageWorkerPool(workers, logger)
+    return _image_pool
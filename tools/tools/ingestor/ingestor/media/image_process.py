@@ -3,6 +3,9 @@ from typing import Optional
 
 from PIL import Image, ImageDraw, ImageFont
 
+# Images smaller than this on both sides are avatars/icons and are dropped
+MIN_IMAGE_SIDE = 250
+
 
 def process_image(
     image_bytes: bytes,
@@ -18,7 +21,7 @@ def process_image(
         width, height = img.size
         
         # Filter out tiny images (avatars/icons usually < 200px)
-        if width < 250 and height < 250:
+        if width < MIN_IMAGE_SIDE and height < MIN_IMAGE_SIDE:
             return None
 
         new_width = int(width * (1 - crop_right_pct))
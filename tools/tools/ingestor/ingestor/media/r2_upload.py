@@ -6,6 +6,8 @@ import boto3
 
 from botocore.config import Config as BotoConfig
 
+from ..stability import get_r2_limiter
+
 
 class R2Uploader:
     def __init__(
@@ -38,13 +40,14 @@ class R2Uploader:
 
 
     def upload_bytes(self, key: str, data: bytes, content_type: str = "image/webp") -> str:
-        self.client.put_object(
-            Bucket=self.bucket,
-            Key=key,
-            Body=data,
-            ContentType=content_type,
-            CacheControl="public, max-age=31536000",
-        )
+        with get_r2_limiter():
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=data,
+                ContentType=content_type,
+                CacheControl="public, max-age=31536000",
+            )
         url = f"{self.public_base_url}/{key}"
         self.logger.info("Uploaded image %s", url)
         return url
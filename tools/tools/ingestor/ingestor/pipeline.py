@@ -0,0 +1,319 @@
+"""
+Item runners for the ingestor.
+- Sequential loop: one item at a time (optionally with a fixed pause between items)
+- Concurrent mode: several items in flight, each resource capped by its own limiter
+- Staged mode: fetch -> parse -> translate -> persist workers linked by bounded queues
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .stability import ConcurrencyLimiterRegistry, GracefulShutdown, get_stats
+
+ItemProcessor = Callable[[Dict[str, Any]], Awaitable[bool]]
+StageHandler = Callable[[Any], Awaitable[bool]]
+
+# Pause between items in sequential mode. Off by default: source-site requests
+# are spaced by the per-host scheduler, other hosts need no pause
+SEQUENTIAL_ITEM_DELAY_SECONDS = 0.0
+
+
+async def _run_item(
+    idx: int,
+    total: int,
+    item: Dict[str, Any],
+    process: ItemProcessor,
+    logger: logging.Logger,
+) -> bool:
+    stats = get_stats()
+    logger.info("Processing item %d/%d", idx + 1, total)
+    try:
+        result = await process(item)
+    except Exception as e:
+        logger.error("Unexpected error processing item: %s", e)
+        stats.record_failure(str(e))
+        return False
+    if result:
+        stats.record_success()
+    else:
+        stats.record_failure(f"Item failed: {item.get('source_url')}")
+    return bool(result)
+
+
+async def run_items_sequential(
+    items: List[Dict[str, Any]],
+    process: ItemProcessor,
+    logger: logging.Logger,
+    item_delay_seconds: float = SEQUENTIAL_ITEM_DELAY_SECONDS,
+) -> Tuple[int, int]:
+    """Process items one after another. Returns (successful, failed)."""
+    shutdown = GracefulShutdown.get_instance()
+    successful = 0
+    failed = 0
+    for idx, item in enumerate(items):
+        if shutdown.should_stop:
+            logger.info("Shutdown requested, leaving %d items for the next run", len(items) - idx)
+            break
+        if await _run_item(idx, len(items), item, process, logger):
+            successful += 1
+        else:
+            failed += 1
+
+        # Optional fixed pause on top of the per-host pacing
+        if idx < len(items) - 1 and item_delay_seconds > 0:
+            logger.info("Waiting %.0f seconds before next item...", item_delay_seconds)
+            await asyncio.sleep(item_delay_seconds)
+    return successful, failed
+
+
+async def run_items_concurrent(
+    items: List[Dict[str, Any]],
+    process: ItemProcessor,
+    max_in_flight: int,
+    logger: logging.Logger,
+) -> Tuple[int, int]:
+    """
+    Process up to `max_in_flight` items at once. Returns (successful, failed).
+
+    Politeness towards the source site is kept by the "source" limiter inside
+    HttpClient, so LLM, DB and R2 work of one item overlaps the fetch of the next.
+    """
+    shutdown = GracefulShutdown.get_instance()
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def _guarded(idx: int, item: Dict[str, Any]) -> Optional[bool]:
+        async with semaphore:
+            if shutdown.should_stop:
+                return None
+            return await _run_item(idx, len(items), item, process, logger)
+
+    results = await asyncio.gather(*[_guarded(idx, item) for idx, item in enumerate(items)])
+    successful = sum(1 for r in results if r is True)
+    failed = sum(1 for r in results if r is False)
+    skipped = sum(1 for r in results if r is None)
+    if skipped:
+        logger.info("Shutdown requested, left %d items for the next run", skipped)
+    logger.info("Resource limits: %s", ConcurrencyLimiterRegistry.get_all_status())
+    return successful, failed
+
+
+# ============================================================================
+# STAGED PIPELINE
+# ============================================================================
+@dataclass
+class StageSpec:
+    """
+    One pipeline stage.
+
+    The handler receives the work object produced by `make_work` and returns
+    True to pass it to the next stage, or False when the item is finished
+    (skipped or failed). The final outcome is read from `work.result`.
+    """
+    name: str
+    handler: StageHandler
+    workers: int = 1
+    queue_size: int = 0  # 0 means 2 slots per worker
+
+
+@dataclass
+class StageMetrics:
+    """Per-stage counters for the staged pipeline."""
+    name: str
+    workers: int
+    queue_size: int
+    processed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+    put_wait_seconds: float = 0.0  # upstream time spent blocked on this full queue
+    max_depth: int = 0
+
+    def record(self, elapsed: float) -> None:
+        self.processed += 1
+        self.busy_seconds += elapsed
+        self.max_latency_seconds = max(self.max_latency_seconds, elapsed)
+
+    def get_status(self, depth: int = 0) -> dict:
+        avg_latency = self.busy_seconds / self.processed if self.processed else 0.0
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "queue_size": self.queue_size,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "avg_latency_seconds": round(avg_latency, 2),
+            "max_latency_seconds": round(self.max_latency_seconds, 2),
+            "backpressure_seconds": round(self.put_wait_seconds, 2),
+        }
+
+
+@dataclass
+class _StagedItem:
+    idx: int
+    item: Dict[str, Any]
+    work: Any
+    started: float = field(default_factory=time.perf_counter)
+
+
+_STOP = object()
+
+
+def parse_stage_workers(spec: Optional[str], defaults: Dict[str, int]) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse a stage sizing string like "fetch=1,parse=2,translate=4:8,persist=2".
+
+    Each entry is `name=workers` or `name=workers:queue_size`. Stages that are
+    not mentioned keep their default worker count. Returns {name: (workers, queue_size)}.
+    """
+    sizes = {name: (max(1, workers), 0) for name, workers in defaults.items()}
+    if not spec:
+        return sizes
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, sep, value = part.partition("=")
+        name = name.strip().lower()
+        if not sep or name not in sizes:
+            raise ValueError(f"Invalid stage spec '{part}' (stages: {', '.join(sizes)})")
+        workers_raw, _, queue_raw = value.partition(":")
+        sizes[name] = (max(1, int(workers_raw)), max(0, int(queue_raw or 0)))
+    return sizes
+
+
+async def run_items_staged(
+    items: List[Dict[str, Any]],
+    stages: List[StageSpec],
+    make_work: Callable[[Dict[str, Any]], Any],
+    logger: logging.Logger,
+    monitor_interval_seconds: float = 30.0,
+) -> Tuple[int, int]:
+    """
+    Push items through `stages`, each with its own worker pool and bounded input
+    queue. Returns (successful, failed).
+
+    A slow stage only fills its own queue; once it is full the upstream workers
+    block on put, which is reported as that stage's backpressure time.
+    """
+    shutdown = GracefulShutdown.get_instance()
+    stats = get_stats()
+    total = len(items)
+    metrics = []
+    queues: List[asyncio.Queue] = []
+    for spec in stages:
+        workers = max(1, spec.workers)
+        queue_size = spec.queue_size or workers * 2
+        metrics.append(StageMetrics(spec.name, workers, queue_size))
+        queues.append(asyncio.Queue(maxsize=queue_size))
+    counts = {"successful": 0, "failed": 0, "skipped": 0}
+
+    def _status() -> List[dict]:
+        return [m.get_status(q.qsize()) for m, q in zip(metrics, queues)]
+
+    def _finish(staged: _StagedItem, ok: bool) -> None:
+        source_url = staged.item.get("source_url")
+        if ok:
+            counts["successful"] += 1
+            stats.record_success()
+        else:
+            counts["failed"] += 1
+            stats.record_failure(f"Item failed: {source_url}")
+        logger.info(
+            "Item %d/%d finished (%s) in %.1fs: %s",
+            staged.idx + 1,
+            total,
+            "ok" if ok else "failed",
+            time.perf_counter() - staged.started,
+            source_url,
+        )
+
+    async def _put(stage_idx: int, value: Any) -> None:
+        queue = queues[stage_idx]
+        started = time.perf_counter()
+        await queue.put(value)
+        stage_metrics = metrics[stage_idx]
+        stage_metrics.put_wait_seconds += time.perf_counter() - started
+        stage_metrics.max_depth = max(stage_metrics.max_depth, queue.qsize())
+
+    async def _feed() -> None:
+        for idx, item in enumerate(items):
+            if shutdown.should_stop:
+                counts["skipped"] = total - idx
+                logger.info("Shutdown requested, leaving %d items for the next run", total - idx)
+                return
+            await _put(0, _StagedItem(idx, item, make_work(item)))
+
+    async def _worker(stage_idx: int) -> None:
+        spec = stages[stage_idx]
+        stage_metrics = metrics[stage_idx]
+        queue = queues[stage_idx]
+        is_last = stage_idx == len(stages) - 1
+        while True:
+            staged = await queue.get()
+            if staged is _STOP:
+                return
+            started = time.perf_counter()
+            try:
+                proceed = await spec.handler(staged.work)
+            except Exception as e:
+                stage_metrics.errors += 1
+                logger.error("Unexpected error in stage %s: %s", spec.name, e)
+                _finish(staged, False)
+                continue
+            finally:
+                elapsed = time.perf_counter() - started
+            stage_metrics.record(elapsed)
+            if proceed and not is_last:
+                await _put(stage_idx + 1, staged)
+                continue
+            if not proceed:
+                stage_metrics.dropped += 1
+            result = getattr(staged.work, "result", None)
+            _finish(staged, bool(proceed) if result is None else bool(result))
+
+    async def _monitor() -> None:
+        while True:
+            await asyncio.sleep(monitor_interval_seconds)
+            logger.info(
+                "Pipeline queues: %s",
+                ", ".join(f"{s['name']}={s['depth']}/{s['queue_size']}" for s in _status()),
+            )
+
+    logger.info(
+        "Staged pipeline: %s",
+        " -> ".join(f"{m.name}[{m.workers}]" for m in metrics),
+    )
+    worker_groups = [
+        [asyncio.create_task(_worker(stage_idx)) for _ in range(metrics[stage_idx].workers)]
+        for stage_idx in range(len(stages))
+    ]
+    monitor = asyncio.create_task(_monitor()) if monitor_interval_seconds > 0 else None
+    try:
+        await _feed()
+        # Drain stage by stage: a stage gets its stop signals only after
+        # every upstream worker has handed over its last item.
+        for stage_idx, group in enumerate(worker_groups):
+            for _ in group:
+                await queues[stage_idx].put(_STOP)
+            await asyncio.gather(*group)
+    finally:
+        # On an error (or cancellation) in _feed the workers are still blocked on
+        # their queues; cancel them so no task outlives the run
+        tasks = [task for group in worker_groups for task in group]
+        if monitor is not None:
+            tasks.append(monitor)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    for status in _status():
+        logger.info("Stage stats: %s", status)
+    logger.info("Resource limits: %s", ConcurrencyLimiterRegistry.get_all_status())
+    return counts["successful"], counts["failed"]
@@ -3,15 +3,23 @@ Stability enhancements for the ingestor bot.
 - Graceful shutdown handling
 - Circuit breaker pattern for API resilience
 - Rate limiting
+- Priority request scheduling on top of the rate limiters
+- Per-host pacing of outgoing HTTP requests
+- Per-resource concurrency limits
 """
 
 import os
 import time
+import heapq
 import signal
+import asyncio
+import random
+import itertools
 import threading
 from typing import Optional, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
+from urllib.parse import urlparse
 
 
 # ============================================================================
@@ -230,6 +238,442 @@ class TokenBucketRateLimiter:
             needed = tokens - self.tokens
             return needed / (self.requests_per_minute / 60.0)
 
+    def consume(self, tokens: float) -> None:
+        """Debit tokens unconditionally (may go negative); a negative value refunds."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(float(self.requests_per_minute), self.tokens - tokens)
+
+
+# ============================================================================
+# REQUEST SCHEDULER
+# ============================================================================
+class _ScheduledCall:
+    __slots__ = ("cost", "priority", "granted", "cancelled", "queued_at", "event", "future", "loop")
+
+    def __init__(self, cost: int, priority: int):
+        self.cost = cost
+        self.priority = priority
+        self.granted = False
+        self.cancelled = False
+        self.queued_at = time.time()
+        self.event: Optional[threading.Event] = None
+        self.future: Optional[asyncio.Future] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        if self.future is not None and self.loop is not None:
+            self.loop.call_soon_threadsafe(_resolve_future, self.future)
+
+
+def _resolve_future(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class PriorityRateScheduler:
+    """
+    Admits calls in priority order (lower value first) while keeping inside a
+    requests-per-minute and a tokens-per-minute budget.
+
+    Works for both worker threads (acquire) and coroutines (acquire_async), so
+    the blocking and the async LLM clients share one budget.
+
+    Usage:
+        scheduler = PriorityRateScheduler("llm", requests_per_minute=30, tokens_per_minute=6000)
+        waited = await scheduler.acquire_async(cost=estimated_tokens, priority=0)
+    """
+    # Upper bound for one sleep, so waiters re-check after other threads refill/grant
+    _MAX_POLL_SECONDS = 1.0
+
+    def __init__(self, name: str, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.name = name
+        self.requests = TokenBucketRateLimiter(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucketRateLimiter(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        # Metrics
+        self.total_granted = 0
+        self.total_cost = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.wait_by_priority: dict = {}
+
+    def _clamp_cost(self, cost: int) -> int:
+        cost = max(0, int(cost))
+        if self.tokens is not None:
+            cost = min(cost, self.tokens.requests_per_minute)
+        return cost
+
+    def _pump_locked(self) -> float:
+        """Grant queued calls from the head while budget allows. Returns seconds until the head fits."""
+        while self._heap:
+            _, _, call = self._heap[0]
+            if call.cancelled:
+                heapq.heappop(self._heap)
+                continue
+            wait = 0.0
+            if self.requests is not None:
+                wait = max(wait, self.requests.time_until_available(1))
+            if self.tokens is not None and call.cost:
+                wait = max(wait, self.tokens.time_until_available(call.cost))
+            if wait > 0:
+                return wait
+            if self.requests is not None:
+                self.requests.acquire(1)
+            if self.tokens is not None and call.cost:
+                self.tokens.acquire(call.cost)
+            heapq.heappop(self._heap)
+            call.granted = True
+            self._record_locked(call)
+            call.wake()
+        return 0.0
+
+    def _record_locked(self, call: _ScheduledCall):
+        waited = time.time() - call.queued_at
+        self.total_granted += 1
+        self.total_cost += call.cost
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        count, total = self.wait_by_priority.get(call.priority, (0, 0.0))
+        self.wait_by_priority[call.priority] = (count + 1, total + waited)
+
+    def _enqueue(self, call: _ScheduledCall) -> float:
+        with self._lock:
+            heapq.heappush(self._heap, (call.priority, next(self._seq), call))
+            return self._pump_locked()
+
+    def _poll(self) -> float:
+        with self._lock:
+            return self._pump_locked()
+
+    def acquire(self, cost: int = 0, priority: int = 0) -> float:
+        """Block the calling thread until admitted. Returns seconds spent queued."""
+        call = _ScheduledCall(self._clamp_cost(cost), priority)
+        call.event = threading.Event()
+        delay = self._enqueue(call)
+        while not call.granted:
+            call.event.wait(min(max(delay, 0.01), self._MAX_POLL_SECONDS))
+            if not call.granted:
+                delay = self._poll()
+        return time.time() - call.queued_at
+
+    async def acquire_async(self, cost: int = 0, priority: int = 0) -> float:
+        """Wait on the event loop until admitted. Returns seconds spent queued."""
+        call = _ScheduledCall(self._clamp_cost(cost), priority)
+        call.loop = asyncio.get_running_loop()
+        call.future = call.loop.create_future()
+        delay = self._enqueue(call)
+        try:
+            while not call.granted:
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(call.future),
+                        timeout=min(max(delay, 0.01), self._MAX_POLL_SECONDS),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                if not call.granted:
+                    delay = self._poll()
+        except asyncio.CancelledError:
+            call.cancelled = True
+            raise
+        return time.time() - call.queued_at
+
+    def settle(self, estimated_cost: int, actual_cost: int) -> None:
+        """Correct the token budget once the real usage of an admitted call is known."""
+        if self.tokens is not None and actual_cost:
+            self.tokens.consume(actual_cost - self._clamp_cost(estimated_cost))
+
+    def get_status(self) -> dict:
+        with self._lock:
+            avg_wait = self.total_wait_seconds / self.total_granted if self.total_granted else 0.0
+            return {
+                "name": self.name,
+                "rpm": self.requests.requests_per_minute if self.requests else None,
+                "tpm": self.tokens.requests_per_minute if self.tokens else None,
+                "queued": len(self._heap),
+                "granted": self.total_granted,
+                "estimated_tokens": self.total_cost,
+                "avg_wait_seconds": round(avg_wait, 2),
+                "max_wait_seconds": round(self.max_wait_seconds, 2),
+                "avg_wait_by_priority": {
+                    priority: round(total / count, 2)
+                    for priority, (count, total) in sorted(self.wait_by_priority.items())
+                },
+            }
+
+
+_llm_scheduler = PriorityRateScheduler("llm")
+
+def get_llm_scheduler() -> PriorityRateScheduler:
+    return _llm_scheduler
+
+def configure_llm_scheduler(requests_per_minute: int, tokens_per_minute: int) -> PriorityRateScheduler:
+    """Replace the shared LLM scheduler (call before any LLM traffic starts)."""
+    global _llm_scheduler
+    _llm_scheduler = PriorityRateScheduler("llm", requests_per_minute, tokens_per_minute)
+    return _llm_scheduler
+
+
+# ============================================================================
+# HOST PACING
+# ============================================================================
+# host=seconds or host=min-max; the longest matching host suffix wins, 0 = no pacing.
+# Hosts without a rule (our R2 bucket, APIs) are never delayed. HttpClient only paces
+# page requests; streamed image downloads skip the scheduler even on the source host.
+DEFAULT_HOST_INTERVALS = "irecommend.ru=4-8"
+
+
+def parse_host_intervals(spec: str) -> dict:
+    """"irecommend.ru=4-8,i.example.com=0" -> {"irecommend.ru": (4.0, 8.0), "i.example.com": (0.0, 0.0)}."""
+    rules = {}
+    for part in (spec or "").split(","):
+        host, sep, value = part.strip().partition("=")
+        host = host.strip().lower()
+        if not sep or not host:
+            continue
+        low, _, high = value.partition("-")
+        try:
+            low_seconds = max(0.0, float(low))
+            high_seconds = max(low_seconds, float(high)) if high else low_seconds
+        except ValueError:
+            continue
+        rules[host] = (low_seconds, high_seconds)
+    return rules
+
+
+class HostScheduler:
+    """
+    Keeps a minimum interval between request starts to the same host.
+
+    Each request reserves the next free slot of its host, so concurrent callers
+    are spaced out instead of all sleeping the same fixed amount. Works for
+    worker threads (wait) and coroutines (wait_async).
+
+    Usage:
+        scheduler = HostScheduler(parse_host_intervals("irecommend.ru=4-8"))
+        scheduler.wait(url)          # before each request
+        scheduler.back_off(url, 10)  # after a failure: push the host's next slot out
+    """
+
+    def __init__(self, intervals: Optional[dict] = None):
+        self.intervals = dict(intervals or {})
+        self._next_slot: dict = {}
+        self._lock = threading.Lock()
+        # Metrics per paced host: [requests, total wait, max wait]
+        self._waits: dict = {}
+
+    def _rule_for(self, host: str) -> Optional[str]:
+        best = None
+        for rule in self.intervals:
+            if host == rule or host.endswith("." + rule):
+                if best is None or len(rule) > len(best):
+                    best = rule
+        return best
+
+    def _host_key(self, url: str) -> Optional[str]:
+        host = (urlparse(url).hostname or "").lower()
+        rule = self._rule_for(host) if host else None
+        if rule is None or self.intervals[rule][1] <= 0:
+            return None
+        return rule
+
+    def reserve(self, url: str) -> float:
+        """Claim the next slot for the URL's host. Returns seconds to wait before sending."""
+        key = self._host_key(url)
+        if key is None:
+            return 0.0
+        low, high = self.intervals[key]
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._next_slot.get(key, 0.0))
+            self._next_slot[key] = slot + random.uniform(low, high)
+            delay = slot - now
+            stats = self._waits.setdefault(key, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += delay
+            stats[2] = max(stats[2], delay)
+        return delay
+
+    def wait(self, url: str) -> float:
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, url: str) -> float:
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def back_off(self, url: str, seconds: float) -> None:
+        """Delay the next request to this host by at least `seconds` from now (no-op for unpaced hosts)."""
+        key = self._host_key(url)
+        if key is None:
+            return
+        with self._lock:
+            self._next_slot[key] = max(self._next_slot.get(key, 0.0), time.time() + seconds)
+
+    def get_status(self) -> dict:
+        status = {}
+        with self._lock:
+            for host, (low, high) in self.intervals.items():
+                if high <= 0:
+                    continue
+                count, total_wait, max_wait = self._waits.get(host, (0, 0.0, 0.0))
+                status[host] = {
+                    "interval": f"{low:g}-{high:g}s",
+                    "requests": count,
+                    "avg_wait_seconds": round(total_wait / count, 2) if count else 0.0,
+                    "max_wait_seconds": round(max_wait, 2),
+                }
+        return status
+
+
+_host_scheduler = HostScheduler(parse_host_intervals(DEFAULT_HOST_INTERVALS))
+
+def get_host_scheduler() -> HostScheduler:
+    return _host_scheduler
+
+def configure_host_scheduler(spec: str) -> HostScheduler:
+    """Replace the shared host scheduler (call before any HTTP traffic starts)."""
+    global _host_scheduler
+    _host_scheduler = HostScheduler(parse_host_intervals(spec))
+    return _host_scheduler
+
+
+# ============================================================================
+# CONCURRENCY LIMITS
+# ============================================================================
+@dataclass
+class ConcurrencyLimiter:
+    """
+    Caps how many calls to a shared resource run at the same time.
+
+    Blocking client calls run in worker threads (asyncio.to_thread), so this
+    wraps a threading semaphore rather than an asyncio one.
+
+    Usage:
+        with get_llm_limiter():
+            response = api_call()
+
+        async with get_source_limiter():  # from async clients
+            response = await session.get(url)
+    """
+    name: str
+    limit: int = 1
+
+    # Internal state
+    in_flight: int = field(default=0, repr=False)
+    peak_in_flight: int = field(default=0, repr=False)
+    total_calls: int = field(default=0, repr=False)
+    total_wait_seconds: float = field(default=0.0, repr=False)
+    _semaphore: threading.BoundedSemaphore = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self.limit = max(1, int(self.limit))
+        self._semaphore = threading.BoundedSemaphore(self.limit)
+
+    def __enter__(self) -> "ConcurrencyLimiter":
+        started = time.time()
+        self._semaphore.acquire()
+        waited = time.time() - started
+        with self._lock:
+            self.in_flight += 1
+            self.total_calls += 1
+            self.total_wait_seconds += waited
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+        return False
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        # Same slots as the threaded callers; poll instead of parking a thread on
+        # the semaphore, so a cancelled task never ends up holding a slot
+        started = time.time()
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        waited = time.time() - started
+        with self._lock:
+            self.in_flight += 1
+            self.total_calls += 1
+            self.total_wait_seconds += waited
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+    def get_status(self) -> dict:
+        with self._lock:
+            avg_wait = self.total_wait_seconds / self.total_calls if self.total_calls else 0.0
+            return {
+                "name": self.name,
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "total_calls": self.total_calls,
+                "avg_wait_seconds": round(avg_wait, 3),
+            }
+
+
+class ConcurrencyLimiterRegistry:
+    """Global registry for per-resource concurrency limiters."""
+    _limiters: dict = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name: str, default_limit: int = 1) -> ConcurrencyLimiter:
+        with cls._lock:
+            if name not in cls._limiters:
+                cls._limiters[name] = ConcurrencyLimiter(name, default_limit)
+            return cls._limiters[name]
+
+    @classmethod
+    def configure(cls, name: str, limit: int) -> ConcurrencyLimiter:
+        """Set the limit for a resource. Calls already holding a slot finish on the old limiter."""
+        with cls._lock:
+            current = cls._limiters.get(name)
+            if current is None or current.limit != max(1, int(limit)):
+                cls._limiters[name] = ConcurrencyLimiter(name, limit)
+            return cls._limiters[name]
+
+    @classmethod
+    def get_all_status(cls) -> dict:
+        with cls._lock:
+            return {name: limiter.get_status() for name, limiter in cls._limiters.items()}
+
+
+# Pre-configured limiters for the resources an item touches
+def get_source_limiter() -> ConcurrencyLimiter:
+    return ConcurrencyLimiterRegistry.get("source", default_limit=1)
+
+def get_llm_limiter() -> ConcurrencyLimiter:
+    return ConcurrencyLimiterRegistry.get("llm", default_limit=4)
+
+def get_db_limiter() -> ConcurrencyLimiter:
+    return ConcurrencyLimiterRegistry.get("db", default_limit=8)
+
+def get_r2_limiter() -> ConcurrencyLimiter:
+    return ConcurrencyLimiterRegistry.get("r2", default_limit=4)
+
+
+def configure_limiters(source: int, llm: int, db: int, r2: int) -> None:
+    ConcurrencyLimiterRegistry.configure("source", source)
+    ConcurrencyLimiterRegistry.configure("llm", llm)
+    ConcurrencyLimiterRegistry.configure("db", db)
+    ConcurrencyLimiterRegistry.configure("r2", r2)
+
 
 # ============================================================================
 # PROCESSING STATS
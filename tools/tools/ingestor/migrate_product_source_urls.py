@@ -0,0 +1,148 @@
+"""
+One-time migration: copy the legacy "Original URL: <url>" description marker into
+products.source_url, so upsert_product can look products up by the indexed column
+instead of `description ILIKE '%url%'`.
+
+Batched and resumable: progress (last product id) is kept in a state file, so an
+interrupted run continues where it stopped. Products whose URL is already owned by
+another product are reported and left alone (the unique index would reject them).
+
+    python migrate_product_source_urls.py --dry-run
+    python migrate_product_source_urls.py --batch-size 200
+
+Afterwards run docs/db-products-source-url.sql and set PRODUCT_SOURCE_URL_MIGRATED=true.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from ingestor.db.supabase_client import SupabaseClient
+
+MARKER = "Original URL:"
+STATE_FILE = Path(__file__).parent / "migrate_product_source_urls.json"
+_URL_RE = re.compile(r"Original URL:\s*(https?://\S+)")
+
+
+def _load_state() -> Dict:
+    if not STATE_FILE.exists():
+        return {"last_id": None, "updated": 0, "conflicts": []}
+    with open(STATE_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_state(state: Dict) -> None:
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def _extract_url(description: Optional[str]) -> Optional[str]:
+    match = _URL_RE.search(description or "")
+    if not match:
+        return None
+    return match.group(1).rstrip(".,;)")
+
+
+def _fetch_batch(supabase: SupabaseClient, last_id: Optional[str], batch_size: int) -> List[Dict]:
+    filters = [("is", "source_url", "null"), ("like", "description", f"%{MARKER}%")]
+    if last_id:
+        filters.append(("gt", "id", last_id))
+    return supabase.select(
+        "products",
+        columns="id, description",
+        filters=filters,
+        order=("id", False),
+        limit=batch_size,
+    )
+
+
+def migrate(batch_size: int, dry_run: bool, pause_seconds: float, logger: logging.Logger) -> None:
+    load_dotenv()
+    supabase_url = os.getenv("SUPABASE_URL", "")
+    supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+    if not supabase_url or not supabase_key:
+        raise SystemExit("Missing SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY in .env")
+    supabase = SupabaseClient(supabase_url, supabase_key, logger, dry_run=dry_run)
+
+    state = _load_state()
+    if state["last_id"]:
+        logger.info("Resuming after product %s (%d updated so far)", state["last_id"], state["updated"])
+
+    while True:
+        rows = _fetch_batch(supabase, state["last_id"], batch_size)
+        if not rows:
+            break
+
+        urls_by_id = {row["id"]: _extract_url(row.get("description")) for row in rows}
+        wanted = sorted({url for url in urls_by_id.values() if url})
+        owners: Dict[str, str] = {}
+        if wanted:
+            taken = supabase.select(
+                "products",
+                columns="id, source_url",
+                filters=[("in", "source_url", wanted)],
+            )
+            owners = {row["source_url"]: row["id"] for row in taken}
+
+        for row in rows:
+            product_id = row["id"]
+            url = urls_by_id[product_id]
+            if not url:
+                logger.warning("Product %s: marker without a parsable URL, skipped", product_id)
+                continue
+            owner = owners.get(url)
+            if owner and owner != product_id:
+                logger.warning("Product %s: %s already belongs to product %s", product_id, url, owner)
+                state["conflicts"].append({"id": product_id, "source_url": url, "owner": owner})
+                continue
+            if dry_run:
+                logger.info("DRY RUN: would set products %s source_url=%s", product_id, url)
+                continue
+            supabase.update("products", {"source_url": url}, filters=[("eq", "id", product_id)])
+            owners[url] = product_id
+            state["updated"] += 1
+
+        # Keyset pagination on id: rows we skipped stay null and must not be fetched again
+        state["last_id"] = rows[-1]["id"]
+        if not dry_run:
+            _save_state(state)
+        logger.info("Batch done: %d rows, %d updated in total", len(rows), state["updated"])
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    remaining = supabase.count(
+        "products", [("is", "source_url", "null"), ("like", "description", f"%{MARKER}%")]
+    )
+    logger.info(
+        "Migration finished: %d updated, %d conflicts, %d products still carry only the marker",
+        state["updated"],
+        len(state["conflicts"]),
+        remaining,
+    )
+    if not dry_run and remaining == len(state["conflicts"]):
+        logger.info("Next: run docs/db-products-source-url.sql, then set PRODUCT_SOURCE_URL_MIGRATED=true")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill products.source_url from the description marker")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--pause", type=float, default=0.2, help="seconds to sleep between batches")
+    parser.add_argument("--dry-run", action="store_true", help="only log what would change")
+    parser.add_argument("--reset", action="store_true", help="forget saved progress and start from the first product")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    logger = logging.getLogger("migrate_source_urls")
+    if args.reset and STATE_FILE.exists():
+        STATE_FILE.unlink()
+    migrate(args.batch_size, args.dry_run, args.pause, logger)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,20 @@
 from ingestor.config import Config
 from ingestor.db.supabase_client import SupabaseClient
+import argparse
 import sys
 
-def run():
+def run(direct_pg=False):
     config = Config.from_env()
-    db = SupabaseClient(config.supabase_url, config.supabase_service_role_key, None)
+    if direct_pg and not config.database_url:
+        print("--direct-pg needs DATABASE_URL")
+        sys.exit(1)
+    # With --direct-pg the bulk steps below run as COPY + one merge statement each
+    db = SupabaseClient(
+        config.supabase_url,
+        config.supabase_service_role_key,
+        None,
+        database_url=config.database_url if direct_pg else None,
+    )
 
     print("Step 1: Creating 'Diğerleri' (Others) category...")
     # Check if exists
@@ -32,21 +42,18 @@ def run():
     
     # We need to know which reviews to update. 
     # Let's select all IDs first.
-    all_reviews = db.select('reviews', columns='id')
+    all_reviews = list(db.select_iter('reviews', 'id'))
     print(f"Found {len(all_reviews)} reviews.")
     
-    # Update individually or in batches?
-    # Helper update doesn't support bulk update with different values, but here value is Same.
-    # But Helper update is `query.update(updates)`. If I filter `in ('id', [list of ids])`, it should work.
-    if all_reviews:
-        review_ids = [r['id'] for r in all_reviews]
-        # Process in chunks of 50
-        chunk_size = 50
-        for i in range(0, len(review_ids), chunk_size):
-            chunk = review_ids[i:i+chunk_size]
-            db.update('reviews', 
-                      {'category_id': others_id, 'sub_category_id': None}, 
-                      filters=[('in', 'id', chunk)])
+    # Same values for every review: copy_rows sends them as `in` updates over REST,
+    # or as one UPDATE ... FROM with --direct-pg
+    chunk_size = 50
+    db.copy_rows(
+        'reviews',
+        [{'id': r['id'], 'category_id': others_id, 'sub_category_id': None} for r in all_reviews],
+        ['id'],
+        mode='update',
+    )
     print("Reviews migrated.")
 
     print("Step 3: Migrating Products...")
@@ -56,7 +63,7 @@ def run():
     # To delete all, we need a filter matching all. `id.neq.0`? `product_categories` usually has composite PK.
     # Supabase-py might not support `delete` without filter.
     # Let's fetch all product_categories and delete them.
-    pcs = db.select('product_categories', columns='product_id, category_id')
+    pcs = list(db.select_iter('product_categories', 'product_id, category_id', key=('product_id', 'category_id')))
     print(f"Found {len(pcs)} product-category links.")
     
     # Delete them. We can filter by product_id in list.
@@ -67,21 +74,19 @@ def run():
             db.delete('product_categories', filters=[('in', 'product_id', chunk)])
             
     # Now link all products to Others
-    all_products = db.select('products', columns='id')
+    all_products = list(db.select_iter('products', 'id'))
     print(f"Found {len(all_products)} products.")
-    if all_products:
-        p_ids = [p['id'] for p in all_products]
-        # Insert links
-        # chunks
-        for i in range(0, len(p_ids), chunk_size):
-            chunk = p_ids[i:i+chunk_size]
-            payload = [{"product_id": pid, "category_id": others_id} for pid in chunk]
-            db.upsert('product_categories', payload, on_conflict="product_id,category_id")
+    db.copy_rows(
+        'product_categories',
+        [{"product_id": p['id'], "category_id": others_id} for p in all_products],
+        ['product_id', 'category_id'],
+        mode='ignore',
+    )
     print("Products migrated.")
 
     print("Step 4: Deleting old categories...")
     # Fetch all categories
-    all_cats = db.select('categories', columns='id')
+    all_cats = list(db.select_iter('categories', 'id'))
     # Exclude Others
     to_delete = [c['id'] for c in all_cats if c['id'] != others_id]
     print(f"Deleting {len(to_delete)} categories...")
@@ -94,4 +99,6 @@ def run():
     print("Cleanup complete!")
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Move everything under 'Diğerleri' and delete the other categories")
+    parser.add_argument("--direct-pg", action="store_true", help="Bulk steps over a direct Postgres connection (DATABASE_URL)")
+    run(parser.parse_args().direct_pg)
@@ -4,9 +4,12 @@ import os
 from dotenv import load_dotenv
 
 from ingestor.config import Config
+from ingestor.http_cache import open_http_cache
 from ingestor.http_client import HttpClient
 from ingestor.db.supabase_client import SupabaseClient
 from ingestor.llm.groq_client import GroqClient
+from ingestor.llm.response_cache import open_response_cache
+from ingestor.stability import configure_host_scheduler, configure_llm_scheduler
 from ingestor.crawl.catalog_spider import CatalogSpider
 
 def setup_logging():
@@ -34,19 +37,34 @@ async def main():
         max_retries=config.http_max_retries,
         user_agent=config.user_agent,
         logger=logger,
-        proxy=config.http_proxy
+        proxy=config.http_proxy,
+        cache=open_http_cache(
+            config.http_cache_path, logger, ttl_rules=config.http_cache_ttls, max_mb=config.http_cache_max_mb
+        ),
     )
     
+    llm_scheduler = configure_llm_scheduler(config.llm_requests_per_minute, config.llm_tokens_per_minute)
+    configure_host_scheduler(config.host_min_intervals)
+    llm_cache = open_response_cache(
+        config.llm_cache_path,
+        logger,
+        ttl_hours=config.llm_cache_ttl_hours,
+        max_mb=config.llm_cache_max_mb,
+    )
     groq = GroqClient(
         api_key=config.groq_api_key,
         model=config.groq_model,
-        logger=logger
+        logger=logger,
+        cache=llm_cache
     )
     
     supabase = SupabaseClient(
         url=config.supabase_url,
         key=config.supabase_service_role_key,
-        logger=logger
+        logger=logger,
+        pool_size=config.db_pool_size or config.db_concurrency,
+        timeout_seconds=config.db_timeout_seconds,
+        http2=config.db_http2,
     )
 
     spider = CatalogSpider(config, http, groq, supabase, logger)
@@ -64,6 +82,11 @@ async def main():
     except Exception as e:
         logger.error(f"Critical error in crawl: {e}", exc_info=True)
     finally:
+        if llm_cache is not None:
+            logger.info(f"LLM cache: {llm_cache.get_stats()}")
+        if http.cache is not None:
+            logger.info(f"HTTP cache: {http.cache.get_stats()}")
+        logger.info(f"LLM scheduler: {llm_scheduler.get_status()}")
         logger.info("Catalog Import Finished.")
 
 if __name__ == "__main__":
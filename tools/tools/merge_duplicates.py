@@ -1,6 +1,7 @@
 import os
 import sys
 import argparse
+import logging
 from collections import defaultdict
 from dotenv import load_dotenv
 
@@ -17,7 +18,9 @@ for env_path in env_paths:
         print(f"Loading env from: {env_path}")
         load_dotenv(env_path)
 
-from supabase import create_client
+sys.path.insert(0, os.path.join(script_dir, 'ingestor'))
+from ingestor.db.pg_bulk import PostgresBulk
+from ingestor.db.supabase_client import SupabaseClient
 
 SUPABASE_URL = os.getenv('SUPABASE_URL') or os.getenv('NEXT_PUBLIC_SUPABASE_URL')
 SUPABASE_SERVICE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_ANON_KEY')
@@ -37,23 +40,17 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
     print("Please ensure your .env or .dev.vars file is correctly configured.")
     exit(1)
 
-supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+db = SupabaseClient(SUPABASE_URL, SUPABASE_SERVICE_KEY, logging.getLogger("merge_duplicates"))
+supabase = db.client
 
 def fetch_all_products():
     """Fetches minimal product data to detect duplicates."""
     print("Fetching all products...")
     all_products = []
-    page = 0
-    page_size = 1000
-    
-    while True:
-        result = supabase.table('products').select('id, name, slug, created_at').range(page * page_size, (page + 1) * page_size - 1).execute()
-        items = result.data
-        if not items:
-            break
-        all_products.extend(items)
-        page += 1
-        print(f"Fetched {len(all_products)} products so far...")
+    for product in db.select_iter('products', 'id, name, slug, created_at', page_size=1000, prefetch=True):
+        all_products.append(product)
+        if len(all_products) % 1000 == 0:
+            print(f"Fetched {len(all_products)} products so far...")
     
     return all_products
 
@@ -256,6 +253,61 @@ def merge_products(master, victim, dry_run=True):
         print(f"  ✗ Error during merge: {e}")
         return False
 
+# Set-based version of merge_products for every (victim_id, master_id) pair at once,
+# run in one transaction over a direct Postgres connection (--direct-pg)
+BULK_MERGE_STATEMENTS = [
+    # 1. Reviews
+    """update reviews r set product_id = s.master_id
+         from _bulk_staged s where r.product_id = s.victim_id""",
+    # 2. Images: drop URLs the master already has, append the rest after the master's images
+    """delete from product_images v using _bulk_staged s
+        where v.product_id = s.victim_id
+          and exists (select 1 from product_images m where m.product_id = s.master_id and m.url = v.url)""",
+    """update product_images v set product_id = n.master_id, sort_order = n.new_sort
+         from (select v2.id, s2.master_id,
+                      coalesce((select max(m.sort_order) from product_images m where m.product_id = s2.master_id), 0)
+                      + row_number() over (partition by s2.master_id order by v2.sort_order, v2.id) as new_sort
+                 from product_images v2 join _bulk_staged s2 on v2.product_id = s2.victim_id) n
+        where v.id = n.id""",
+    # 3. Categories (union)
+    """insert into product_categories (product_id, category_id)
+       select distinct s.master_id, pc.category_id
+         from product_categories pc join _bulk_staged s on pc.product_id = s.victim_id
+       on conflict do nothing""",
+    """delete from product_categories pc using _bulk_staged s where pc.product_id = s.victim_id""",
+    # 4. Translations for languages the master lacks (one victim per language)
+    """update product_translations t set product_id = s.master_id
+         from _bulk_staged s
+        where t.product_id = s.victim_id
+          and not exists (select 1 from product_translations m where m.product_id = s.master_id and m.lang = t.lang)
+          and s.victim_id = (select s3.victim_id from _bulk_staged s3
+                               join product_translations t3 on t3.product_id = s3.victim_id
+                              where s3.master_id = s.master_id and t3.lang = t.lang
+                              order by s3.victim_id limit 1)""",
+    # 5. Victims
+    """delete from products p using _bulk_staged s where p.id = s.victim_id""",
+]
+
+
+def merge_products_bulk(pairs):
+    """Merges every (master, victim) pair in one transaction; nothing is changed if any step fails."""
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print("Error: --direct-pg needs DATABASE_URL")
+        return 0
+    bulk = PostgresBulk(database_url, logging.getLogger("merge_duplicates"))
+    try:
+        counts = bulk.run_staged(
+            "select id as victim_id, id as master_id from products",
+            ["victim_id", "master_id"],
+            [{"victim_id": victim['id'], "master_id": master['id']} for master, victim in pairs],
+            BULK_MERGE_STATEMENTS,
+        )
+    finally:
+        bulk.close()
+    print(f"  ✓ Bulk merge: reviews moved {counts[0]}, images moved {counts[2]}, victims deleted {counts[-1]}")
+    return counts[-1]
+
 def select_master_interactive(products):
     """
     Shows options and asks user to pick master.
@@ -298,6 +350,7 @@ def main():
     parser = argparse.ArgumentParser(description="Find and merge duplicate products")
     parser.add_argument('--run', action='store_true', help="Actually execute the merge (default is dry-run)")
     parser.add_argument('--auto', action='store_true', help="Auto-merge based on review count and age (Oldest with most reviews wins)")
+    parser.add_argument('--direct-pg', action='store_true', help="With --run: merge all groups at once over DATABASE_URL")
     args = parser.parse_args()
 
     products = fetch_all_products()
@@ -306,6 +359,7 @@ def main():
     print(f"\nFound {len(groups)} groups of duplicates.")
     
     count_merged = 0
+    bulk_pairs = []
     
     for name, group in groups.items():
         master = None
@@ -333,6 +387,9 @@ def main():
         
         if master and victims:
             dry_run = not args.run
+            if args.direct_pg and not dry_run:
+                bulk_pairs.extend((master, v) for v in victims)
+                continue
             for v in victims:
                 success = merge_products(master, v, dry_run=dry_run)
                 if success and not dry_run:
@@ -340,6 +397,10 @@ def main():
         else:
             print(f"Skipping group: {name}")
 
+    if bulk_pairs:
+        print(f"\nMerging {len(bulk_pairs)} duplicates in one transaction...")
+        count_merged += merge_products_bulk(bulk_pairs)
+
     print(f"\nDone. Merged {count_merged} duplicates.")
 
 if __name__ == "__main__":
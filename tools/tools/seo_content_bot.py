@@ -1,12 +1,12 @@
 
 import os
+import sys
 import time
 import requests
 import json
 import logging
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
-from supabase import create_client, Client
 from rich.console import Console
 from rich.progress import Progress
 
@@ -32,6 +32,10 @@ if env_path:
 else:
     print("WARNING: Could not find .env file in common locations.")
     print(f"Searched in: {possible_paths}")
+
+sys.path.insert(0, os.path.join(current_dir, 'ingestor'))
+from ingestor.db.supabase_client import SupabaseClient
+
 SUPABASE_URL = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -53,7 +57,9 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     logger.error("Supabase credentials missing. Please check .env file.")
     exit(1)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# One pooled keep-alive session for the whole run
+db = SupabaseClient(SUPABASE_URL, SUPABASE_KEY, logger)
+supabase = db.client
 
 class SeoContentGenerator:
     def __init__(self):